@@ -0,0 +1,312 @@
+"""
+Allowance Cache for Polymarket Trading Bot
+Keeps USDC allowances per (owner, spender) in memory so pre-trade checks are
+lookups, not RPCs. Misses are seeded in bulk with Multicall3, then kept current
+from USDC Approval event logs read in block ranges (one eth_getLogs per scan for
+every tracked owner). Entries are revalidated after a TTL, because transferFrom
+can lower an allowance without a fresh Approval event
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from web3 import Web3
+
+# keccak("Approval(address,address,uint256)")
+APPROVAL_TOPIC = "0x8c5be1e5ebec7d5bd14f71427d1e84f3dd0314c0f7b2291e5b200ac8c7c3b925"
+
+# Entries older than this are re-read with a multicall (seconds)
+ALLOWANCE_TTL = float(os.environ.get('ALLOWANCE_TTL', '300'))
+
+# Without live log scanning, entries are only trusted this long (seconds)
+ALLOWANCE_UNWATCHED_TTL = float(os.environ.get('ALLOWANCE_UNWATCHED_TTL', '5'))
+
+# Blocks between Approval log scans (Polygon: ~2s per block)
+ALLOWANCE_SCAN_EVERY_BLOCKS = int(os.environ.get('ALLOWANCE_SCAN_EVERY_BLOCKS', '2'))
+
+# Max block range per eth_getLogs request (public RPCs reject wide ranges)
+ALLOWANCE_MAX_LOG_RANGE = 1000
+
+# Scanning counts as live if the last successful scan is this recent (seconds)
+ALLOWANCE_SCAN_STALE_SECONDS = 30
+
+
+class AllowanceCache:
+    """
+    In-memory USDC allowances keyed by (owner, spender), fed by Approval logs
+    """
+
+    def __init__(
+        self,
+        w3,
+        token_address: str,
+        loader: Callable[[List[str], str], Dict[str, Optional[int]]],
+        block_watcher=None
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            w3: Web3 instance used for eth_getLogs
+            token_address: ERC20 whose Approval events are followed (USDC.e)
+            loader: Bulk allowance reader (owners, spender) -> {owner: raw allowance}
+            block_watcher: BlockWatcher that drives the log scans (optional)
+        """
+        self.w3 = w3
+        self.token_address = Web3.to_checksum_address(token_address)
+        self.loader = loader
+        self.block_watcher = block_watcher
+
+        # (owner, spender) lowercase -> {"value", "block", "refreshed_at"}
+        self._entries: Dict[Tuple[str, str], Dict] = {}
+        self._spenders: set = set()
+        self._lock = threading.Lock()
+        self._scan_lock = threading.Lock()
+
+        self._last_scanned_block: Optional[int] = None
+        self._last_scan_ok_at = 0.0
+
+        # Set when a LogIndexer delivers Approval logs through feed() instead of our own scans
+        self.external_feed = False
+
+        self.hits = 0
+        self.misses = 0
+        self.log_updates = 0
+
+        if block_watcher:
+            block_watcher.add_listener(self._on_new_block)
+
+    # ==================== LOOKUPS ====================
+
+    def get_allowance(self, owner: str, spender: str) -> Optional[int]:
+        """
+        Raw allowance of owner -> spender (reads through on a miss)
+
+        Args:
+            owner: Token owner
+            spender: Approved contract
+
+        Returns:
+            Raw allowance (6 decimals for USDC), or None if it couldn't be read
+        """
+        return self.get_allowances([owner], spender).get(Web3.to_checksum_address(owner))
+
+    def get_allowances(self, owners: List[str], spender: str) -> Dict[str, Optional[int]]:
+        """
+        Raw allowances for many owners towards one spender
+        Fresh entries are served from memory; all misses share one multicall
+
+        Args:
+            owners: Token owners
+            spender: Approved contract
+
+        Returns:
+            Dict of checksummed owner -> raw allowance (None if the read failed)
+        """
+        spender = Web3.to_checksum_address(spender)
+        owners = list(dict.fromkeys(Web3.to_checksum_address(o) for o in owners))
+
+        result = {}
+        missing = []
+        with self._lock:
+            self._spenders.add(spender.lower())
+            for owner in owners:
+                entry = self._entries.get((owner.lower(), spender.lower()))
+                if entry and self._is_fresh(entry):
+                    result[owner] = entry["value"]
+                    self.hits += 1
+                else:
+                    missing.append(owner)
+                    self.misses += 1
+
+        if missing:
+            result.update(self._load(missing, spender))
+        return result
+
+    def peek(self, owner: str, spender: str) -> Optional[int]:
+        """Cached raw allowance without any RPC (None if unknown or stale)"""
+        with self._lock:
+            entry = self._entries.get((owner.lower(), spender.lower()))
+            return entry["value"] if entry and self._is_fresh(entry) else None
+
+    def set(self, owner: str, spender: str, value: int, block: Optional[int] = None):
+        """
+        Record a known allowance (e.g. read by a balance multicall)
+
+        Args:
+            owner: Token owner
+            spender: Approved contract
+            value: Raw allowance
+            block: Block current when the read started
+        """
+        if value is None:
+            return
+        with self._lock:
+            self._spenders.add(spender.lower())
+            self._entries[(owner.lower(), spender.lower())] = {
+                "value": value,
+                "block": block,
+                "refreshed_at": time.time()
+            }
+
+    def invalidate(self, owner: str, spender: str = None):
+        """Drop cached allowances of an owner (for one spender or all of them)"""
+        owner = owner.lower()
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == owner and (spender is None or k[1] == spender.lower())]:
+                del self._entries[key]
+
+    def _is_fresh(self, entry: Dict) -> bool:
+        """Entry validity: long TTL while Approval logs are being followed, short otherwise (lock held)"""
+        age = time.time() - entry["refreshed_at"]
+        if self._is_scanning():
+            return age < ALLOWANCE_TTL
+        return age < ALLOWANCE_UNWATCHED_TTL
+
+    def _is_scanning(self) -> bool:
+        return time.time() - self._last_scan_ok_at < ALLOWANCE_SCAN_STALE_SECONDS
+
+    def _load(self, owners: List[str], spender: str) -> Dict[str, Optional[int]]:
+        """Read allowances through the bulk loader and cache them"""
+        block = self.block_watcher.current_block() if self.block_watcher else None
+        try:
+            values = self.loader(owners, spender)
+        except Exception as e:
+            print(f"[ALLOWANCE] Bulk allowance read failed for {len(owners)} owners: {e}")
+            return {owner: None for owner in owners}
+
+        for owner in owners:
+            self.set(owner, spender, values.get(owner), block)
+        return {owner: values.get(owner) for owner in owners}
+
+    # ==================== APPROVAL LOGS ====================
+
+    def tracked_spenders(self) -> List[str]:
+        """Spenders whose Approval logs matter to the cache (lowercase)"""
+        with self._lock:
+            return sorted(self._spenders)
+
+    def _on_new_block(self, block_number: int):
+        """Block watcher listener: scan Approval logs every few blocks, then revalidate stale entries"""
+        if self._last_scanned_block is not None and block_number - self._last_scanned_block < ALLOWANCE_SCAN_EVERY_BLOCKS:
+            return
+        if self.external_feed:
+            # The log indexer feeds us; only keep stale entries honest
+            if time.time() - self._last_scan_ok_at < ALLOWANCE_SCAN_STALE_SECONDS:
+                self._last_scanned_block = block_number
+                self.revalidate()
+            return
+        self.scan(block_number)
+        self.revalidate()
+
+    def feed(self, logs: List[Dict], to_block: int):
+        """
+        Apply Approval logs delivered by the log indexer
+
+        Args:
+            logs: Approval logs for tracked spenders
+            to_block: Last block the indexer has covered
+        """
+        self.apply_logs(logs)
+        self._last_scanned_block = to_block
+        self._last_scan_ok_at = time.time()
+
+    def scan(self, to_block: int):
+        """
+        Apply Approval logs for tracked spenders up to a block
+
+        Args:
+            to_block: Last block to include
+        """
+        with self._scan_lock:
+            with self._lock:
+                spenders = sorted(self._spenders)
+                has_entries = bool(self._entries)
+
+            from_block = (self._last_scanned_block + 1) if self._last_scanned_block is not None else to_block
+            if not spenders or not has_entries:
+                # Nothing cached yet - just follow the head
+                self._last_scanned_block = to_block
+                self._last_scan_ok_at = time.time()
+                return
+
+            if to_block - from_block >= ALLOWANCE_MAX_LOG_RANGE:
+                # Fell too far behind to replay cheaply - re-read everything on demand
+                print(f"[ALLOWANCE] {to_block - from_block} blocks behind, dropping cached allowances")
+                with self._lock:
+                    self._entries.clear()
+                self._last_scanned_block = to_block
+                return
+
+            spender_topics = ["0x" + "0" * 24 + s[2:] for s in spenders]
+            try:
+                logs = self.w3.eth.get_logs({
+                    "address": self.token_address,
+                    "fromBlock": from_block,
+                    "toBlock": to_block,
+                    "topics": [APPROVAL_TOPIC, None, spender_topics]
+                })
+            except Exception as e:
+                print(f"[ALLOWANCE] Approval log scan {from_block}-{to_block} failed: {e}")
+                return
+
+            self.apply_logs(logs)
+            self._last_scanned_block = to_block
+            self._last_scan_ok_at = time.time()
+
+    def apply_logs(self, logs: List[Dict]):
+        """
+        Update cached entries from Approval logs (untracked owners are ignored)
+
+        Args:
+            logs: Approval event logs, any order
+        """
+        ordered = sorted(logs, key=lambda l: (l["blockNumber"], l["logIndex"]))
+        with self._lock:
+            for log in ordered:
+                owner = self._topic_address(log["topics"][1])
+                spender = self._topic_address(log["topics"][2])
+                entry = self._entries.get((owner, spender))
+                if not entry:
+                    continue
+                if entry["block"] is not None and log["blockNumber"] <= entry["block"]:
+                    continue  # Already reflected in the value we read
+                entry["value"] = int(self._hex(log["data"]), 16)
+                entry["block"] = log["blockNumber"]
+                entry["refreshed_at"] = time.time()
+                self.log_updates += 1
+
+    def revalidate(self):
+        """Re-read entries past their TTL with one multicall per spender"""
+        cutoff = time.time() - ALLOWANCE_TTL
+        stale: Dict[str, List[str]] = {}
+        with self._lock:
+            for (owner, spender), entry in self._entries.items():
+                if entry["refreshed_at"] < cutoff:
+                    stale.setdefault(spender, []).append(owner)
+
+        for spender, owners in stale.items():
+            self._load([Web3.to_checksum_address(o) for o in owners], Web3.to_checksum_address(spender))
+
+    @staticmethod
+    def _hex(value) -> str:
+        text = value.hex() if hasattr(value, "hex") else str(value)
+        return text if text.startswith("0x") else "0x" + text
+
+    @classmethod
+    def _topic_address(cls, topic) -> str:
+        return "0x" + cls._hex(topic)[-40:].lower()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters, size and scan position"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "log_updates": self.log_updates,
+                "last_scanned_block": self._last_scanned_block,
+                "scanning": self._is_scanning()
+            }
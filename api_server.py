@@ -5,18 +5,31 @@ Provides REST API endpoints for the web dashboard
 
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict
 from datetime import datetime
 import uvicorn
 import hashlib
 import random
+import asyncio
+import time
 
 from mongodb_database import MongoDatabase
 from polymarket_api import PolymarketAPI
 from polymarket_trading import PolymarketTrading
 from trading_bot import TradingBot
 from wallet_manager import WalletManager
+from market_catalog import MarketCatalog
+from event_bus import EventBus
+from order_tracker import OrderTracker
+from order_router import OrderRouter
+from resting_orders import RestingOrderBook
+from polymarket_builder import PolymarketBuilder
+from provisioning import WalletProvisioner
+from bulk_transfer import BulkTransferManager
+from blockchain_manager import POLYMARKET_EXCHANGE
+from web3 import Web3
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -48,8 +61,22 @@ app.add_middleware(
 # Initialize services
 db = MongoDatabase()
 polymarket = PolymarketAPI()
-polymarket_trading = PolymarketTrading()  # Real trading client with builder credentials
+market_catalog = MarketCatalog(polymarket)  # market_id -> condition/token IDs lookup table
+polymarket_trading = PolymarketTrading(market_catalog)  # Real trading client with builder credentials
 wallet_manager = WalletManager(db)
+event_bus = EventBus()  # Pushes order/wallet updates to dashboards (SSE)
+polymarket_builder = PolymarketBuilder()  # Node.js builder service (Safe wallets, gasless orders)
+order_tracker = OrderTracker(
+    polymarket_trading, db, event_bus,
+    builder=polymarket_builder, key_resolver=wallet_manager.get_signing_key
+)
+if wallet_manager.blockchain:
+    wallet_manager.blockchain.receipt_watcher.connect(db, event_bus)  # Tx confirmations -> DB + SSE
+    wallet_manager.blockchain.funding_watcher.connect(event_bus)  # Funding waits -> SSE
+wallet_provisioner = WalletProvisioner(wallet_manager, db, event_bus)  # Safe wallets off the signup path
+bulk_transfers = BulkTransferManager(wallet_manager.blockchain)  # Many transfers per request, one receipt watcher
+order_router = OrderRouter(polymarket_trading, polymarket_builder)  # Picks clob vs builder path per order
+resting_orders = RestingOrderBook(polymarket_trading, order_tracker)  # Our open GTC/GTD limit orders
 active_bots = {}  # Store active bot instances per user
 active_copy_traders = {}  # Store active copy trading instances per user
 whale_activity_feed = []  # Store simulated whale activity
@@ -85,6 +112,26 @@ class TradeCreate(BaseModel):
     position: str
     amount: float
     market_id: Optional[str] = None
+    client_order_id: Optional[str] = None  # Idempotency key - retries return the original order
+
+
+class LimitOrderCreate(BaseModel):
+    side: str  # BUY or SELL
+    price: float
+    size: float  # Shares
+    token_id: Optional[str] = None
+    market_id: Optional[str] = None  # With position, when token_id isn't known
+    position: Optional[str] = None  # YES or NO
+    order_type: str = "GTC"  # GTC or GTD
+    expiration: int = 0  # Unix timestamp (GTD only)
+    peg: bool = False  # Cancel/replace to follow the touch
+    peg_max_drift: Optional[float] = None  # Max distance pegging may move past price (default RESTING_PEG_MAX_DRIFT)
+
+
+class AllowanceQuery(BaseModel):
+    user_ids: List[str] = []
+    addresses: List[str] = []  # Raw wallet addresses (no user lookup)
+    spender: Optional[str] = None
 
 
 class PointsRedeem(BaseModel):
@@ -124,6 +171,34 @@ def verify_password(password: str, hashed_password: str) -> bool:
     return hash_password(password) == hashed_password
 
 
+# ==================== STARTUP / SHUTDOWN ====================
+
+@app.on_event("startup")
+def start_background_services():
+    """Start background refreshers (they must not block boot)"""
+    market_catalog.start()
+    order_tracker.start()
+    resting_orders.start()
+    if wallet_manager.blockchain:
+        wallet_manager.blockchain.log_indexer.track(db.get_wallet_addresses())  # USDC Transfer/Approval logs
+        wallet_manager.blockchain.block_watcher.start()  # Scopes cached balances to the current block
+    wallet_provisioner.start()  # Also re-enqueues users left "provisioning" by a restart
+    wallet_manager.wallet_pool.start()  # Keeps pre-generated Safe wallets in stock
+
+
+@app.on_event("shutdown")
+def stop_background_services():
+    """Stop background refreshers"""
+    market_catalog.stop()
+    order_tracker.stop()
+    resting_orders.stop()  # Bulk-cancels resting orders per wallet
+    if wallet_manager.blockchain:
+        wallet_manager.blockchain.block_watcher.stop()
+    wallet_provisioner.stop()
+    wallet_manager.wallet_pool.stop()
+    polymarket_trading.signer_service.stop()
+
+
 # ==================== HEALTH CHECK ====================
 
 @app.get("/")
@@ -166,6 +241,13 @@ def health_check():
             "database": "connected" if mongo_healthy else "disconnected",
             "polymarket_api": "connected" if polymarket_healthy else "disconnected",
             "active_bots": len(active_bots),
+            "rpc_endpoints": wallet_manager.blockchain.rpc_pool.get_stats() if wallet_manager.blockchain else None,
+            "allowance_cache": wallet_manager.blockchain.allowance_cache.stats() if wallet_manager.blockchain else None,
+            "log_indexer": wallet_manager.blockchain.log_indexer.stats() if wallet_manager.blockchain else None,
+            "wallet_provisioning": wallet_provisioner.stats(),
+            "wallet_pool": wallet_manager.wallet_pool.stats(),
+            "signer_cache": wallet_manager.signer_cache.stats(),
+            "signer_service": polymarket_trading.signer_service.stats(),
             "timestamp": datetime.now().isoformat()
         }
 
@@ -325,7 +407,10 @@ def register_user(user: UserCreate):
 
         # Create user with hashed password
         print(f"[REGISTER] Creating user in database: {user.email}")
-        user_id = db.create_user(user.email, user.wallet_address)
+        user_id = db.create_user(
+            user.email, user.wallet_address,
+            extra_fields={"password": hashed_password, "wallet_status": "provisioning"}
+        )
 
         if not user_id:
             print(f"[REGISTER ERROR] Failed to create user in database")
@@ -335,29 +420,15 @@ def register_user(user: UserCreate):
                 "error": "Could not create user in database"
             }
 
-        # Store the hashed password
-        from bson import ObjectId
-        print(f"[REGISTER] Storing password for user ID: {user_id}")
-        db.db['users'].update_one(
-            {'_id': ObjectId(user_id)},
-            {'$set': {'password': hashed_password}}
-        )
-
-        # AUTO-CREATE SAFE WALLET FOR NEW USER (GASLESS!)
-        print(f"[REGISTER] Auto-creating Safe Wallet for user: {user_id}")
-        wallet_result = wallet_manager.create_safe_wallet(user_id)
-
-        if not wallet_result.get('success'):
-            print(f"[REGISTER WARNING] Safe Wallet creation failed: {wallet_result.get('error')}")
-            # Fallback to regular EOA wallet
-            print(f"[REGISTER] Falling back to EOA wallet...")
-            wallet_result = wallet_manager.create_in_app_wallet(user_id)
-            if wallet_result.get('success'):
-                print(f"[REGISTER] EOA Wallet created: {wallet_result.get('wallet_address')}")
+        # Claim a pre-generated Safe wallet; if the pool is empty it is created in the
+        # background instead (status: GET /users/{user_id}/wallet-status)
+        wallet_result = wallet_manager.assign_pooled_wallet(user_id)
+        if wallet_result.get('success'):
+            wallet_status = "ready"
         else:
-            print(f"[REGISTER] Safe Wallet created: {wallet_result.get('wallet_address')}")
-            print(f"[REGISTER] Owner Address: {wallet_result.get('owner_address')}")
-            print(f"[REGISTER] Gasless: {wallet_result.get('gasless', False)}")
+            wallet_status = "provisioning"
+            wallet_provisioner.enqueue(user_id)
+            print(f"[REGISTER] Wallet provisioning queued for user: {user_id}")
 
         # Get complete user data
         user_data = db.get_user(user_id=user_id)
@@ -372,7 +443,12 @@ def register_user(user: UserCreate):
             "success": True,
             "message": "User registered successfully",
             "user": user_data,
-            "wallet": wallet_result if wallet_result.get('success') else None
+            "wallet": {
+                "wallet_status": wallet_status,
+                "wallet_address": wallet_result.get('wallet_address'),
+                "owner_address": wallet_result.get('owner_address'),
+                "status_url": f"/users/{user_id}/wallet-status"
+            }
         }
 
     except Exception as e:
@@ -503,6 +579,19 @@ def get_user(user_id: str):
     return user
 
 
+@app.get("/users/{user_id}/wallet-status")
+def get_wallet_status(user_id: str):
+    """Wallet provisioning state after registration (provisioning / ready / failed)"""
+    status = wallet_provisioner.get_status(user_id)
+    if not status:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return {
+        "success": True,
+        **status
+    }
+
+
 @app.get("/users/{user_id}/stats")
 def get_user_stats(user_id: str):
     """Get user trading statistics"""
@@ -545,6 +634,9 @@ def get_markets(limit: int = 20, category: str = "all", trending: bool = True, l
 
         print(f"[MARKETS] Retrieved {len(markets)} raw markets from Polymarket")
 
+        # Keep the trading lookup table warm with markets we already fetched
+        market_catalog.ingest(markets)
+
         # Filter by category if specified
         if category != "all" and category:
             category_lower = category.lower()
@@ -674,6 +766,8 @@ def search_markets(query: str, limit: int = 100):
 
         print(f"[SEARCH] Found {len(markets)} markets matching '{query}'")
 
+        market_catalog.ingest(markets)
+
         formatted_markets = [polymarket.format_market_data(m) for m in markets]
 
         print(f"[SEARCH] ✅ Returning {len(formatted_markets)} formatted results")
@@ -746,24 +840,33 @@ def create_manual_trade(user_id: str, trade: TradeCreate):
             "error": str(e)
         }
 
-    # Get market data to extract trading information
-    print(f"[TRADE] Fetching market data for: {trade.market_question}")
+    # Resolve token IDs and condition ID - direct lookup when market_id is known
+    market_data = None
+    if trade.market_id:
+        market_data = market_catalog.resolve(trade.market_id)
+        if market_data:
+            print(f"[TRADE] Resolved market {trade.market_id} from catalog")
 
-    # Search for the market to get token IDs and condition ID
-    markets = polymarket.search_markets(trade.market_question, limit=10)
+    if not market_data:
+        # Legacy path: free-text search by question
+        print(f"[TRADE] Searching market data for: {trade.market_question}")
+        markets = polymarket.search_markets(trade.market_question, limit=10)
 
-    if not markets:
-        return {
-            "success": False,
-            "message": f"Could not find market: {trade.market_question}"
-        }
+        if not markets:
+            return {
+                "success": False,
+                "message": f"Could not find market: {trade.market_question}"
+            }
 
-    # Find exact match or use first result
-    market_data = markets[0]
-    for m in markets:
-        if m.get('question', '').lower() == trade.market_question.lower():
-            market_data = m
-            break
+        # Find exact match or use first result
+        raw_market = markets[0]
+        for m in markets:
+            if m.get('question', '').lower() == trade.market_question.lower():
+                raw_market = m
+                break
+
+        market_catalog.ingest(markets)
+        market_data = MarketCatalog.build_entry(raw_market) or raw_market
 
     condition_id = market_data.get('condition_id')
     token_ids = market_data.get('token_ids', [])
@@ -785,13 +888,13 @@ def create_manual_trade(user_id: str, trade: TradeCreate):
 
     token_id = token_ids[token_index]
 
-    print(f"[TRADE] Market: {market_data.get('question')[:50]}...")
+    print(f"[TRADE] Market: {(market_data.get('question') or trade.market_question)[:50]}...")
     print(f"[TRADE] Condition ID: {condition_id}")
     print(f"[TRADE] Token ID ({trade.position}): {token_id}")
 
     # Get user's private key for signing the order
     try:
-        private_key = wallet_manager.export_private_key(user_id)
+        private_key = wallet_manager.get_signing_key(user_id)
 
         if not private_key:
             return {
@@ -810,12 +913,15 @@ def create_manual_trade(user_id: str, trade: TradeCreate):
     # Execute the real trade on Polymarket
     print(f"[TRADE] Executing {trade.position} order for ${trade.amount} USDC...")
 
-    order_result = polymarket_trading.create_market_order(
+    order_result = order_router.place_market_order(
         private_key=private_key,
         token_id=token_id,
         side=trade.position,
         amount=trade.amount,
-        condition_id=condition_id
+        condition_id=condition_id,
+        safe_address=wallet_address if wallet_data.get('wallet_type') == 'safe' else None,
+        idempotency_key=trade.client_order_id,
+        user_id=user_id
     )
 
     if not order_result.get('success'):
@@ -827,13 +933,14 @@ def create_manual_trade(user_id: str, trade: TradeCreate):
 
     # Store the trade in database
     trade_data = {
-        'market_id': trade.market_id or market_data.get('id'),
+        'market_id': trade.market_id or market_data.get('market_id'),
         'market_question': trade.market_question,
         'position': trade.position,
         'amount': trade.amount,
         'entry_price': order_result.get('price', 0),
         'shares': order_result.get('size', 0),
         'order_id': order_result.get('order_id'),
+        'order_status': order_result.get('status'),
         'condition_id': condition_id,
         'token_id': token_id,
         'builder_attributed': order_result.get('builder_attributed', False)
@@ -841,6 +948,21 @@ def create_manual_trade(user_id: str, trade: TradeCreate):
 
     trade_id = db.create_trade(user_id, trade_data)
 
+    # Track the order so status changes are pushed instead of polled
+    if order_result.get('order_id') and order_result.get('wallet_address'):
+        order_tracker.track(
+            order_result['order_id'],
+            user_id=user_id,
+            wallet_address=order_result['wallet_address'],
+            status=order_result.get('status'),
+            trade_id=trade_id,
+            token_id=token_id,
+            side=trade.position,
+            price=order_result.get('price'),
+            size=order_result.get('size'),
+            route=order_result.get('route')
+        )
+
     if not trade_id:
         # Order was placed but DB save failed
         return {
@@ -880,9 +1002,44 @@ def get_user_trades(user_id: str, limit: int = 10):
     }
 
 
+@app.get("/orders/stream/{user_id}")
+async def stream_order_updates(user_id: str):
+    """Push order status changes for a user over Server-Sent Events"""
+    return StreamingResponse(
+        event_bus.stream(lambda event: event.get('type') == 'order_update' and event.get('user_id') == user_id),
+        media_type="text/event-stream"
+    )
+
+
+@app.get("/orders/routes")
+def get_order_routes():
+    """Rolling latency / error stats for each order path (clob vs builder)"""
+    return {
+        "success": True,
+        "hedge_after": order_router.hedge_after,
+        "routes": order_router.get_stats()
+    }
+
+
 @app.get("/orders/status/{order_id}")
 def get_order_status(order_id: str):
-    """Get the status of a specific order"""
+    """
+    Get the status of a specific order
+    Tracked orders are served from memory (kept fresh by the order tracker)
+    """
+    tracked = order_tracker.get_order(order_id)
+    if tracked:
+        return {
+            "success": True,
+            "order_id": order_id,
+            "status": tracked['status'],
+            "filled_size": tracked['size_matched'],
+            "remaining_size": max(0.0, float(tracked.get('original_size') or tracked.get('size') or 0) - tracked['size_matched']),
+            "price": tracked.get('price'),
+            "side": tracked.get('side'),
+            "tracked": True
+        }
+
     try:
         result = polymarket_trading.get_order_status(order_id)
         return result
@@ -895,41 +1052,60 @@ def get_order_status(order_id: str):
 
 @app.get("/orders/{user_id}")
 def get_user_orders(user_id: str, limit: int = 10):
-    """Get user's recent orders from Polymarket"""
+    """Get user's recent orders from Polymarket, with live state for orders we track"""
+    tracked = {o['order_id']: o for o in order_tracker.get_user_orders(user_id, limit)}
+
     try:
         # Get user's wallet address
         wallet_data = db.get_wallet(user_id)
 
-        if not wallet_data:
+        if not wallet_data and not tracked:
             return {
                 "success": False,
                 "message": "No wallet found"
             }
 
-        wallet_address = wallet_data.get('wallet_address')
+        wallet_address = (wallet_data or {}).get('wallet_address')
 
-        if not wallet_address:
+        if not wallet_address and not tracked:
             return {
                 "success": False,
                 "message": "Invalid wallet address"
             }
 
-        # Get orders from Polymarket
-        result = polymarket_trading.get_user_orders(wallet_address, limit)
+        # Get orders from Polymarket (history survives restarts; the tracker only knows this process's orders)
+        result = polymarket_trading.get_user_orders(wallet_address, limit) if wallet_address else {}
 
+    except Exception as e:
+        result = {"success": False, "error": str(e)}
+
+    if not tracked:
         return result
 
-    except Exception as e:
-        return {
-            "success": False,
-            "error": str(e)
-        }
+    # Tracked state is fresher than the CLOB listing - overlay it, then add orders the listing missed
+    orders = []
+    for order in result.get('orders') or []:
+        order_id = order.get('id') or order.get('order_id')
+        if order_id in tracked:
+            order = {**order, **tracked.pop(order_id), "tracked": True}
+        orders.append(order)
+    orders = [dict(o, tracked=True) for o in tracked.values()] + orders
+
+    return {
+        "success": True,
+        "count": len(orders[:limit]),
+        "orders": orders[:limit],
+        "history_error": None if result.get('success') else result.get('error')
+    }
 
 
 @app.post("/orders/cancel/{order_id}")
 def cancel_order(order_id: str):
     """Cancel an open order"""
     try:
+        if resting_orders.get_order(order_id):
+            return resting_orders.cancel(order_id)
+
         result = polymarket_trading.cancel_order(order_id)
         return result
     except Exception as e:
@@ -939,6 +1115,110 @@ def cancel_order(order_id: str):
         }
 
 
+@app.post("/orders/limit")
+def create_limit_order(user_id: str, order: LimitOrderCreate):
+    """Place a resting GTC/GTD limit order (optionally pegged to the touch)"""
+    wallet_data = db.get_wallet(user_id)
+    if not wallet_data or not wallet_data.get('wallet_address'):
+        raise HTTPException(status_code=400, detail="No wallet found. Please create or connect a wallet first.")
+
+    token_id = order.token_id
+    if not token_id:
+        if not order.market_id or not order.position:
+            raise HTTPException(status_code=400, detail="Provide token_id, or market_id with position")
+
+        market_data = market_catalog.resolve(order.market_id)
+        token_ids = (market_data or {}).get('token_ids', [])
+        token_index = 0 if order.position.upper() == 'YES' else 1
+        if len(token_ids) <= token_index:
+            return {
+                "success": False,
+                "message": f"Token ID not found for {order.position} position"
+            }
+        token_id = token_ids[token_index]
+
+    try:
+        private_key = wallet_manager.get_signing_key(user_id)
+        if not private_key:
+            return {
+                "success": False,
+                "message": "Private key not available for this wallet"
+            }
+    except Exception as e:
+        print(f"[ORDER ERROR] Failed to export private key: {e}")
+        return {
+            "success": False,
+            "message": "Failed to access wallet for signing",
+            "error": str(e)
+        }
+
+    result = resting_orders.place(
+        private_key=private_key,
+        user_id=user_id,
+        token_id=token_id,
+        side=order.side,
+        price=order.price,
+        size=order.size,
+        order_type=order.order_type,
+        expiration=order.expiration,
+        peg=order.peg,
+        peg_max_drift=order.peg_max_drift,
+        # Safe wallets: the Safe funds the order (the owner key only signs for it)
+        funder=wallet_data['wallet_address'] if wallet_data.get('wallet_type') == 'safe' else None
+    )
+
+    if not result.get('success'):
+        return {
+            "success": False,
+            "message": f"Order failed: {result.get('error', 'Unknown error')}",
+            "details": result
+        }
+
+    return result
+
+
+@app.get("/orders/resting/{user_id}")
+def get_resting_orders(user_id: str):
+    """Get a user's resting limit orders with the mirrored top of book (no network)"""
+    orders = resting_orders.get_user_orders(user_id)
+    for order in orders:
+        order['book'] = resting_orders.get_book(order['token_id'])
+        tracked = order_tracker.get_order(order['order_id'])
+        if tracked:
+            order['status'] = tracked['status']
+            order['size_matched'] = tracked['size_matched']
+
+    return {
+        "success": True,
+        "count": len(orders),
+        "orders": orders
+    }
+
+
+@app.post("/orders/cancel-all/{user_id}")
+def cancel_all_orders(user_id: str):
+    """Cancel every open order for a user's wallet in one request"""
+    wallet_data = db.get_wallet(user_id)
+    if not wallet_data or not wallet_data.get('wallet_address'):
+        raise HTTPException(status_code=400, detail="No wallet found")
+
+    # Clients and resting orders are keyed by the paying wallet - the Safe for Safe wallets
+    wallet_address = wallet_data['wallet_address']
+    funder = wallet_address if wallet_data.get('wallet_type') == 'safe' else None
+
+    # Make sure the wallet has an authenticated client (no-op when already cached)
+    if not polymarket_trading.get_cached_order_client(wallet_address):
+        private_key = wallet_manager.get_signing_key(user_id)
+        if not private_key:
+            return {
+                "success": False,
+                "message": "Private key not available for this wallet"
+            }
+        polymarket_trading.get_order_client(private_key, funder)
+
+    return resting_orders.cancel_wallet(wallet_address, everything=True)
+
+
 # ==================== SETTINGS ENDPOINTS ====================
 
 @app.get("/settings/{user_id}")
@@ -1181,15 +1461,15 @@ def get_wallet_balance(wallet_address: str):
 def get_all_user_wallets(user_id: str):
     """Get all wallets associated with a user"""
     try:
-        from bson.objectid import ObjectId
-
-        # Get all wallets from wallets collection for this user
-        wallets_collection = wallet_manager.db.db['wallets']
-        user_wallets = list(wallets_collection.find({"user_id": user_id}))
+        # All wallets for this user (indexed, key material never loaded)
+        user_wallets = wallet_manager.wallet_repo.list_for_user(user_id)
 
         # Get current active wallet from user record
-        user = wallet_manager.db.users.find_one({"_id": ObjectId(user_id)})
-        active_wallet_address = user.get('wallet_address') if user else None
+        active_wallet = db.get_wallet(user_id)
+        active_wallet_address = active_wallet.get('wallet_address') if active_wallet else None
+
+        # Balances for every wallet under one deadline (late reads come back flagged stale)
+        balances = wallet_manager.get_wallet_balances([w.get('wallet_address') for w in user_wallets])
 
         wallets_list = []
         for wallet in user_wallets:
@@ -1200,12 +1480,13 @@ def get_all_user_wallets(user_id: str):
                 "is_active": wallet.get('wallet_address') == active_wallet_address
             }
 
-            # Get balance for this wallet
-            balance_info = wallet_manager.get_wallet_balance(wallet.get('wallet_address'))
+            balance_info = balances.get(wallet.get('wallet_address'), {})
             wallet_data.update({
                 "pol_balance": balance_info.get('pol_balance', 0),
                 "usdc_balance": balance_info.get('usdc_balance', 0),
-                "total_usd": balance_info.get('total_usd', 0)
+                "total_usd": balance_info.get('total_usd', 0),
+                "stale": balance_info.get('stale', True),
+                "balance_as_of": balance_info.get('as_of')
             })
 
             wallets_list.append(wallet_data)
@@ -1213,7 +1494,8 @@ def get_all_user_wallets(user_id: str):
         return {
             "success": True,
             "wallets": wallets_list,
-            "active_wallet": active_wallet_address
+            "active_wallet": active_wallet_address,
+            "partial": any(w["stale"] for w in wallets_list)
         }
     except Exception as e:
         print(f"Error getting all wallets: {e}")
@@ -1232,11 +1514,7 @@ def switch_active_wallet(user_id: str, wallet_data: WalletConnect):
         wallet_address = wallet_data.wallet_address
 
         # Verify this wallet belongs to the user
-        wallets_collection = wallet_manager.db.db['wallets']
-        wallet = wallets_collection.find_one({
-            "user_id": user_id,
-            "wallet_address": wallet_address
-        })
+        wallet = wallet_manager.wallet_repo.find_owned(user_id, wallet_address)
 
         if not wallet:
             return {
@@ -1255,6 +1533,10 @@ def switch_active_wallet(user_id: str, wallet_data: WalletConnect):
             }
         )
 
+        # Drop the cached signer for the old one only now, so a concurrent lookup
+        # can't re-cache the old key from the not-yet-updated user record
+        wallet_manager.signer_cache.invalidate(user_id)
+
         return {
             "success": True,
             "message": "Active wallet switched successfully",
@@ -1310,7 +1592,7 @@ def send_funds(user_id: str, send_request: SendFundsRequest):
         }
 
     # Get private key (this is the owner's key for Safe wallets)
-    private_key = wallet_manager.export_private_key(user_id)
+    private_key = wallet_manager.get_signing_key(user_id)
 
     if not private_key:
         return {
@@ -1352,13 +1634,17 @@ def send_funds(user_id: str, send_request: SendFundsRequest):
             result = wallet_manager.blockchain.send_usdc(
                 from_private_key=private_key,
                 to_address=send_request.recipient,
-                amount=send_request.amount
+                amount=send_request.amount,
+                wait=False,
+                user_id=user_id
             )
         elif send_request.token.lower() == 'pol':
             result = wallet_manager.blockchain.send_matic(
                 from_private_key=private_key,
                 to_address=send_request.recipient,
-                amount=send_request.amount
+                amount=send_request.amount,
+                wait=False,
+                user_id=user_id
             )
         else:
             return {
@@ -1367,13 +1653,15 @@ def send_funds(user_id: str, send_request: SendFundsRequest):
             }
 
         if result.get('success'):
-            print(f"[SEND API] ✅ Funds sent successfully!")
+            print(f"[SEND API] ✅ Transfer submitted!")
             print(f"[SEND API] Transaction: {result.get('tx_hash')}")
 
             return {
                 "success": True,
-                "message": f"{send_request.amount} {send_request.token.upper()} sent successfully!",
+                "message": f"{send_request.amount} {send_request.token.upper()} sent - confirmation will follow",
                 "tx_hash": result.get('tx_hash'),
+                "status": result.get('status'),
+                "status_url": f"/tx/status/{result.get('tx_hash')}",
                 "explorer_url": result.get('explorer_url')
             }
         else:
@@ -1392,6 +1680,57 @@ def send_funds(user_id: str, send_request: SendFundsRequest):
         }
 
 
+class BulkSendRow(BaseModel):
+    recipient: str
+    amount: float
+    token: str  # 'usdc' or 'pol'
+
+
+class BulkSendRequest(BaseModel):
+    transfers: List[BulkSendRow]
+
+
+@app.post("/wallet/send/bulk/{user_id}")
+def send_funds_bulk(user_id: str, bulk_request: BulkSendRequest):
+    """
+    Send many USDC / POL transfers from the user's signing wallet in one request
+    Balances are checked once, then the job runs in the background - poll the status URL
+    """
+    print(f"[BULK API] Bulk send of {len(bulk_request.transfers)} transfers for user: {user_id}")
+
+    private_key = wallet_manager.get_signing_key(user_id)
+    if not private_key:
+        return {
+            "success": False,
+            "message": "Could not retrieve wallet private key"
+        }
+
+    result = bulk_transfers.submit(
+        private_key,
+        [row.dict() for row in bulk_request.transfers],
+        user_id=user_id
+    )
+    if not result.get('success'):
+        return {
+            "success": False,
+            "message": "Bulk send rejected",
+            "error": result.get('error'),
+            "rows": result.get('rows')
+        }
+
+    result["status_url"] = f"/wallet/send/bulk/status/{result['job_id']}"
+    return result
+
+
+@app.get("/wallet/send/bulk/status/{job_id}")
+def get_bulk_send_status(job_id: str):
+    """Per-row status, counts and throughput of a bulk send"""
+    job = bulk_transfers.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Bulk send job not found")
+    return {"success": True, **job}
+
+
 @app.post("/wallet/export-key/{user_id}")
 def export_private_key(user_id: str, key_export: PrivateKeyExport):
     """
@@ -1537,6 +1876,46 @@ def check_usdc_allowance(user_id: str):
         }
 
 
+@app.post("/wallet/usdc-allowance/bulk")
+def check_usdc_allowance_bulk(query: AllowanceQuery):
+    """
+    USDC allowances for many users / addresses at once
+    Served from the allowance cache; all misses share one multicall
+    """
+    blockchain = wallet_manager.blockchain
+
+    # address -> user_id (None for raw addresses)
+    owners = {}
+    if query.user_ids:
+        for user in db.get_users(query.user_ids, fields=["wallet_address"]):
+            if user.get('wallet_address'):
+                owners[Web3.to_checksum_address(user['wallet_address'])] = user['id']
+    for address in query.addresses:
+        if Web3.is_address(address):
+            owners.setdefault(Web3.to_checksum_address(address), None)
+
+    spender = query.spender or POLYMARKET_EXCHANGE
+    allowances = blockchain.allowance_cache.get_allowances(list(owners), spender)
+
+    results = []
+    for address, user_id in owners.items():
+        raw = allowances.get(address)
+        results.append({
+            "user_id": user_id,
+            "wallet_address": address,
+            "allowance": raw / (10 ** 6) if raw is not None else None,
+            "is_approved": bool(raw),
+            "error": None if raw is not None else "Could not read allowance"
+        })
+
+    return {
+        "success": True,
+        "spender": spender,
+        "count": len(results),
+        "allowances": results
+    }
+
+
 @app.post("/wallet/approve-usdc/{user_id}")
 def approve_usdc_for_trading(user_id: str, amount: float = None):
     """
@@ -1580,7 +1959,7 @@ def approve_usdc_for_trading(user_id: str, amount: float = None):
         }
 
     # Get private key for in-app wallet
-    private_key = wallet_manager.export_private_key(user_id)
+    private_key = wallet_manager.get_signing_key(user_id)
 
     if not private_key:
         print(f"[APPROVE API] ❌ Could not retrieve private key")
@@ -1591,20 +1970,23 @@ def approve_usdc_for_trading(user_id: str, amount: float = None):
 
     # Execute approval on blockchain
     print(f"[APPROVE API] Executing USDC approval transaction...")
-    result = wallet_manager.blockchain.approve_usdc(private_key, amount)
+    # Returns as soon as the transaction is broadcast - the receipt watcher confirms it
+    result = wallet_manager.blockchain.approve_usdc(private_key, amount, wait=False, user_id=user_id)
 
     if result.get('success'):
-        print(f"[APPROVE API] ✅ USDC approved successfully!")
+        print(f"[APPROVE API] ✅ USDC approval submitted!")
         print(f"[APPROVE API] Transaction: {result.get('tx_hash')}")
 
         return {
             "success": True,
-            "message": "USDC approved for Polymarket trading!",
+            "message": "USDC approval submitted - it will be confirmed within a few blocks",
             "tx_hash": result.get('tx_hash'),
+            "status": result.get('status'),
+            "status_url": f"/tx/status/{result.get('tx_hash')}",
             "explorer_url": result.get('explorer_url'),
             "amount_approved": result.get('amount_approved'),
             "wallet_address": wallet_address,
-            "next_step": "You can now place trades on Polymarket!"
+            "next_step": "You can place trades on Polymarket once the approval is confirmed!"
         }
     else:
         print(f"[APPROVE API] ❌ Approval failed: {result.get('error')}")
@@ -1616,6 +1998,114 @@ def approve_usdc_for_trading(user_id: str, amount: float = None):
         }
 
 
+@app.get("/tx/status/{tx_hash}")
+def get_transaction_status(tx_hash: str):
+    """Status of a transaction we submitted (pending / confirmed / failed)"""
+    record = wallet_manager.blockchain.receipt_watcher.get(tx_hash)
+    if not record:
+        return {
+            "success": False,
+            "message": "Transaction not found"
+        }
+
+    return {
+        "success": True,
+        "transaction": record
+    }
+
+
+@app.get("/tx/stream/{user_id}")
+async def stream_transaction_updates(user_id: str):
+    """Push transaction confirmations for a user over Server-Sent Events"""
+    return StreamingResponse(
+        event_bus.stream(lambda event: event.get('type') == 'tx_update' and event.get('user_id') == user_id),
+        media_type="text/event-stream"
+    )
+
+
+@app.post("/wallet/funding/watch/{user_id}")
+def watch_wallet_funding(user_id: str, timeout: int = 300, min_usdc: float = 0.0, min_pol: float = 0.0):
+    """
+    Start waiting for a deposit to the user's wallet
+    Resolved by the shared block/log scans; follow it with the long-poll or SSE endpoint
+    """
+    user_data = db.get_user(user_id=user_id)
+    if not user_data or not user_data.get('wallet_address'):
+        return {
+            "success": False,
+            "message": "No wallet found for this user"
+        }
+
+    funding_wait = wallet_manager.blockchain.funding_watcher.watch(
+        user_data['wallet_address'], timeout=timeout, user_id=user_id,
+        min_usdc=min_usdc, min_pol=min_pol
+    )
+
+    return {
+        "success": True,
+        "wait_id": funding_wait.wait_id,
+        "wallet_address": funding_wait.address,
+        "expires_at": funding_wait.deadline,
+        "status_url": f"/wallet/funding/{funding_wait.wait_id}",
+        "stream_url": f"/wallet/funding/stream/{user_id}"
+    }
+
+
+@app.get("/wallet/funding/stream/{user_id}")
+async def stream_wallet_funding(user_id: str):
+    """Push funding resolutions for a user over Server-Sent Events"""
+    return StreamingResponse(
+        event_bus.stream(lambda event: event.get('type') == 'funding_update' and event.get('user_id') == user_id),
+        media_type="text/event-stream"
+    )
+
+
+@app.get("/wallet/funding/{wait_id}")
+async def get_wallet_funding(wait_id: str, wait: int = 30):
+    """
+    Long-poll a funding wait: returns as soon as it resolves, or after `wait` seconds
+    with status "waiting" (no chain reads - the shared scans resolve it)
+    """
+    funding_wait = wallet_manager.blockchain.funding_watcher.get(wait_id)
+    if not funding_wait:
+        return {
+            "success": False,
+            "message": "Funding wait not found"
+        }
+
+    deadline = time.time() + max(0, min(wait, 60))
+    while not funding_wait.is_done() and time.time() < deadline:
+        await asyncio.sleep(0.25)
+
+    return {
+        "success": True,
+        "funding": funding_wait.summary()
+    }
+
+
+@app.get("/wallet/activity/{user_id}")
+def get_wallet_activity(user_id: str, limit: int = 50):
+    """Indexed USDC transfers and approvals for the user's wallet, newest first"""
+    user_data = db.get_user(user_id=user_id)
+    if not user_data or not user_data.get('wallet_address'):
+        return {
+            "success": False,
+            "message": "No wallet found for this user"
+        }
+
+    wallet_address = user_data['wallet_address']
+    entries = wallet_manager.blockchain.log_indexer.get_ledger(wallet_address, limit)
+    for entry in entries:
+        entry["amount"] = entry["value"] / (10 ** 6)
+
+    return {
+        "success": True,
+        "wallet_address": wallet_address,
+        "count": len(entries),
+        "activity": entries
+    }
+
+
 # ==================== TOP TRADERS ====================
 
 @app.get("/traders/top")
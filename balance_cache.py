@@ -0,0 +1,168 @@
+"""
+Balance Cache for Polymarket Trading Bot
+Caches on-chain balances per (address, token) for the current block only:
+entries are dropped when a new block arrives or when we send a transaction
+from (or to) the address. Falls back to a short TTL when no block watcher runs.
+USDC entries for addresses the log indexer tracks outlive blocks, since their
+transfers invalidate them directly
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+# Entry lifetime when the block watcher isn't running (seconds)
+BALANCE_CACHE_TTL = float(os.environ.get('BALANCE_CACHE_TTL', '2'))
+
+# Lifetime of entries kept current by Transfer logs instead of per-block expiry (seconds);
+# only for addresses the indexer tracks, and only served once it has scanned the current block
+BALANCE_EVENT_TTL = float(os.environ.get('BALANCE_EVENT_TTL', '30'))
+
+
+class BalanceCache:
+    """
+    Block-scoped cache of raw balances keyed by (address, token)
+    Token keys are "pol" or "usdc" (allowances live in AllowanceCache)
+    """
+
+    def __init__(self, block_watcher=None, ttl: float = BALANCE_CACHE_TTL):
+        """
+        Initialize the cache
+
+        Args:
+            block_watcher: BlockWatcher whose new blocks invalidate the cache (optional)
+            ttl: Entry lifetime used when the watcher has no current block
+        """
+        self.block_watcher = block_watcher
+        self.ttl = ttl
+
+        # (address, token) -> (value, block_number, cached_at)
+        self._entries: Dict[Tuple[str, str], Tuple[int, Optional[int], float]] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+        # Tokens whose changes a log indexer reports for the addresses it tracks
+        self._event_tokens: Tuple[str, ...] = ()
+        self._event_tracks: Callable[[str], bool] = lambda address: False
+        self._event_covered_through: Callable[[], Optional[int]] = lambda: None
+
+        if block_watcher:
+            block_watcher.add_listener(self._on_new_block)
+
+    def set_event_source(
+        self,
+        is_tracked: Callable[[str], bool],
+        covered_through: Callable[[], Optional[int]],
+        tokens: Tuple[str, ...]
+    ):
+        """
+        Let a log indexer keep some tokens current (it invalidates addresses it sees move)
+
+        Args:
+            is_tracked: True for addresses whose transfers the indexer follows
+            covered_through: Last block the indexer has applied (None while it isn't live)
+            tokens: Token keys it covers (e.g. ("usdc",))
+        """
+        self._event_tracks = is_tracked
+        self._event_covered_through = covered_through
+        self._event_tokens = tuple(tokens)
+
+    def _event_driven(self, address: str, token: str) -> bool:
+        """True if transfers of this token for this address invalidate its entry"""
+        return token in self._event_tokens and self._event_tracks(address)
+
+    def _event_current(self, block: Optional[int]) -> bool:
+        """True if the indexer has applied every block up to the current one"""
+        covered = self._event_covered_through()
+        return covered is not None and block is not None and covered >= block
+
+    def current_block(self) -> Optional[int]:
+        """Block new reads should be tagged with (None when the watcher isn't running)"""
+        return self.block_watcher.current_block() if self.block_watcher else None
+
+    def get(self, address: str, token: str) -> Optional[int]:
+        """
+        Get a cached raw balance if it is still valid
+
+        Args:
+            address: Wallet address
+            token: "pol" or "usdc"
+
+        Returns:
+            Raw value (wei / token units) or None on a miss
+        """
+        key = (address.lower(), token)
+        block = self.current_block()
+        event_driven = self._event_driven(address, token)
+        event_current = event_driven and self._event_current(block)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                value, cached_block, cached_at = entry
+                if event_driven and time.time() - cached_at < BALANCE_EVENT_TTL:
+                    if event_current or cached_block == block:
+                        self.hits += 1
+                        return value
+                    # Indexer hasn't scanned this block yet - miss, but keep the entry
+                    self.misses += 1
+                    return None
+                if block is not None and cached_block == block:
+                    self.hits += 1
+                    return value
+                if block is None and time.time() - cached_at < self.ttl:
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+        return None
+
+    def set(self, address: str, token: str, value: int, block: Optional[int] = None):
+        """
+        Cache a raw balance
+
+        Args:
+            address: Wallet address
+            token: "pol" or "usdc"
+            value: Raw value
+            block: Block current when the read *started* (so a read that races a
+                   new block is never served as fresh)
+        """
+        if value is None:
+            return
+        with self._lock:
+            self._entries[(address.lower(), token)] = (value, block, time.time())
+
+    def invalidate(self, *addresses: str):
+        """Drop every cached balance for the given addresses (after we send a transaction)"""
+        targets = {a.lower() for a in addresses if a}
+        with self._lock:
+            for key in [k for k in self._entries if k[0] in targets]:
+                del self._entries[key]
+
+    def _on_new_block(self, block_number: int):
+        """
+        Block watcher listener: everything cached for older blocks is stale, except
+        entries the indexer keeps current (served again once it has scanned this block)
+        """
+        with self._lock:
+            entries = list(self._entries.items())
+
+        now = time.time()
+        keep = {
+            k: v for k, v in entries
+            if v[1] == block_number
+            or (self._event_driven(k[0], k[1]) and now - v[2] < BALANCE_EVENT_TTL)
+        }
+        snapshot = dict(entries)
+        with self._lock:
+            # Entries set while we were filtering are kept as is
+            self._entries = {k: v for k, v in self._entries.items() if k in keep or snapshot.get(k) is not v}
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and size"""
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
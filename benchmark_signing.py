@@ -0,0 +1,92 @@
+"""
+Signing Benchmark for Polymarket Trading Bot
+Measures signatures/sec for CLOB order signing (EIP-712) and transaction signing,
+in-thread vs through the signer service process pool, with N concurrent callers
+
+Usage:
+    python benchmark_signing.py [--signatures 400] [--threads 8] [--processes 4]
+"""
+
+import argparse
+import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from eth_account import Account
+from py_clob_client.clob_types import OrderArgs, CreateOrderOptions
+from py_clob_client.order_builder.builder import OrderBuilder
+from py_clob_client.order_builder.constants import BUY
+from py_clob_client.signer import Signer
+
+from signer_service import SignerService
+
+CHAIN_ID = 137
+TOKEN_ID = "71321045679252212594626385532706912750332728571942532289631379312455583992563"
+
+
+def make_order_args(i: int) -> OrderArgs:
+    return OrderArgs(token_id=TOKEN_ID, price=0.5, size=10 + i % 50, side=BUY, fee_rate_bps=0)
+
+
+def make_transaction(i: int) -> dict:
+    return {
+        'to': "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174",
+        'value': 0,
+        'gas': 100000,
+        'maxFeePerGas': 50_000_000_000,
+        'maxPriorityFeePerGas': 30_000_000_000,
+        'nonce': i,
+        'chainId': CHAIN_ID,
+        'data': "0x"
+    }
+
+
+def run(label: str, sign_one, count: int, threads: int):
+    """Run count signatures from a thread pool and print signatures/sec"""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(sign_one, range(count)))
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<28} {count / elapsed:>9.1f} sig/s  ({elapsed * 1000:.0f} ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark order / transaction signing")
+    parser.add_argument("--signatures", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+
+    private_key = "0x" + secrets.token_hex(32)
+    options = CreateOrderOptions(tick_size="0.01", neg_risk=False)
+    builder = OrderBuilder(Signer(private_key, CHAIN_ID))
+
+    # Minimal stand-in for an authenticated ClobClient (sign_order only reads these)
+    class _Client:
+        chain_id = CHAIN_ID
+        signer = builder.signer
+    _Client.builder = builder
+
+    service = SignerService(processes=args.processes)
+    # Spawn the workers and warm their imports before timing
+    service.sign_transaction(make_transaction(0), private_key)
+    service.sign_order(_Client, make_order_args(0), options)
+
+    print(f"[BENCH] {args.signatures} signatures, {args.threads} caller threads, {args.processes} processes")
+
+    print("[BENCH] Orders (EIP-712)")
+    run("in-thread", lambda i: builder.create_order(make_order_args(i), options), args.signatures, args.threads)
+    run("signer service", lambda i: service.sign_order(_Client, make_order_args(i), options), args.signatures, args.threads)
+
+    print("[BENCH] Transactions")
+    run("in-thread", lambda i: Account.sign_transaction(make_transaction(i), private_key), args.signatures, args.threads)
+    run("signer service", lambda i: service.sign_transaction(make_transaction(i), private_key), args.signatures, args.threads)
+
+    stats = service.stats()
+    print(f"[BENCH] Pool batches: {stats['batches']} for {stats['signed']} signatures "
+          f"({stats['signed'] / max(stats['batches'], 1):.1f} per batch), failures: {stats['failures']}")
+    service.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Wallet Query Benchmark for Polymarket Trading Bot
+Seeds a scratch database with 100k wallet records and compares resolving a
+user's active wallet + key record:
+  - legacy: users.find_one + wallets.find({"user_id"}) with no wallets index
+  - repository: one $lookup aggregation backed by the compound index
+
+Runs against MONGODB_URI (or --uri) in a separate database that is dropped afterwards
+
+Usage:
+    python benchmark_wallet_queries.py [--wallets 100000] [--lookups 2000] [--uri mongodb://localhost:27017]
+"""
+
+import argparse
+import os
+import random
+import secrets
+import time
+from types import SimpleNamespace
+
+from pymongo import MongoClient
+
+from wallet_repository import WalletRepository, WALLETS_INDEX
+
+BENCH_DATABASE = "polymarket_bot_benchmark"
+
+
+def seed(db, count: int):
+    """Users with one Safe each; every 10th user also has an older imported wallet"""
+    print(f"[BENCH] Seeding {count} wallets...")
+    users, wallets = [], []
+    while len(wallets) < count:
+        address = "0x" + secrets.token_hex(20)
+        users.append({"email": f"bench{len(users)}@example.com", "wallet_address": address, "wallet_type": "safe"})
+        wallets.append([len(users) - 1, address, "safe"])
+        if len(users) % 10 == 0 and len(wallets) < count:
+            wallets.append([len(users) - 1, "0x" + secrets.token_hex(20), "imported"])
+
+    db.users.insert_many(users)
+    db.wallets.insert_many([
+        {
+            "user_id": str(users[index]["_id"]),
+            "wallet_address": address,
+            "owner_address": "0x" + secrets.token_hex(20),
+            "wallet_type": wallet_type,
+            "private_key_encrypted": "v2:" + secrets.token_hex(60)
+        }
+        for index, address, wallet_type in wallets
+    ])
+    return [str(u["_id"]) for u in users]
+
+
+def legacy_resolve(db, user_id: str):
+    """The pre-repository lookup: user document, then every wallets record for the user"""
+    from bson.objectid import ObjectId
+    user = db.users.find_one({"_id": ObjectId(user_id)}, {"wallet_type": 1, "wallet_address": 1})
+    records = list(db.wallets.find({"user_id": user_id}))
+    for wallet in records:
+        if wallet.get("wallet_address") == user.get("wallet_address"):
+            return user, wallet
+    return user, (records[0] if records else None)
+
+
+def timed(label: str, fn, user_ids):
+    started = time.perf_counter()
+    for user_id in user_ids:
+        user, wallet = fn(user_id)
+        assert wallet is not None, f"no key record for {user_id}"
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<34} {len(user_ids) / elapsed:>8.0f} lookups/s  ({elapsed * 1000 / len(user_ids):.2f} ms each)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark wallet resolution queries")
+    parser.add_argument("--wallets", type=int, default=100000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--uri", default=os.environ.get("MONGODB_URI", "mongodb://localhost:27017"))
+    args = parser.parse_args()
+
+    client = MongoClient(args.uri, serverSelectionTimeoutMS=10000)
+    client.drop_database(BENCH_DATABASE)
+    db = client[BENCH_DATABASE]
+
+    try:
+        user_ids = seed(db, args.wallets)
+        sample = random.sample(user_ids, min(args.lookups, len(user_ids)))
+        repo = WalletRepository(SimpleNamespace(users=db.users, wallets=db.wallets))
+
+        print(f"[BENCH] {len(sample)} lookups over {db.wallets.estimated_document_count()} wallets")
+        timed("legacy (no wallets index)", lambda u: legacy_resolve(db, u), sample)
+
+        db.wallets.create_index(WALLETS_INDEX)
+        timed("legacy (compound index)", lambda u: legacy_resolve(db, u), sample)
+        timed("repository $lookup (index)", repo.resolve_active, sample)
+
+        plan = db.wallets.find({"user_id": sample[0]}).explain()["queryPlanner"]["winningPlan"]
+        print(f"[BENCH] wallets by user_id plan: {plan.get('inputStage', plan).get('stage')}")
+    finally:
+        client.drop_database(BENCH_DATABASE)
+
+
+if __name__ == "__main__":
+    main()
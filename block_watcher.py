@@ -0,0 +1,114 @@
+"""
+Block Watcher for Polymarket Trading Bot
+Follows the Polygon chain head with one cheap eth_blockNumber poll per interval
+and notifies listeners (balance cache, receipt watcher...) when a new block lands
+"""
+
+import os
+import threading
+import time
+from typing import Callable, List, Optional
+
+# Seconds between head polls (Polygon produces a block roughly every 2s)
+BLOCK_POLL_INTERVAL = float(os.environ.get('BLOCK_POLL_INTERVAL', '1'))
+
+# The head is considered unknown if it hasn't been confirmed for this long (seconds)
+BLOCK_STALE_SECONDS = 10
+
+
+class BlockWatcher:
+    """
+    Background chain-head follower shared by everything that keys state on the block
+    """
+
+    def __init__(self, w3, interval: float = BLOCK_POLL_INTERVAL):
+        """
+        Initialize the watcher
+
+        Args:
+            w3: Web3 instance used for eth_blockNumber
+            interval: Seconds between polls
+        """
+        self.w3 = w3
+        self.interval = interval
+
+        self.block_number: Optional[int] = None
+        self.last_poll_ok_at = 0.0
+        self._listeners: List[Callable[[int], None]] = []
+        self._lock = threading.Lock()
+
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def add_listener(self, listener: Callable[[int], None]):
+        """
+        Register a callback invoked with the new block number on every new block
+
+        Args:
+            listener: Callable taking the block number (runs on the watcher thread)
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def current_block(self) -> Optional[int]:
+        """
+        Latest known block, or None if the watcher isn't running or the head is stale
+
+        Returns:
+            Block number or None
+        """
+        if not self.is_running() or time.time() - self.last_poll_ok_at > BLOCK_STALE_SECONDS:
+            return None
+        return self.block_number
+
+    def is_running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def poll(self) -> Optional[int]:
+        """
+        Read the chain head once and notify listeners if it moved
+
+        Returns:
+            Current block number (None if the read failed)
+        """
+        try:
+            block_number = self.w3.eth.block_number
+        except Exception as e:
+            print(f"[BLOCKS] Head poll failed: {e}")
+            return None
+
+        self.last_poll_ok_at = time.time()
+        if block_number == self.block_number:
+            return block_number
+
+        self.block_number = block_number
+        with self._lock:
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            try:
+                listener(block_number)
+            except Exception as e:
+                print(f"[BLOCKS ERROR] Listener failed on block {block_number}: {e}")
+
+        return block_number
+
+    def _run(self):
+        """Background poll loop"""
+        while not self._stop_event.is_set():
+            self.poll()
+            self._stop_event.wait(self.interval)
+
+    def start(self):
+        """Start following the chain head (no-op if already running)"""
+        if self.is_running():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="block-watcher", daemon=True)
+        self._thread.start()
+        print(f"[BLOCKS] Block watcher started (every {self.interval}s)")
+
+    def stop(self):
+        """Stop following the chain head"""
+        self._stop_event.set()
@@ -6,8 +6,20 @@ Handles real Web3 interactions with Polygon Mainnet
 from web3 import Web3
 from eth_account import Account
 import secrets
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from decimal import Decimal
+from eth_utils import keccak
+
+from rpc_pool import RpcPool, PooledHTTPProvider, BroadcastUncertainError
+from block_watcher import BlockWatcher
+from nonce_manager import NonceManager
+from receipt_watcher import ReceiptWatcher
+from gas_oracle import GasOracle
+from allowance_cache import AllowanceCache
+from log_indexer import LogIndexer
+from funding_watcher import FundingWatcher
+from balance_cache import BalanceCache
+from signer_service import get_signer_service
 
 # Network Configuration - Mainnet Only
 # NOTE: MATIC has been rebranded to POL, but functionality remains the same
@@ -80,6 +92,48 @@ ERC20_ABI = [
     }
 ]
 
+# Multicall3 (same address on every EVM chain) - batches many reads into one eth_call
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# Calls per aggregate3 request (3 calls per address: POL, USDC, allowance)
+MULTICALL_BATCH_SIZE = 600
+
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"}
+                ],
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    },
+    {
+        "inputs": [{"name": "addr", "type": "address"}],
+        "name": "getEthBalance",
+        "outputs": [{"name": "balance", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
 
 class BlockchainManager:
     """
@@ -89,36 +143,19 @@ class BlockchainManager:
     def __init__(self):
         """
         Initialize Web3 connection to Polygon Mainnet
-        WARNING FIXED: Now tries multiple RPC endpoints for better reliability
+        All configured RPC endpoints are pooled: each call goes to the fastest
+        healthy endpoint and fails over to the next one (health checks run in
+        the background, so construction does no network I/O)
         """
         self.network_config = NETWORK_CONFIG
         self.chain_id = self.network_config["chain_id"]
-        self.w3 = None
 
-        # Try multiple RPC endpoints until one works
-        for rpc_url in self.network_config["rpc_urls"]:
-            try:
-                print(f"[INFO] Trying RPC: {rpc_url}")
-                w3_test = Web3(Web3.HTTPProvider(rpc_url, request_kwargs={'timeout': 10}))
-
-                # Test connection
-                if w3_test.is_connected():
-                    block_number = w3_test.eth.block_number
-                    self.w3 = w3_test
-                    print(f"[OK] OK Connected to {self.network_config['name']} (Chain ID: {self.chain_id})")
-                    print(f"[INFO] RPC: {rpc_url}")
-                    print(f"[INFO] Latest Block: {block_number}")
-                    print(f"[INFO] Native Token: {self.network_config['native_token_name']} (formerly MATIC)")
-                    break
-            except Exception as e:
-                print(f"[WARNING] Failed to connect to {rpc_url}: {e}")
-                continue
+        self.rpc_pool = RpcPool(self.network_config["rpc_urls"])
+        self.w3 = Web3(PooledHTTPProvider(self.rpc_pool))
+        self.rpc_pool.start()
 
-        if not self.w3:
-            print(f"[ERROR] FAILED Failed to connect to ANY Polygon RPC endpoint!")
-            print(f"[ERROR] Tried {len(self.network_config['rpc_urls'])} different endpoints")
-            # Initialize with first endpoint anyway (will fail on use, but allows graceful degradation)
-            self.w3 = Web3(Web3.HTTPProvider(self.network_config["rpc_urls"][0]))
+        print(f"[INFO] {self.network_config['name']} (Chain ID: {self.chain_id}) via pool of {len(self.network_config['rpc_urls'])} RPC endpoints")
+        print(f"[INFO] Native Token: {self.network_config['native_token_name']} (formerly MATIC)")
 
         # Initialize USDC contract
         try:
@@ -130,7 +167,55 @@ class BlockchainManager:
         except Exception as e:
             print(f"[ERROR] Failed to initialize USDC contract: {e}")
             self.usdc_contract = None
+
+        # Initialize Multicall3 contract (batched balance reads)
+        self.multicall_contract = self.w3.eth.contract(
+            address=Web3.to_checksum_address(MULTICALL3_ADDRESS),
+            abi=MULTICALL3_ABI
+        )
+
+        # Chain-head follower + block-scoped balance cache (watcher started by the API server)
+        self.block_watcher = BlockWatcher(self.w3)
+        self.balance_cache = BalanceCache(self.block_watcher)
+
+        # USDC allowances per (owner, spender), kept current from Approval logs
+        self.allowance_cache = AllowanceCache(
+            self.w3, self.network_config["usdc_address"], self.read_allowances, self.block_watcher
+        )
+
+        # USDC Transfer/Approval indexer for our users' addresses (feeds both caches)
+        self.log_indexer = LogIndexer(
+            self.w3, self.network_config["usdc_address"], self.block_watcher,
+            self.balance_cache, self.allowance_cache
+        )
+
+        # Funding waits resolved by the shared scans above (no per-user polling)
+        self.funding_watcher = FundingWatcher(self, self.block_watcher, self.log_indexer)
+
+        # Local per-address nonce reservation (concurrent sends from one wallet)
+        self.nonce_manager = NonceManager(self.w3)
+
+        # Shared confirmation tracking for submitted transactions (driven by the block watcher)
+        self.receipt_watcher = ReceiptWatcher(self.w3, self.block_watcher, self.nonce_manager, self.balance_cache)
+
+        # Cached EIP-1559 fee estimates (sampled in the background on new blocks)
+        self.gas_oracle = GasOracle(self.w3, self.block_watcher)
+
+        # Transaction signing runs on the shared signer process pool
+        self.signer_service = get_signer_service()
     
+    # ==================== CONNECTION HEALTH ====================
+
+    def is_connected(self) -> bool:
+        """
+        Passive connection health (no RPC round trip)
+        Derived from the outcomes of real calls and the background pool health checks
+
+        Returns:
+            True if at least one RPC endpoint is currently usable
+        """
+        return self.rpc_pool.has_healthy()
+
     # ==================== NETWORK SWITCHING ====================
     
     def switch_network(self, network: str) -> bool:
@@ -211,7 +296,7 @@ class BlockchainManager:
                 "success": True,
                 "address": account.address,
                 "private_key": private_key,
-                "network": self.network
+                "network": self.network_config["name"]
             }
             
         except Exception as e:
@@ -268,12 +353,16 @@ class BlockchainManager:
             POL balance as float
         """
         try:
-            if not self.w3 or not self.w3.is_connected():
+            if not self.is_connected():
                 print(f"[ERROR] Not connected to Polygon network")
                 return 0.0
 
-            # Get balance in Wei
-            balance_wei = self.w3.eth.get_balance(Web3.to_checksum_address(address))
+            # Get balance in Wei (cached for the current block)
+            balance_wei = self.balance_cache.get(address, "pol")
+            if balance_wei is None:
+                block = self.balance_cache.current_block()
+                balance_wei = self.w3.eth.get_balance(Web3.to_checksum_address(address))
+                self.balance_cache.set(address, "pol", balance_wei, block)
 
             # Convert to POL (1 POL = 10^18 Wei, same as MATIC)
             balance_pol = self.w3.from_wei(balance_wei, 'ether')
@@ -305,7 +394,7 @@ class BlockchainManager:
             USDC balance as float
         """
         try:
-            if not self.w3 or not self.w3.is_connected():
+            if not self.is_connected():
                 print(f"[ERROR] Not connected to Polygon network")
                 return 0.0
 
@@ -313,10 +402,14 @@ class BlockchainManager:
                 print(f"[ERROR] USDC contract not initialized")
                 return 0.0
 
-            # Get USDC balance (USDC has 6 decimals on Polygon)
-            balance_raw = self.usdc_contract.functions.balanceOf(
-                Web3.to_checksum_address(address)
-            ).call()
+            # Get USDC balance (USDC has 6 decimals on Polygon, cached for the current block)
+            balance_raw = self.balance_cache.get(address, "usdc")
+            if balance_raw is None:
+                block = self.balance_cache.current_block()
+                balance_raw = self.usdc_contract.functions.balanceOf(
+                    Web3.to_checksum_address(address)
+                ).call()
+                self.balance_cache.set(address, "usdc", balance_raw, block)
 
             # Convert to human-readable (divide by 10^6)
             balance_usdc = balance_raw / (10 ** 6)
@@ -331,24 +424,114 @@ class BlockchainManager:
             traceback.print_exc()
             return 0.0
     
-    def get_all_balances(self, address: str) -> Dict:
+    def get_balances_batch(self, addresses: List[str], spender_address: str = None) -> Dict[str, Dict]:
         """
-        Get all token balances for an address
-        WARNING UPDATED: Now shows POL instead of MATIC (rebrand)
+        Read POL, USDC and USDC allowance for many addresses with Multicall3
+        (one eth_call per MULTICALL_BATCH_SIZE / 3 addresses instead of 3-4 RPCs each)
 
         Args:
-            address: Wallet address
+            addresses: Wallet addresses
+            spender_address: Allowance spender (defaults to Polymarket Exchange)
 
         Returns:
-            Dictionary with all balances (POL + USDC)
+            Dict of checksummed address -> raw balances
+            {"pol_wei", "usdc_raw", "allowance_raw"} (None for any read that failed)
         """
-        pol_balance = self.get_matic_balance(address)  # POL (formerly MATIC)
-        usdc_balance = self.get_usdc_balance(address)
+        if not addresses:
+            return {}
+
+        spender = Web3.to_checksum_address(spender_address or POLYMARKET_EXCHANGE)
+        multicall = Web3.to_checksum_address(MULTICALL3_ADDRESS)
+        usdc = Web3.to_checksum_address(self.network_config["usdc_address"])
+
+        owners = list(dict.fromkeys(Web3.to_checksum_address(a) for a in addresses))
+
+        # Serve whatever is still valid for the current block from the cache
+        balances = {}
+        missing = []
+        for owner in owners:
+            cached = {
+                "pol_wei": self.balance_cache.get(owner, "pol"),
+                "usdc_raw": self.balance_cache.get(owner, "usdc"),
+                "allowance_raw": self.allowance_cache.peek(owner, spender)
+            }
+            if None in cached.values():
+                missing.append(owner)
+            else:
+                balances[owner] = cached
+
+        if not missing:
+            return balances
+        owners = missing
+        block = self.balance_cache.current_block()
+
+        calls = []
+        for owner in owners:
+            calls.append((multicall, True, self.multicall_contract.encode_abi("getEthBalance", args=[owner])))
+            calls.append((usdc, True, self.usdc_contract.encode_abi("balanceOf", args=[owner])))
+            calls.append((usdc, True, self.usdc_contract.encode_abi("allowance", args=[owner, spender])))
+
+        results = []
+        for start in range(0, len(calls), MULTICALL_BATCH_SIZE):
+            batch = calls[start:start + MULTICALL_BATCH_SIZE]
+            results.extend(self.multicall_contract.functions.aggregate3(batch).call())
+
+        def decode(result):
+            success, data = result
+            if not success or len(data) < 32:
+                return None
+            return self.w3.codec.decode(["uint256"], data)[0]
+
+        for i, owner in enumerate(owners):
+            pol, usdc_balance, allowance = results[3 * i:3 * i + 3]
+            balances[owner] = {
+                "pol_wei": decode(pol),
+                "usdc_raw": decode(usdc_balance),
+                "allowance_raw": decode(allowance)
+            }
+            self.balance_cache.set(owner, "pol", balances[owner]["pol_wei"], block)
+            self.balance_cache.set(owner, "usdc", balances[owner]["usdc_raw"], block)
+            self.allowance_cache.set(owner, spender, balances[owner]["allowance_raw"], block)
+        return balances
 
+    def read_allowances(self, owners: List[str], spender_address: str) -> Dict[str, Optional[int]]:
+        """
+        Read USDC allowances of many owners towards one spender with Multicall3
+        (bulk loader behind the allowance cache - callers should use the cache)
+
+        Args:
+            owners: Token owners
+            spender_address: Approved contract
+
+        Returns:
+            Dict of checksummed owner -> raw allowance (None for any read that failed)
+        """
+        spender = Web3.to_checksum_address(spender_address)
+        usdc = Web3.to_checksum_address(self.network_config["usdc_address"])
+        owners = [Web3.to_checksum_address(o) for o in owners]
+
+        calls = [
+            (usdc, True, self.usdc_contract.encode_abi("allowance", args=[owner, spender]))
+            for owner in owners
+        ]
+
+        results = []
+        for start in range(0, len(calls), MULTICALL_BATCH_SIZE):
+            batch = calls[start:start + MULTICALL_BATCH_SIZE]
+            results.extend(self.multicall_contract.functions.aggregate3(batch).call())
+
+        allowances = {}
+        for owner, (success, data) in zip(owners, results):
+            ok = success and len(data) >= 32
+            allowances[owner] = self.w3.codec.decode(["uint256"], data)[0] if ok else None
+        return allowances
+
+    def _format_balances(self, address: str, pol_balance: float, usdc_balance: float, allowance: float = None) -> Dict:
+        """Shape raw POL/USDC amounts into the get_all_balances response"""
         # Approximate POL price in USD (update as needed)
         pol_price_usd = 0.50  # ~$0.50 per POL (update from price feed in production)
 
-        return {
+        balances = {
             "address": address,
             "network": self.network_config["name"],
             "pol": pol_balance,           # NEW: POL balance
@@ -358,10 +541,160 @@ class BlockchainManager:
             "matic_usd": pol_balance * pol_price_usd,  # LEGACY compatibility
             "total_usd": (pol_balance * pol_price_usd) + usdc_balance
         }
+        if allowance is not None:
+            balances["usdc_allowance"] = allowance
+        return balances
+
+    def get_all_balances_batch(self, addresses: List[str], spender_address: str = None) -> Dict[str, Dict]:
+        """
+        Get POL + USDC balances and USDC allowance for many addresses in one call
+
+        Args:
+            addresses: Wallet addresses
+            spender_address: Allowance spender (defaults to Polymarket Exchange)
+
+        Returns:
+            Dict of address (as given) -> get_all_balances-style dictionary; an address whose
+            POL or USDC sub-read failed gets "error" and "unknown" (those fields None) instead
+        """
+        raw = self.get_balances_batch(addresses, spender_address)
+
+        balances = {}
+        for address in addresses:
+            entry = raw.get(Web3.to_checksum_address(address), {})
+            pol_wei = entry.get("pol_wei")
+            usdc_raw = entry.get("usdc_raw")
+            allowance_raw = entry.get("allowance_raw")
+
+            unknown = [token for token, value in (("pol", pol_wei), ("usdc", usdc_raw)) if value is None]
+            if unknown:
+                # A failed read is not an empty wallet - never report it as 0
+                balances[address] = {
+                    "address": address,
+                    "network": self.network_config["name"],
+                    "pol": float(self.w3.from_wei(pol_wei, 'ether')) if pol_wei is not None else None,
+                    "usdc": usdc_raw / (10 ** 6) if usdc_raw is not None else None,
+                    "unknown": unknown,
+                    "error": f"Balance read failed for {', '.join(unknown).upper()}"
+                }
+                continue
+
+            balances[address] = self._format_balances(
+                address,
+                float(self.w3.from_wei(pol_wei, 'ether')),
+                usdc_raw / (10 ** 6),
+                allowance_raw / (10 ** 6) if allowance_raw is not None else None
+            )
+        return balances
+
+    def get_all_balances(self, address: str) -> Dict:
+        """
+        Get all token balances for an address
+        WARNING UPDATED: Now shows POL instead of MATIC (rebrand)
+        Reads POL, USDC and allowance in a single Multicall3 eth_call,
+        falling back to individual reads if the multicall fails
+
+        Args:
+            address: Wallet address
+
+        Returns:
+            Dictionary with all balances (POL + USDC + USDC allowance)
+        """
+        try:
+            balances = self.get_all_balances_batch([address])[address]
+            if "error" not in balances:
+                return balances
+            print(f"[WARNING] {balances['error']} in multicall for {address[:10]}..., falling back")
+        except Exception as e:
+            print(f"[WARNING] Multicall balance read failed for {address[:10]}..., falling back: {e}")
+
+        pol_balance = self.get_matic_balance(address)  # POL (formerly MATIC)
+        usdc_balance = self.get_usdc_balance(address)
+
+        return self._format_balances(address, pol_balance, usdc_balance)
     
     # ==================== TRANSACTIONS ====================
+
+    def broadcast_raw(self, raw_transaction: bytes) -> str:
+        """
+        Broadcast a signed transaction
+        A node that already has it ("already known", e.g. after a failover) counts as
+        sent; a broadcast that may have been delivered is resent only as the same bytes
+
+        Args:
+            raw_transaction: Signed transaction bytes
+
+        Returns:
+            Transaction hash computed from the signed bytes (0x-prefixed hex)
+        """
+        tx_hash = self.w3.to_hex(keccak(raw_transaction))
+        for attempt in range(2):
+            try:
+                self.w3.eth.send_raw_transaction(raw_transaction)
+                return tx_hash
+            except BroadcastUncertainError as e:
+                if attempt == 0:
+                    print(f"[TX] Broadcast of {tx_hash[:12]}... uncertain, resending the same transaction: {e}")
+                    continue
+                # Same bytes can only be mined once - keep the nonce and let the receipt watcher decide
+                print(f"[TX WARNING] Broadcast of {tx_hash[:12]}... still uncertain, tracking as pending: {e}")
+                return tx_hash
+            except Exception as e:
+                if NonceManager.is_already_known(e):
+                    print(f"[TX] {tx_hash[:12]}... already known to the node, treating as sent")
+                    return tx_hash
+                raise
+
+    def _sign_and_send(self, private_key: str, from_address: str, transaction: Dict, watch: Dict = None):
+        """
+        Reserve a nonce locally, sign and broadcast a transaction
+        A nonce rejected by the node triggers one resync from the chain and a retry
+
+        Args:
+            private_key: Sender's private key
+            from_address: Sender's address
+            transaction: Transaction fields without a nonce (the reserved nonce is set on it)
+            watch: Receipt watcher fields (kind, to_address, user_id...); the transaction is
+                   watched before it is broadcast so its confirmation can't be missed
+
+        Returns:
+            Transaction hash (0x-prefixed hex)
+        """
+        for attempt in range(2):
+            nonce = self.nonce_manager.reserve(from_address)
+            transaction['nonce'] = nonce
+            tx_hash = None
+            try:
+                raw_transaction = self.signer_service.sign_transaction(transaction, private_key)
+                tx_hash = self.w3.to_hex(keccak(raw_transaction))
+                if watch is not None:
+                    self.receipt_watcher.watch(tx_hash, from_address, nonce, **watch)
+                self.broadcast_raw(raw_transaction)
+            except Exception as e:
+                if watch is not None and tx_hash:
+                    self.receipt_watcher.discard(tx_hash, str(e))
+                self.nonce_manager.release(from_address, nonce, e)
+                if attempt == 0 and NonceManager.is_nonce_error(e):
+                    print(f"[NONCE] Nonce {nonce} rejected for {from_address[:10]}..., resyncing: {e}")
+                    continue
+                raise
+
+            self.nonce_manager.mark_sent(from_address, nonce, tx_hash)
+            return tx_hash
+
+    def _submitted_result(self, tx_hash: str, **extra) -> Dict:
+        """Immediate response for a transaction handed to the receipt watcher"""
+        result = {
+            "success": True,
+            "tx_hash": tx_hash,
+            "status": "pending",
+            "explorer_url": f"{self.network_config['explorer']}/tx/{tx_hash}",
+            "network": self.network_config["name"]
+        }
+        result.update(extra)
+        return result
     
-    def send_matic(self, from_private_key: str, to_address: str, amount: float) -> Dict:
+    def send_matic(self, from_private_key: str, to_address: str, amount: float, wait: bool = True, user_id: str = None) -> Dict:
         """
         Send MATIC to another address
         
@@ -369,6 +702,8 @@ class BlockchainManager:
             from_private_key: Sender's private key
             to_address: Recipient address
             amount: Amount of MATIC to send
+            wait: Block until mined; False returns right after broadcast (status "pending")
+            user_id: Owner's database ID (tags the confirmation event)
             
         Returns:
             Transaction result
@@ -378,39 +713,40 @@ class BlockchainManager:
             account = Account.from_key(from_private_key)
             from_address = account.address
             
-            # Get current gas price
-            gas_price = self.w3.eth.gas_price
-            
-            # Build transaction
+            # Build transaction (nonce is reserved locally when sending, fees come from the gas oracle)
             transaction = {
                 'from': from_address,
                 'to': Web3.to_checksum_address(to_address),
                 'value': self.w3.to_wei(amount, 'ether'),
                 'gas': 21000,  # Standard gas limit for ETH transfer
-                'gasPrice': gas_price,
-                'nonce': self.w3.eth.get_transaction_count(from_address),
-                'chainId': self.chain_id
+                'chainId': self.chain_id,
+                **self.gas_oracle.get_fee_fields()
             }
             
-            # Sign transaction
-            signed_txn = self.w3.eth.account.sign_transaction(transaction, from_private_key)
-            
-            # Send transaction
-            tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            # Sign and send transaction
+            tx_hash = self._sign_and_send(
+                from_private_key, from_address, transaction,
+                watch=dict(kind="pol_transfer", to_address=to_address, user_id=user_id, amount=amount)
+            )
+            self.balance_cache.invalidate(from_address, to_address)
             
-            print(f"[OK] Transaction sent! Hash: {tx_hash.hex()}")
-            print(f"🔗 View on explorer: {self.network_config['explorer']}/tx/{tx_hash.hex()}")
+            print(f"[OK] Transaction sent! Hash: {tx_hash}")
+            print(f"🔗 View on explorer: {self.network_config['explorer']}/tx/{tx_hash}")
+
+            if not wait:
+                return self._submitted_result(tx_hash)
             
             # Wait for confirmation (optional)
             receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+            self.nonce_manager.mark_mined(from_address, transaction['nonce'])
             
             return {
                 "success": True,
-                "tx_hash": tx_hash.hex(),
+                "tx_hash": tx_hash,
                 "status": receipt['status'],
                 "block_number": receipt['blockNumber'],
-                "explorer_url": f"{self.network_config['explorer']}/tx/{tx_hash.hex()}",
-                "network": self.network
+                "explorer_url": f"{self.network_config['explorer']}/tx/{tx_hash}",
+                "network": self.network_config["name"]
             }
             
         except Exception as e:
@@ -420,7 +756,7 @@ class BlockchainManager:
                 "error": str(e)
             }
     
-    def send_usdc(self, from_private_key: str, to_address: str, amount: float) -> Dict:
+    def send_usdc(self, from_private_key: str, to_address: str, amount: float, wait: bool = True, user_id: str = None) -> Dict:
         """
         Send USDC to another address
         
@@ -428,6 +764,8 @@ class BlockchainManager:
             from_private_key: Sender's private key
             to_address: Recipient address
             amount: Amount of USDC to send
+            wait: Block until mined; False returns right after broadcast (status "pending")
+            user_id: Owner's database ID (tags the confirmation event)
             
         Returns:
             Transaction result
@@ -447,30 +785,34 @@ class BlockchainManager:
             ).build_transaction({
                 'from': from_address,
                 'gas': 100000,  # Gas limit for ERC20 transfer
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(from_address),
-                'chainId': self.chain_id
+                'chainId': self.chain_id,
+                **self.gas_oracle.get_fee_fields()
             })
             
-            # Sign transaction
-            signed_txn = self.w3.eth.account.sign_transaction(transaction, from_private_key)
-            
-            # Send transaction
-            tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            # Sign and send transaction
+            tx_hash = self._sign_and_send(
+                from_private_key, from_address, transaction,
+                watch=dict(kind="usdc_transfer", to_address=to_address, user_id=user_id, amount=amount)
+            )
+            self.balance_cache.invalidate(from_address, to_address)
             
-            print(f"[OK] USDC transaction sent! Hash: {tx_hash.hex()}")
-            print(f"🔗 View on explorer: {self.network_config['explorer']}/tx/{tx_hash.hex()}")
+            print(f"[OK] USDC transaction sent! Hash: {tx_hash}")
+            print(f"🔗 View on explorer: {self.network_config['explorer']}/tx/{tx_hash}")
+
+            if not wait:
+                return self._submitted_result(tx_hash)
             
             # Wait for confirmation
             receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+            self.nonce_manager.mark_mined(from_address, transaction['nonce'])
             
             return {
                 "success": True,
-                "tx_hash": tx_hash.hex(),
+                "tx_hash": tx_hash,
                 "status": receipt['status'],
                 "block_number": receipt['blockNumber'],
-                "explorer_url": f"{self.network_config['explorer']}/tx/{tx_hash.hex()}",
-                "network": self.network
+                "explorer_url": f"{self.network_config['explorer']}/tx/{tx_hash}",
+                "network": self.network_config["name"]
             }
             
         except Exception as e:
@@ -494,7 +836,7 @@ class BlockchainManager:
             Dictionary with allowance info
         """
         try:
-            if not self.w3 or not self.w3.is_connected():
+            if not self.is_connected():
                 return {
                     "success": False,
                     "error": "Not connected to Polygon network"
@@ -510,11 +852,13 @@ class BlockchainManager:
             if not spender_address:
                 spender_address = POLYMARKET_EXCHANGE
 
-            # Get allowance from USDC contract
-            allowance_raw = self.usdc_contract.functions.allowance(
-                Web3.to_checksum_address(wallet_address),
-                Web3.to_checksum_address(spender_address)
-            ).call()
+            # In-memory lookup (kept current from Approval logs; reads through on a miss)
+            allowance_raw = self.allowance_cache.get_allowance(wallet_address, spender_address)
+            if allowance_raw is None:
+                return {
+                    "success": False,
+                    "error": "Could not read USDC allowance"
+                }
 
             # Convert to human-readable (USDC has 6 decimals)
             allowance_usdc = allowance_raw / (10 ** 6)
@@ -540,7 +884,7 @@ class BlockchainManager:
                 "error": str(e)
             }
 
-    def approve_usdc(self, private_key: str, amount: float = None, spender_address: str = None) -> Dict:
+    def approve_usdc(self, private_key: str, amount: float = None, spender_address: str = None, wait: bool = True, user_id: str = None) -> Dict:
         """
         Approve USDC.e for Polymarket Exchange contract (required before trading)
 
@@ -548,6 +892,8 @@ class BlockchainManager:
             private_key: Wallet private key
             amount: Amount of USDC to approve (if None, approves unlimited)
             spender_address: Contract to approve (defaults to Polymarket Exchange)
+            wait: Block until mined; False returns right after broadcast (status "pending")
+            user_id: Owner's database ID (tags the confirmation event)
 
         Returns:
             Transaction result
@@ -555,7 +901,7 @@ class BlockchainManager:
         try:
             print(f"[APPROVE] Starting USDC.e approval process...")
 
-            if not self.w3 or not self.w3.is_connected():
+            if not self.is_connected():
                 return {
                     "success": False,
                     "error": "Not connected to Polygon network"
@@ -609,23 +955,33 @@ class BlockchainManager:
             ).build_transaction({
                 'from': from_address,
                 'gas': 100000,  # Gas limit for ERC20 approval
-                'gasPrice': self.w3.eth.gas_price,
-                'nonce': self.w3.eth.get_transaction_count(from_address),
-                'chainId': self.chain_id
+                'chainId': self.chain_id,
+                **self.gas_oracle.get_fee_fields()
             })
 
-            # Sign transaction
-            signed_txn = self.w3.eth.account.sign_transaction(transaction, private_key)
+            # Sign and send transaction
+            tx_hash = self._sign_and_send(
+                private_key, from_address, transaction,
+                watch=dict(kind="approval", user_id=user_id, spender=spender_address)
+            )
+            self.balance_cache.invalidate(from_address)
+            self.allowance_cache.invalidate(from_address, spender_address)
 
-            # Send transaction
-            tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            print(f"[OK] OK USDC.e Approval transaction sent! Hash: {tx_hash}")
+            print(f"🔗 View on explorer: {self.network_config['explorer']}/tx/{tx_hash}")
 
-            print(f"[OK] OK USDC.e Approval transaction sent! Hash: {tx_hash.hex()}")
-            print(f"🔗 View on explorer: {self.network_config['explorer']}/tx/{tx_hash.hex()}")
+            if not wait:
+                return self._submitted_result(
+                    tx_hash,
+                    spender=spender_address,
+                    amount_approved=amount if amount else "unlimited",
+                    message="USDC.e approval submitted - confirmation will follow"
+                )
 
             # Wait for confirmation
             print(f"[APPROVE] Waiting for transaction confirmation (up to 2 minutes)...")
             receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+            self.nonce_manager.mark_mined(from_address, transaction['nonce'])
 
             success = receipt['status'] == 1
 
@@ -636,10 +992,10 @@ class BlockchainManager:
 
             return {
                 "success": success,
-                "tx_hash": tx_hash.hex(),
+                "tx_hash": tx_hash,
                 "status": receipt['status'],
                 "block_number": receipt['blockNumber'],
-                "explorer_url": f"{self.network_config['explorer']}/tx/{tx_hash.hex()}",
+                "explorer_url": f"{self.network_config['explorer']}/tx/{tx_hash}",
                 "spender": spender_address,
                 "amount_approved": amount if amount else "unlimited",
                 "network": self.network_config["name"],
@@ -671,15 +1027,18 @@ class BlockchainManager:
             return None
     
     def get_gas_price(self) -> Dict:
-        """Get current gas price"""
+        """Get current gas price (from the cached gas oracle sample)"""
         try:
-            gas_price_wei = self.w3.eth.gas_price
-            gas_price_gwei = self.w3.from_wei(gas_price_wei, 'gwei')
+            summary = self.gas_oracle.get_summary()
+            gas_price_gwei = summary["base_fee_gwei"] + summary["priority_fee_gwei"]["standard"]
             
             return {
-                "gas_price_wei": gas_price_wei,
-                "gas_price_gwei": float(gas_price_gwei),
-                "network": self.network
+                "gas_price_wei": int(gas_price_gwei * 10**9),
+                "gas_price_gwei": gas_price_gwei,
+                "base_fee_gwei": summary["base_fee_gwei"],
+                "priority_fee_gwei": summary["priority_fee_gwei"],
+                "max_fee_gwei": summary["max_fee_gwei"],
+                "network": self.network_config["name"]
             }
         except Exception as e:
             print(f"[ERROR] Error getting gas price: {e}")
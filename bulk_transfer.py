@@ -0,0 +1,359 @@
+"""
+Bulk Transfers for Polymarket Trading Bot
+Pipeline for many POL / USDC transfers from one wallet (treasury payouts, points
+redemptions): rows are validated and the sender's balances checked once, nonces
+are reserved locally in order, transactions are signed as one batch on the signer
+pool and broadcast in nonce order. Confirmations come from the shared receipt watcher
+"""
+
+import os
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from web3 import Web3
+from eth_account import Account
+from eth_utils import keccak
+
+from nonce_manager import NonceManager
+from signer_service import SIGNER_TIMEOUT
+
+# Max rows in one bulk request
+BULK_TRANSFER_MAX_ROWS = int(os.environ.get('BULK_TRANSFER_MAX_ROWS', '5000'))
+
+# Gas limits per row (same as the single-transfer path)
+POL_TRANSFER_GAS = 21000
+USDC_TRANSFER_GAS = 100000
+
+# How long jobs stay queryable after submission (seconds)
+BULK_JOB_RETENTION = 24 * 3600
+
+TOKENS = ("usdc", "pol")
+
+
+class BulkTransferManager:
+    """
+    Validates, signs, broadcasts and tracks bulk transfer jobs
+    """
+
+    def __init__(self, blockchain):
+        """
+        Initialize the manager
+
+        Args:
+            blockchain: BlockchainManager (nonces, gas oracle, signer service, receipt watcher)
+        """
+        self.blockchain = blockchain
+
+        self._jobs: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    # ==================== VALIDATION ====================
+
+    def _validate_rows(self, rows: List[Dict]) -> List[Dict]:
+        """Normalize rows; invalid ones are kept with status "invalid" and an error"""
+        prepared = []
+        for index, row in enumerate(rows):
+            entry = {
+                "index": index,
+                "recipient": row.get('recipient'),
+                "amount": row.get('amount'),
+                "token": str(row.get('token', '')).lower(),
+                "status": "queued",
+                "tx_hash": None,
+                "nonce": None,
+                "error": None
+            }
+            try:
+                if not Web3.is_address(entry["recipient"] or ""):
+                    raise ValueError(f"Invalid recipient address: {entry['recipient']}")
+                entry["recipient"] = Web3.to_checksum_address(entry["recipient"])
+                entry["amount"] = float(entry["amount"])
+                if entry["amount"] <= 0:
+                    raise ValueError("Amount must be positive")
+                if entry["token"] not in TOKENS:
+                    raise ValueError(f"Invalid token type: {row.get('token')}")
+            except Exception as e:
+                entry["status"] = "invalid"
+                entry["error"] = str(e)
+            prepared.append(entry)
+        return prepared
+
+    def _check_balances(self, from_address: str, rows: List[Dict], fees: Dict) -> Optional[str]:
+        """
+        One balance read for the whole job
+
+        Returns:
+            Error message if the sender can't cover every valid row (amounts + gas), else None
+        """
+        balances = self.blockchain.get_balances_batch([from_address]).get(from_address, {})
+        pol_wei = balances.get("pol_wei")
+        usdc_raw = balances.get("usdc_raw")
+        if pol_wei is None or usdc_raw is None:
+            return "Could not read sender balances"
+
+        need_usdc = sum(int(r["amount"] * 10 ** 6) for r in rows if r["token"] == "usdc")
+        need_pol = sum(self.blockchain.w3.to_wei(r["amount"], 'ether') for r in rows if r["token"] == "pol")
+        need_gas = sum(
+            (USDC_TRANSFER_GAS if r["token"] == "usdc" else POL_TRANSFER_GAS) * fees['maxFeePerGas']
+            for r in rows
+        )
+
+        if need_usdc > usdc_raw:
+            return f"Insufficient USDC: need {need_usdc / 10 ** 6:.2f}, have {usdc_raw / 10 ** 6:.2f}"
+        if need_pol + need_gas > pol_wei:
+            w3 = self.blockchain.w3
+            return (f"Insufficient POL for amounts + gas: need {float(w3.from_wei(need_pol + need_gas, 'ether')):.4f}, "
+                    f"have {float(w3.from_wei(pol_wei, 'ether')):.4f}")
+        return None
+
+    # ==================== SUBMISSION ====================
+
+    def submit(self, private_key: str, rows: List[Dict], user_id: str = None) -> Dict:
+        """
+        Validate a bulk transfer and start it in the background
+
+        Args:
+            private_key: Sender's private key
+            rows: Dicts with recipient, amount, token ("usdc" or "pol")
+            user_id: Owner's database ID (tags confirmation events)
+
+        Returns:
+            Job summary (job_id to poll), or {"success": False, "error"} if rejected
+        """
+        if not rows:
+            return {"success": False, "error": "No transfers given"}
+        if len(rows) > BULK_TRANSFER_MAX_ROWS:
+            return {"success": False, "error": f"Too many transfers (max {BULK_TRANSFER_MAX_ROWS})"}
+
+        from_address = Account.from_key(private_key).address
+        prepared = self._validate_rows(rows)
+        valid = [r for r in prepared if r["status"] == "queued"]
+        if not valid:
+            return {"success": False, "error": "No valid transfers", "rows": prepared}
+
+        # Fees fixed once for the job so the balance check covers exactly what is signed
+        fees = self.blockchain.gas_oracle.get_fee_fields()
+        try:
+            error = self._check_balances(from_address, valid, fees)
+        except Exception as e:
+            error = f"Balance check failed: {e}"
+        if error:
+            return {"success": False, "error": error}
+
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "user_id": user_id,
+            "from_address": from_address,
+            "rows": prepared,
+            "status": "submitting",
+            "created_at": time.time(),
+            "submitted_at": None,
+            "finished_at": None
+        }
+        with self._lock:
+            self._prune()
+            self._jobs[job["job_id"]] = job
+
+        threading.Thread(
+            target=self._run, args=(job, private_key, valid, fees),
+            name=f"bulk-{job['job_id'][:8]}", daemon=True
+        ).start()
+
+        print(f"[BULK] Job {job['job_id'][:8]}: {len(valid)} transfers from {from_address[:10]}... "
+              f"({len(prepared) - len(valid)} invalid)")
+        return {"success": True, **self.get_job(job["job_id"])}
+
+    def _build(self, row: Dict, fees: Dict) -> Dict:
+        """Unsigned transaction for a row (nonce set later)"""
+        if row["token"] == "pol":
+            return {
+                'to': row["recipient"],
+                'value': self.blockchain.w3.to_wei(row["amount"], 'ether'),
+                'gas': POL_TRANSFER_GAS,
+                'chainId': self.blockchain.chain_id,
+                **fees
+            }
+        return {
+            'to': Web3.to_checksum_address(self.blockchain.network_config["usdc_address"]),
+            'value': 0,
+            'data': self.blockchain.usdc_contract.encode_abi("transfer", args=[row["recipient"], int(row["amount"] * 10 ** 6)]),
+            'gas': USDC_TRANSFER_GAS,
+            'chainId': self.blockchain.chain_id,
+            **fees
+        }
+
+    def _run(self, job: Dict, private_key: str, rows: List[Dict], fees: Dict):
+        """
+        Reserve nonces in order, sign as one batch, broadcast in nonce order
+
+        Each nonce is sent only after the one before it was accepted, so the node never
+        sees a gap. A row that fails has its nonce filled (0-value self-transfer); if that
+        isn't possible, or the node rejects our nonces, the job stops and the unsent
+        nonces - the top of our reserved range - are released from the highest down
+        """
+        nonce_manager = self.blockchain.nonce_manager
+        from_address = job["from_address"]
+
+        # 1. Nonces reserved locally in row order, then one batch of signing jobs for the signer pool
+        signing = []
+        for row in rows:
+            row["nonce"] = nonce_manager.reserve(from_address)
+            transaction = self._build(row, fees)
+            transaction['nonce'] = row["nonce"]
+            signing.append(("tx", private_key, transaction))
+        futures = self.blockchain.signer_service.sign_batch(signing)
+
+        # 2. Broadcast in nonce order as signatures come back
+        for position, (row, future) in enumerate(zip(rows, futures)):
+            try:
+                raw_transaction = future.result(timeout=SIGNER_TIMEOUT)
+                self._send(row, raw_transaction, from_address, job)
+                continue
+            except Exception as e:
+                error = e
+
+            row["status"] = "failed"
+            row["error"] = str(error)
+            if NonceManager.is_nonce_error(error) or not self._fill_gap(row, private_key, fees, error):
+                self._abort(rows[position:], from_address, error)
+                break
+
+        self.blockchain.balance_cache.invalidate(from_address, *[r["recipient"] for r in rows])
+        job["submitted_at"] = time.time()
+        job["status"] = "submitted"
+
+        elapsed = job["submitted_at"] - job["created_at"]
+        sent = sum(1 for r in rows if r["tx_hash"])
+        print(f"[BULK] Job {job['job_id'][:8]}: {sent}/{len(rows)} broadcast in {elapsed:.1f}s "
+              f"({sent / max(elapsed, 1e-6):.1f} tx/s)")
+
+    def _send(self, row: Dict, raw_transaction: bytes, from_address: str, job: Dict):
+        """Watch then broadcast one signed row (an "already known" or uncertain broadcast counts as sent)"""
+        blockchain = self.blockchain
+        tx_hash = blockchain.w3.to_hex(keccak(raw_transaction))
+        blockchain.receipt_watcher.watch(
+            tx_hash, from_address, row["nonce"],
+            kind=f"bulk_{row['token']}_transfer", to_address=row["recipient"],
+            user_id=job["user_id"], amount=row["amount"], bulk_job=job["job_id"]
+        )
+        try:
+            blockchain.broadcast_raw(raw_transaction)
+        except Exception as e:
+            blockchain.receipt_watcher.discard(tx_hash, str(e))
+            raise
+
+        blockchain.nonce_manager.mark_sent(from_address, row["nonce"], tx_hash)
+        row["tx_hash"] = tx_hash
+        row["status"] = "pending"
+
+    def _fill_gap(self, row: Dict, private_key: str, fees: Dict, error: Exception) -> bool:
+        """
+        A row failed after its nonce was reserved. Later rows hold higher nonces, so the
+        nonce is used for a 0-value self-transfer instead of being left as a gap that
+        would stall them
+
+        Returns:
+            True if the filler was broadcast
+        """
+        blockchain = self.blockchain
+        from_address = Account.from_key(private_key).address
+        filler = {
+            'to': from_address,
+            'value': 0,
+            'gas': POL_TRANSFER_GAS,
+            'chainId': blockchain.chain_id,
+            'nonce': row["nonce"],
+            **fees
+        }
+
+        tx_hash = None
+        try:
+            raw_transaction = blockchain.signer_service.sign_transaction(filler, private_key)
+            tx_hash = blockchain.w3.to_hex(keccak(raw_transaction))
+            blockchain.receipt_watcher.watch(tx_hash, from_address, row["nonce"], kind="nonce_gap_fill")
+            blockchain.broadcast_raw(raw_transaction)
+        except Exception as e:
+            if tx_hash:
+                blockchain.receipt_watcher.discard(tx_hash, str(e))
+            print(f"[BULK ERROR] Could not fill nonce gap {row['nonce']} for {from_address[:10]}...: {e}")
+            return False
+
+        blockchain.nonce_manager.mark_sent(from_address, row["nonce"], tx_hash)
+        print(f"[BULK] Row {row['index']} failed ({error}); filled nonce {row['nonce']} with {tx_hash[:12]}...")
+        return True
+
+    def _abort(self, unsent: List[Dict], from_address: str, error: Exception):
+        """
+        Stop a job: every remaining row is unsent, so their nonces are released from the
+        highest down (each is then the last one handed out and rolls back cleanly; a
+        nonce error makes the nonce manager resync from the chain instead)
+        """
+        for row in unsent:
+            if row["status"] != "failed":
+                row["status"] = "failed"
+                row["error"] = f"Not sent: job stopped at nonce {unsent[0]['nonce']} ({error})"
+        for row in reversed(unsent):
+            self.blockchain.nonce_manager.release(from_address, row["nonce"], error)
+        print(f"[BULK ERROR] Stopped at nonce {unsent[0]['nonce']} for {from_address[:10]}..., "
+              f"{len(unsent)} rows not sent: {error}")
+
+    # ==================== STATUS ====================
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """
+        Job status with per-row outcomes (confirmations read from the receipt watcher)
+
+        Args:
+            job_id: ID returned by submit()
+
+        Returns:
+            Job dictionary, or None if unknown / expired
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if not job:
+            return None
+
+        watcher = self.blockchain.receipt_watcher
+        for row in job["rows"]:
+            if row["status"] == "pending" and row["tx_hash"]:
+                record = watcher.get(row["tx_hash"])
+                if record and record.get("status") in ("confirmed", "failed"):
+                    row["status"] = record["status"]
+                    row["block_number"] = record.get("block_number")
+                    if record["status"] == "failed":
+                        row["error"] = "Transaction reverted"
+
+        counts = {}
+        for row in job["rows"]:
+            counts[row["status"]] = counts.get(row["status"], 0) + 1
+
+        finished = job["status"] == "submitted" and not counts.get("pending") and not counts.get("queued")
+        if finished and not job["finished_at"]:
+            job["finished_at"] = time.time()
+            job["status"] = "completed"
+
+        submitting_seconds = (job["submitted_at"] or time.time()) - job["created_at"]
+        broadcast = sum(1 for r in job["rows"] if r["tx_hash"])
+        return {
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "from_address": job["from_address"],
+            "total": len(job["rows"]),
+            "counts": counts,
+            "throughput": {
+                "broadcast": broadcast,
+                "broadcast_per_second": round(broadcast / max(submitting_seconds, 1e-6), 2),
+                "submitting_seconds": round(submitting_seconds, 3),
+                "completed_seconds": round(job["finished_at"] - job["created_at"], 3) if job["finished_at"] else None
+            },
+            "rows": [dict(r) for r in job["rows"]]
+        }
+
+    def _prune(self):
+        """Drop jobs past retention (lock held)"""
+        cutoff = time.time() - BULK_JOB_RETENTION
+        for job_id in [j for j, job in self._jobs.items() if job["created_at"] < cutoff]:
+            del self._jobs[job_id]
@@ -0,0 +1,120 @@
+"""
+Event Bus for Polymarket Trading Bot
+In-process publish/subscribe used to push order, transaction and wallet
+updates to dashboard clients over Server-Sent Events (SSE)
+"""
+
+import asyncio
+import json
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+# Events buffered per subscriber before the oldest are dropped (slow clients)
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# Seconds between SSE keep-alive comments
+SSE_HEARTBEAT_SECONDS = 15
+
+
+class Subscription:
+    """A single subscriber's event queue and filter"""
+
+    def __init__(self, event_filter: Optional[Callable[[Dict], bool]] = None):
+        self.queue = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.event_filter = event_filter
+
+    def offer(self, event: Dict):
+        """Queue an event, dropping the oldest one if the subscriber is behind"""
+        if self.event_filter and not self.event_filter(event):
+            return
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            try:
+                self.queue.get_nowait()
+                self.queue.put_nowait(event)
+            except (queue.Empty, queue.Full):
+                pass
+
+
+class EventBus:
+    """
+    Thread-safe fan-out of events to any number of subscribers
+    Publishers run on worker threads; subscribers are usually SSE responses
+    """
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, event_filter: Optional[Callable[[Dict], bool]] = None) -> Subscription:
+        """
+        Register a subscriber
+
+        Args:
+            event_filter: Optional predicate; only matching events are delivered
+
+        Returns:
+            Subscription holding the subscriber's queue
+        """
+        subscription = Subscription(event_filter)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Remove a subscriber"""
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event_type: str, data: Dict):
+        """
+        Publish an event to all matching subscribers
+
+        Args:
+            event_type: Event name (e.g. "order_update")
+            data: Event payload
+        """
+        event = dict(data)
+        event["type"] = event_type
+        event.setdefault("timestamp", datetime.now().isoformat())
+
+        with self._lock:
+            subscribers = list(self._subscribers)
+
+        for subscription in subscribers:
+            subscription.offer(event)
+
+    def subscriber_count(self) -> int:
+        """Number of connected subscribers"""
+        with self._lock:
+            return len(self._subscribers)
+
+    async def stream(self, event_filter: Optional[Callable[[Dict], bool]] = None):
+        """
+        Async generator yielding SSE-formatted events (for StreamingResponse)
+
+        Args:
+            event_filter: Optional predicate; only matching events are sent
+        """
+        subscription = self.subscribe(event_filter)
+        last_sent = time.time()
+        try:
+            yield ": connected\n\n"
+            while True:
+                try:
+                    event = subscription.queue.get_nowait()
+                except queue.Empty:
+                    if time.time() - last_sent >= SSE_HEARTBEAT_SECONDS:
+                        last_sent = time.time()
+                        yield ": keep-alive\n\n"
+                    await asyncio.sleep(0.25)
+                    continue
+
+                last_sent = time.time()
+                yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+        finally:
+            self.unsubscribe(subscription)
@@ -4,7 +4,6 @@ Helps users get test tokens and fund their wallets
 """
 
 import requests
-import time
 from typing import Dict, Optional
 from blockchain_manager import BlockchainManager
 
@@ -192,6 +191,8 @@ class FaucetManager:
     def wait_for_funding(self, wallet_address: str, timeout: int = 300) -> Dict:
         """
         Wait for wallet to receive funds (useful for testing)
+        Registers a funding subscription resolved by the shared block/log scans
+        instead of polling balances
         
         Args:
             wallet_address: Wallet to monitor
@@ -202,26 +203,16 @@ class FaucetManager:
         """
         print(f"⏳ Monitoring {wallet_address} for incoming funds...")
         
-        start_time = time.time()
-        initial_balances = self.blockchain.get_all_balances(wallet_address)
+        watcher = self.blockchain.funding_watcher
+        if not self.blockchain.block_watcher.is_running():
+            self.blockchain.block_watcher.start()
         
-        while time.time() - start_time < timeout:
-            current_balances = self.blockchain.get_all_balances(wallet_address)
-            
-            # Check if any balance increased
-            if (current_balances['matic'] > initial_balances['matic'] or 
-                current_balances['usdc'] > initial_balances['usdc']):
-                
-                print(f"✅ Funds received!")
-                return {
-                    "success": True,
-                    "funded": True,
-                    "matic_received": current_balances['matic'] - initial_balances['matic'],
-                    "usdc_received": current_balances['usdc'] - initial_balances['usdc'],
-                    "new_balances": current_balances
-                }
-            
-            time.sleep(10)  # Check every 10 seconds
+        funding_wait = watcher.watch(wallet_address, timeout=timeout)
+        result = watcher.wait(funding_wait.wait_id)
+        
+        if result and result.get("funded"):
+            print(f"✅ Funds received!")
+            return result
         
         print("⏱️ Timeout - no funds received")
         return {
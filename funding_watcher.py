@@ -0,0 +1,287 @@
+"""
+Funding Watcher for Polymarket Trading Bot
+Funding waits are subscriptions resolved by shared chain scans instead of a
+polling loop per waiting user: USDC deposits arrive through the log indexer's
+Transfer events, POL deposits (native, no logs) through one multicall per few
+blocks covering every waiting address. While the indexer isn't live, the same
+multicall also catches USDC balance increases. Resolutions are published on the event bus
+"""
+
+import os
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+# Default / max seconds a funding wait stays open
+FUNDING_WAIT_TIMEOUT = 300
+FUNDING_WAIT_MAX_TIMEOUT = 3600
+
+# Blocks between the shared POL balance check (Polygon: ~2s per block)
+FUNDING_POL_CHECK_EVERY_BLOCKS = int(os.environ.get('FUNDING_POL_CHECK_EVERY_BLOCKS', '3'))
+
+# Resolved waits stay queryable this long (seconds)
+FUNDING_RETENTION = 600
+
+
+class FundingWait:
+    """One open funding subscription"""
+
+    def __init__(self, address: str, timeout: float, user_id: str = None,
+                 min_usdc: float = 0.0, min_pol: float = 0.0):
+        self.wait_id = uuid.uuid4().hex
+        self.address = address
+        self.user_id = user_id
+        self.min_usdc = min_usdc
+        self.min_pol = min_pol
+        self.created_at = time.time()
+        self.deadline = self.created_at + timeout
+
+        self.initial_pol_wei: Optional[int] = None
+        self.initial_usdc_raw: Optional[int] = None
+        self.usdc_received_raw = 0
+        self.deposits: List[Dict] = []
+
+        self.status = "waiting"  # waiting -> funded / timeout
+        self.result: Optional[Dict] = None
+        self.resolved_at: Optional[float] = None
+        self.event = threading.Event()
+
+    def is_done(self) -> bool:
+        return self.event.is_set()
+
+    def summary(self) -> Dict:
+        data = {
+            "wait_id": self.wait_id,
+            "wallet_address": self.address,
+            "user_id": self.user_id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "expires_at": self.deadline
+        }
+        if self.result:
+            data.update(self.result)
+        return data
+
+
+class FundingWatcher:
+    """
+    Shared deposit detection for any number of concurrent funding waits
+    """
+
+    def __init__(self, blockchain, block_watcher, log_indexer):
+        """
+        Initialize the watcher and subscribe to new blocks and indexed transfers
+
+        Args:
+            blockchain: BlockchainManager (multicall balance reads)
+            block_watcher: BlockWatcher that drives POL checks and timeouts
+            log_indexer: LogIndexer that reports USDC transfers
+        """
+        self.blockchain = blockchain
+        self.log_indexer = log_indexer
+        self.event_bus = None
+
+        self._waits: Dict[str, FundingWait] = {}             # wait_id -> wait
+        self._by_address: Dict[str, List[FundingWait]] = {}  # lowercase address -> open waits
+        self._lock = threading.Lock()
+        self._last_pol_check_block: Optional[int] = None
+
+        block_watcher.add_listener(self._on_new_block)
+        log_indexer.add_listener(self._on_ledger_entry)
+
+    def connect(self, event_bus=None):
+        """
+        Attach the event bus ("funding_update" events)
+
+        Args:
+            event_bus: EventBus
+        """
+        self.event_bus = event_bus
+
+    # ==================== SUBSCRIPTIONS ====================
+
+    def watch(self, wallet_address: str, timeout: float = FUNDING_WAIT_TIMEOUT, user_id: str = None,
+              min_usdc: float = 0.0, min_pol: float = 0.0) -> FundingWait:
+        """
+        Open a funding wait for an address
+
+        Args:
+            wallet_address: Wallet expecting a deposit
+            timeout: Seconds before the wait resolves as "timeout"
+            user_id: Owner's database ID (for per-user event filtering)
+            min_usdc: USDC that must arrive to count as funded (0 = any USDC deposit)
+            min_pol: POL that must arrive to count as funded (0 = any POL increase)
+
+        Returns:
+            The FundingWait (resolved later by the shared scans)
+        """
+        timeout = max(1, min(timeout, FUNDING_WAIT_MAX_TIMEOUT))
+        wait = FundingWait(wallet_address, timeout, user_id, min_usdc, min_pol)
+
+        # POL has no logs (and USDC logs stop while the indexer is down): remember the
+        # starting balances for the shared multicall check
+        balances = self.blockchain.get_balances_batch([wallet_address])
+        entry = next(iter(balances.values()), {})
+        wait.initial_pol_wei = entry.get("pol_wei")
+        wait.initial_usdc_raw = entry.get("usdc_raw")
+
+        self.log_indexer.track([wallet_address])
+
+        with self._lock:
+            self._waits[wait.wait_id] = wait
+            self._by_address.setdefault(wallet_address.lower(), []).append(wait)
+
+        print(f"[FUNDING] Watching {wallet_address[:10]}... for deposits ({timeout:.0f}s, id {wait.wait_id[:8]})")
+        return wait
+
+    def get(self, wait_id: str) -> Optional[FundingWait]:
+        with self._lock:
+            return self._waits.get(wait_id)
+
+    def wait(self, wait_id: str, timeout: float = None) -> Optional[Dict]:
+        """
+        Block until a funding wait resolves (for scripts; API handlers long-poll instead)
+
+        Args:
+            wait_id: ID returned by watch()
+            timeout: Seconds to block (defaults to the wait's own deadline)
+
+        Returns:
+            The wait's summary, or None if the ID is unknown
+        """
+        wait = self.get(wait_id)
+        if not wait:
+            return None
+        if timeout is None:
+            timeout = max(0, wait.deadline - time.time()) + 5
+        wait.event.wait(timeout)
+        return wait.summary()
+
+    def cancel(self, wait_id: str) -> bool:
+        wait = self.get(wait_id)
+        if not wait or wait.is_done():
+            return False
+        self._resolve(wait, "cancelled", {"success": False, "funded": False, "message": "Cancelled"})
+        return True
+
+    def open_count(self) -> int:
+        with self._lock:
+            return sum(len(waits) for waits in self._by_address.values())
+
+    # ==================== DETECTION ====================
+
+    def _on_ledger_entry(self, entry: Dict):
+        """Log indexer listener: a USDC transfer into a waiting address"""
+        if entry["type"] != "transfer" or entry["direction"] != "in":
+            return
+
+        with self._lock:
+            waits = list(self._by_address.get(entry["address"], []))
+
+        for wait in waits:
+            wait.usdc_received_raw += entry["value"]
+            wait.deposits.append(entry)
+            if wait.usdc_received_raw / (10 ** 6) >= wait.min_usdc:
+                self._resolve_funded(wait)
+
+    def _on_new_block(self, block_number: int):
+        """Block watcher listener: shared balance check every few blocks, then timeouts"""
+        with self._lock:
+            open_waits = [w for waits in self._by_address.values() for w in waits]
+        if not open_waits:
+            self._prune()
+            return
+
+        due = (
+            self._last_pol_check_block is None
+            or block_number - self._last_pol_check_block >= FUNDING_POL_CHECK_EVERY_BLOCKS
+        )
+        if due:
+            self._last_pol_check_block = block_number
+            self._check_balances(open_waits)
+
+        now = time.time()
+        for wait in open_waits:
+            if not wait.is_done() and now >= wait.deadline:
+                self._resolve(wait, "timeout", {
+                    "success": False,
+                    "funded": False,
+                    "message": "Timeout waiting for funds"
+                })
+        self._prune()
+
+    def _check_balances(self, waits: List[FundingWait]):
+        """
+        One multicall for every waiting address's balances
+
+        POL increases always count. USDC increases only count while the log indexer
+        isn't live - otherwise its Transfer events resolve the wait (with the deposits)
+        """
+        addresses = list({w.address for w in waits})
+        try:
+            balances = self.blockchain.get_balances_batch(addresses)
+        except Exception as e:
+            print(f"[FUNDING] Shared balance check failed: {e}")
+            return
+
+        check_usdc = not self.log_indexer.is_live()
+        by_address = {a.lower(): b for a, b in balances.items()}
+        for wait in waits:
+            entry = by_address.get(wait.address.lower(), {})
+
+            pol_wei = entry.get("pol_wei")
+            if pol_wei is not None and wait.initial_pol_wei is not None:
+                received = (pol_wei - wait.initial_pol_wei) / (10 ** 18)
+                if received > 0 and received >= wait.min_pol:
+                    self._resolve_funded(wait)
+                    continue
+
+            usdc_raw = entry.get("usdc_raw")
+            if check_usdc and usdc_raw is not None and wait.initial_usdc_raw is not None:
+                received_raw = usdc_raw - wait.initial_usdc_raw
+                if received_raw > 0 and received_raw / (10 ** 6) >= wait.min_usdc:
+                    wait.usdc_received_raw = max(wait.usdc_received_raw, received_raw)
+                    self._resolve_funded(wait)
+
+    def _resolve_funded(self, wait: FundingWait):
+        """Resolve a wait as funded with the amounts received so far"""
+        balances = self.blockchain.get_all_balances(wait.address)
+        pol_received = 0.0
+        if wait.initial_pol_wei is not None:
+            pol_received = max(0.0, balances.get('pol', 0.0) - wait.initial_pol_wei / (10 ** 18))
+
+        print(f"[FUNDING] Funds received at {wait.address[:10]}... (id {wait.wait_id[:8]})")
+        self._resolve(wait, "funded", {
+            "success": True,
+            "funded": True,
+            "matic_received": pol_received,
+            "usdc_received": wait.usdc_received_raw / (10 ** 6),
+            "deposits": list(wait.deposits),
+            "new_balances": balances
+        })
+
+    def _resolve(self, wait: FundingWait, status: str, result: Dict):
+        """Close a wait, wake blocked callers and publish the outcome"""
+        with self._lock:
+            if wait.is_done():
+                return
+            wait.status = status
+            wait.result = result
+            wait.resolved_at = time.time()
+            waits = self._by_address.get(wait.address.lower(), [])
+            if wait in waits:
+                waits.remove(wait)
+            if not waits:
+                self._by_address.pop(wait.address.lower(), None)
+            wait.event.set()
+
+        if self.event_bus:
+            self.event_bus.publish("funding_update", wait.summary())
+
+    def _prune(self):
+        """Forget resolved waits older than the retention window"""
+        cutoff = time.time() - FUNDING_RETENTION
+        with self._lock:
+            for wait_id in [i for i, w in self._waits.items() if w.resolved_at and w.resolved_at < cutoff]:
+                del self._waits[wait_id]
@@ -0,0 +1,132 @@
+"""
+Gas Oracle for Polymarket Trading Bot
+Samples eth_feeHistory in the background (driven by the block watcher), caches the
+next base fee and priority-fee percentiles, and hands transaction builders ready-made
+EIP-1559 fee fields - no gas-price RPC per transaction
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+# Blocks of history per sample and the reward percentiles requested
+FEE_HISTORY_BLOCKS = 10
+FEE_PERCENTILES = {"slow": 25, "standard": 50, "fast": 75}
+
+# Minimum seconds between background samples (Polygon produces ~30 blocks a minute)
+GAS_ORACLE_REFRESH_SECONDS = float(os.environ.get('GAS_ORACLE_REFRESH_SECONDS', '10'))
+
+# Samples older than this are refreshed synchronously before use (seconds)
+GAS_ORACLE_MAX_AGE = 60
+
+# Polygon validators ignore transactions tipping less than this (wei)
+POLYGON_MIN_PRIORITY_FEE = int(float(os.environ.get('POLYGON_MIN_PRIORITY_FEE_GWEI', '30')) * 10**9)
+
+# maxFeePerGas = base fee * this + priority fee (absorbs several full blocks of base-fee rises)
+BASE_FEE_MULTIPLIER = 2
+
+
+class GasOracle:
+    """
+    Cached EIP-1559 fee estimates
+    """
+
+    def __init__(self, w3, block_watcher=None):
+        """
+        Initialize the oracle (no network access until the first sample)
+
+        Args:
+            w3: Web3 instance used for eth_feeHistory
+            block_watcher: BlockWatcher that triggers background samples (optional)
+        """
+        self.w3 = w3
+        self.block_watcher = block_watcher
+
+        self._sample: Optional[Dict] = None
+        self._lock = threading.Lock()
+
+        if block_watcher:
+            block_watcher.add_listener(self._on_new_block)
+
+    def refresh(self) -> Dict:
+        """
+        Sample eth_feeHistory and cache base fee + priority-fee percentiles
+
+        Returns:
+            The new sample
+        """
+        percentiles = sorted(FEE_PERCENTILES.values())
+        history = self.w3.eth.fee_history(FEE_HISTORY_BLOCKS, 'latest', percentiles)
+
+        # Last entry is the base fee of the *next* block
+        base_fee = int(history['baseFeePerGas'][-1])
+
+        priority = {}
+        for speed, pct in FEE_PERCENTILES.items():
+            column = percentiles.index(pct)
+            rewards = sorted(int(r[column]) for r in history.get('reward', []) if r)
+            median = rewards[len(rewards) // 2] if rewards else 0
+            priority[speed] = max(median, POLYGON_MIN_PRIORITY_FEE)
+
+        sample = {
+            "base_fee": base_fee,
+            "priority_fee": priority,
+            "block_number": int(history['oldestBlock']) + len(history['baseFeePerGas']) - 2,
+            "sampled_at": time.time()
+        }
+
+        with self._lock:
+            self._sample = sample
+        return sample
+
+    def _on_new_block(self, block_number: int):
+        """Block watcher listener: resample at most every GAS_ORACLE_REFRESH_SECONDS"""
+        with self._lock:
+            sample = self._sample
+        if sample and time.time() - sample["sampled_at"] < GAS_ORACLE_REFRESH_SECONDS:
+            return
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"[GAS] Fee history sample failed: {e}")
+
+    def get_sample(self) -> Dict:
+        """Cached sample, refreshed synchronously only if missing or stale"""
+        with self._lock:
+            sample = self._sample
+        if not sample or time.time() - sample["sampled_at"] > GAS_ORACLE_MAX_AGE:
+            sample = self.refresh()
+        return sample
+
+    def get_fee_fields(self, speed: str = "standard") -> Dict:
+        """
+        EIP-1559 fee fields ready to merge into a transaction
+
+        Args:
+            speed: "slow", "standard" or "fast"
+
+        Returns:
+            Dict with maxFeePerGas and maxPriorityFeePerGas (wei)
+        """
+        sample = self.get_sample()
+        priority_fee = sample["priority_fee"].get(speed, sample["priority_fee"]["standard"])
+        return {
+            "maxFeePerGas": sample["base_fee"] * BASE_FEE_MULTIPLIER + priority_fee,
+            "maxPriorityFeePerGas": priority_fee
+        }
+
+    def get_summary(self) -> Dict:
+        """Current estimates in gwei (for display)"""
+        sample = self.get_sample()
+        gwei = 10 ** 9
+        return {
+            "base_fee_gwei": sample["base_fee"] / gwei,
+            "priority_fee_gwei": {k: v / gwei for k, v in sample["priority_fee"].items()},
+            "max_fee_gwei": {
+                k: (sample["base_fee"] * BASE_FEE_MULTIPLIER + v) / gwei
+                for k, v in sample["priority_fee"].items()
+            },
+            "block_number": sample["block_number"],
+            "sampled_at": sample["sampled_at"]
+        }
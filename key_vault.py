@@ -0,0 +1,87 @@
+"""
+Key Vault for Polymarket Trading Bot
+Authenticated encryption (Fernet: AES-128-CBC + HMAC-SHA256) for stored private
+keys, with the master key taken from the environment. Values written before the
+vault existed (plain base64) still decrypt and are re-encrypted when next loaded;
+no new value is ever written without the master key
+"""
+
+import os
+import base64
+from typing import Optional
+
+from cryptography.fernet import Fernet, InvalidToken
+
+# Master key: a urlsafe-base64 32-byte Fernet key (Fernet.generate_key())
+WALLET_ENCRYPTION_KEY = os.environ.get('WALLET_ENCRYPTION_KEY')
+
+# Prefix marking vault-encrypted values (legacy values are bare base64)
+VAULT_PREFIX = "v2:"
+
+
+class KeyVault:
+    """
+    Encrypts and decrypts private keys for storage
+    """
+
+    def __init__(self, master_key: Optional[str] = WALLET_ENCRYPTION_KEY):
+        """
+        Initialize the vault
+
+        Args:
+            master_key: Fernet key; without one the vault is read-only for legacy
+                        base64 values and refuses to store new keys
+        """
+        self._fernet = Fernet(master_key.encode()) if master_key else None
+
+        if not self._fernet:
+            print("[VAULT ERROR] WALLET_ENCRYPTION_KEY not set - new private keys cannot be stored "
+                  "(legacy base64 keys can still be read)")
+
+    @property
+    def enabled(self) -> bool:
+        return self._fernet is not None
+
+    def encrypt(self, private_key: str) -> str:
+        """
+        Encrypt a private key for storage
+
+        Args:
+            private_key: Raw private key
+
+        Returns:
+            Stored representation ("v2:<fernet token>")
+
+        Raises:
+            ValueError: If no master key is configured
+        """
+        if not self._fernet:
+            raise ValueError("WALLET_ENCRYPTION_KEY is not set - refusing to store a private key unencrypted")
+        return VAULT_PREFIX + self._fernet.encrypt(private_key.encode()).decode()
+
+    def decrypt(self, stored: str) -> str:
+        """
+        Decrypt a stored private key (vault or legacy format)
+
+        Args:
+            stored: Value from the database
+
+        Returns:
+            Raw private key
+
+        Raises:
+            ValueError: If the value was tampered with or needs a different master key
+        """
+        if not stored.startswith(VAULT_PREFIX):
+            return base64.b64decode(stored.encode()).decode()
+
+        if not self._fernet:
+            raise ValueError("Encrypted private key found but WALLET_ENCRYPTION_KEY is not set")
+        try:
+            return self._fernet.decrypt(stored[len(VAULT_PREFIX):].encode()).decode()
+        except InvalidToken:
+            raise ValueError("Private key failed authentication (wrong WALLET_ENCRYPTION_KEY or tampered value)")
+
+    def needs_upgrade(self, stored: str) -> bool:
+        """True if a stored value is legacy base64 and the vault could encrypt it properly"""
+        return self.enabled and not stored.startswith(VAULT_PREFIX)
@@ -0,0 +1,382 @@
+"""
+Log Indexer for Polymarket Trading Bot
+Follows USDC Transfer/Approval events touching our users' addresses with
+eth_getLogs over block ranges (a few requests per scan for every tracked
+address, no per-user polling). Keeps a small per-address ledger, checkpoints
+the last processed block to disk, and pushes what it sees into the balance
+and allowance caches and to listeners (deposit detection)
+"""
+
+import os
+import json
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from web3 import Web3
+
+# keccak("Transfer(address,address,uint256)") / keccak("Approval(address,address,uint256)")
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+APPROVAL_TOPIC = "0x8c5be1e5ebec7d5bd14f71427d1e84f3dd0314c0f7b2291e5b200ac8c7c3b925"
+
+# Where the checkpoint and ledger are persisted between restarts
+LOG_INDEX_PATH = os.environ.get('LOG_INDEX_PATH', 'log_index.json')
+
+# Blocks between scans (Polygon: ~2s per block)
+LOG_INDEX_SCAN_EVERY_BLOCKS = int(os.environ.get('LOG_INDEX_SCAN_EVERY_BLOCKS', '2'))
+
+# Max block range per eth_getLogs request (public RPCs reject wide ranges)
+LOG_INDEX_MAX_RANGE = 1000
+
+# Ranges processed per scan pass while catching up (passes repeat on the indexer thread until caught up)
+LOG_INDEX_RANGES_PER_SCAN = 5
+
+# A checkpoint further behind than this is abandoned instead of replayed (blocks, ~11h)
+LOG_INDEX_MAX_CATCHUP = 20000
+
+# Addresses per topic filter (OR-list) in one eth_getLogs request
+LOG_INDEX_TOPIC_CHUNK = 200
+
+# Ledger entries kept per address
+LOG_LEDGER_MAX_ENTRIES = 200
+
+# Indexing counts as live if the last successful scan is this recent (seconds)
+LOG_INDEX_STALE_SECONDS = 30
+
+
+class LogIndexer:
+    """
+    Incremental USDC Transfer/Approval indexer for tracked addresses
+    """
+
+    def __init__(
+        self,
+        w3,
+        token_address: str,
+        block_watcher,
+        balance_cache=None,
+        allowance_cache=None,
+        path: str = LOG_INDEX_PATH
+    ):
+        """
+        Initialize the indexer and load the persisted checkpoint
+
+        Args:
+            w3: Web3 instance used for eth_getLogs
+            token_address: ERC20 to index (USDC.e)
+            block_watcher: BlockWatcher that drives the scans
+            balance_cache: BalanceCache invalidated for addresses a Transfer touches (optional)
+            allowance_cache: AllowanceCache fed with Approval logs (optional)
+            path: JSON file for the checkpoint and ledger
+        """
+        self.w3 = w3
+        self.token_address = Web3.to_checksum_address(token_address)
+        self.block_watcher = block_watcher
+        self.balance_cache = balance_cache
+        self.allowance_cache = allowance_cache
+        self.path = path
+
+        self._tracked: set = set()                  # lowercase addresses
+        self._ledger: Dict[str, List[Dict]] = {}    # lowercase address -> entries, oldest first
+        self._listeners: List[Callable[[Dict], None]] = []
+        self._lock = threading.Lock()
+        self._scan_lock = threading.Lock()
+        self._save_lock = threading.Lock()
+
+        self.checkpoint: Optional[int] = None
+        self._last_scan_ok_at = 0.0
+        self.logs_indexed = 0
+
+        # Scans run on their own thread so catch-up never stalls the block watcher's other listeners
+        self._head: Optional[int] = None
+        self._last_pass_ok = True
+        self._wake = threading.Event()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+        self.load()
+
+        block_watcher.add_listener(self._on_new_block)
+        if allowance_cache:
+            # Approval logs now arrive through the indexer
+            allowance_cache.external_feed = True
+        if balance_cache:
+            balance_cache.set_event_source(self.is_tracked, self.covered_through, ("usdc",))
+
+    # ==================== TRACKING ====================
+
+    def track(self, addresses: List[str]):
+        """
+        Start indexing addresses (history before the current checkpoint is not replayed)
+
+        Args:
+            addresses: Wallet addresses
+        """
+        added = 0
+        with self._lock:
+            for address in addresses:
+                if address and Web3.is_address(address) and address.lower() not in self._tracked:
+                    self._tracked.add(address.lower())
+                    added += 1
+        if added:
+            print(f"[INDEXER] Tracking {added} new addresses ({len(self._tracked)} total)")
+
+    def untrack(self, address: str):
+        with self._lock:
+            self._tracked.discard(address.lower())
+
+    def is_tracked(self, address: str) -> bool:
+        with self._lock:
+            return address.lower() in self._tracked
+
+    def add_listener(self, listener: Callable[[Dict], None]):
+        """
+        Register a callback invoked with every new ledger entry
+
+        Args:
+            listener: Callable taking the entry (runs on the indexer thread)
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def is_live(self) -> bool:
+        """True while scans are succeeding (caches may rely on the indexer)"""
+        return time.time() - self._last_scan_ok_at < LOG_INDEX_STALE_SECONDS
+
+    def covered_through(self) -> Optional[int]:
+        """Last block whose logs have been applied (None while the indexer isn't live)"""
+        return self.checkpoint if self.is_live() else None
+
+    # ==================== SCANNING ====================
+
+    def _on_new_block(self, block_number: int):
+        """Block watcher listener: wake the indexer thread every few blocks (never scans here)"""
+        self._head = block_number
+        if self.checkpoint is not None and block_number - self.checkpoint < LOG_INDEX_SCAN_EVERY_BLOCKS:
+            return
+
+        with self._thread_lock:
+            if not self._thread or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="log-indexer", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def _run(self):
+        """Indexer thread: scan to the latest head, one bounded pass at a time"""
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            head = self._head
+            if head is None:
+                continue
+            try:
+                self.scan(head)
+            except Exception as e:
+                print(f"[INDEXER ERROR] Scan failed: {e}")
+                continue
+            if self._last_pass_ok and self.checkpoint is not None and self.checkpoint < head:
+                self._wake.set()  # Still catching up - next pass right away (a failed fetch waits for a block)
+
+    def scan(self, head: int):
+        """
+        Index logs from the checkpoint towards the head (bounded per call while catching up)
+
+        Args:
+            head: Latest block
+        """
+        with self._scan_lock:
+            if self.checkpoint is None or head - self.checkpoint > LOG_INDEX_MAX_CATCHUP:
+                if self.checkpoint is not None:
+                    print(f"[INDEXER] Checkpoint {self.checkpoint} is {head - self.checkpoint} blocks behind, skipping to head")
+                self.checkpoint = head - 1
+
+            ranges = 0
+            while self.checkpoint < head and ranges < LOG_INDEX_RANGES_PER_SCAN:
+                from_block = self.checkpoint + 1
+                to_block = min(head, from_block + LOG_INDEX_MAX_RANGE - 1)
+                try:
+                    logs = self._fetch(from_block, to_block)
+                except Exception as e:
+                    print(f"[INDEXER] Log scan {from_block}-{to_block} failed: {e}")
+                    self._last_pass_ok = False
+                    return
+                self._apply(logs, to_block)
+                self.checkpoint = to_block
+                ranges += 1
+
+            self._last_pass_ok = True
+            if self.checkpoint >= head:
+                self._last_scan_ok_at = time.time()
+            self.save()
+
+    def _fetch(self, from_block: int, to_block: int) -> List[Dict]:
+        """All Transfer/Approval logs in a range that touch a tracked address (or watched spender)"""
+        with self._lock:
+            tracked = sorted(self._tracked)
+
+        filters = []
+        for start in range(0, len(tracked), LOG_INDEX_TOPIC_CHUNK):
+            topics = [self._address_topic(a) for a in tracked[start:start + LOG_INDEX_TOPIC_CHUNK]]
+            filters.append([TRANSFER_TOPIC, topics])          # Sent by a tracked address
+            filters.append([TRANSFER_TOPIC, None, topics])    # Received by a tracked address
+
+        # Approvals are filtered by spender, so the allowance cache also sees untracked owners
+        spenders = self.allowance_cache.tracked_spenders() if self.allowance_cache else []
+        if spenders:
+            filters.append([APPROVAL_TOPIC, None, [self._address_topic(s) for s in spenders]])
+
+        logs = {}
+        for topics in filters:
+            for log in self.w3.eth.get_logs({
+                "address": self.token_address,
+                "fromBlock": from_block,
+                "toBlock": to_block,
+                "topics": topics
+            }):
+                # A transfer between two tracked addresses matches both filters
+                logs[(self._hex(log["transactionHash"]), log["logIndex"])] = log
+        return sorted(logs.values(), key=lambda l: (l["blockNumber"], l["logIndex"]))
+
+    def _apply(self, logs: List[Dict], to_block: int):
+        """Turn logs into ledger entries, update caches and notify listeners"""
+        approvals = []
+        entries = []
+
+        with self._lock:
+            for log in logs:
+                topic0 = self._hex(log["topics"][0]).lower()
+                first = self._topic_address(log["topics"][1])
+                second = self._topic_address(log["topics"][2])
+                base = {
+                    "tx_hash": self._hex(log["transactionHash"]),
+                    "block_number": log["blockNumber"],
+                    "log_index": log["logIndex"],
+                    "value": int(self._hex(log["data"]), 16)
+                }
+
+                if topic0 == APPROVAL_TOPIC:
+                    approvals.append(log)
+                    if first in self._tracked:
+                        entries.append(dict(base, type="approval", address=first, owner=first, spender=second))
+                    continue
+
+                if first in self._tracked:
+                    entries.append(dict(base, type="transfer", direction="out", address=first, counterparty=second))
+                if second in self._tracked:
+                    entries.append(dict(base, type="transfer", direction="in", address=second, counterparty=first))
+
+            for entry in entries:
+                ledger = self._ledger.setdefault(entry["address"], [])
+                ledger.append(entry)
+                del ledger[:-LOG_LEDGER_MAX_ENTRIES]
+            listeners = list(self._listeners)
+
+        self.logs_indexed += len(logs)
+
+        if self.allowance_cache:
+            self.allowance_cache.feed(approvals, to_block)
+        if self.balance_cache:
+            touched = {e["address"] for e in entries if e["type"] == "transfer"}
+            if touched:
+                self.balance_cache.invalidate(*touched)
+
+        for entry in entries:
+            for listener in listeners:
+                try:
+                    listener(dict(entry))
+                except Exception as e:
+                    print(f"[INDEXER ERROR] Listener failed on {entry['tx_hash'][:12]}...: {e}")
+
+    # ==================== QUERIES ====================
+
+    def get_ledger(self, address: str, limit: int = 50) -> List[Dict]:
+        """
+        Indexed activity for an address, newest first
+
+        Args:
+            address: Wallet address
+            limit: Max entries
+
+        Returns:
+            Ledger entries (raw values, 6 decimals for USDC)
+        """
+        with self._lock:
+            entries = list(self._ledger.get(address.lower(), []))
+        return [dict(e) for e in reversed(entries[-limit:])]
+
+    def get_deposits(self, address: str, since_block: int = None) -> List[Dict]:
+        """Incoming transfers to an address (optionally only after a block), oldest first"""
+        with self._lock:
+            entries = list(self._ledger.get(address.lower(), []))
+        return [
+            dict(e) for e in entries
+            if e["type"] == "transfer" and e["direction"] == "in"
+            and (since_block is None or e["block_number"] > since_block)
+        ]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "tracked_addresses": len(self._tracked),
+                "ledger_addresses": len(self._ledger),
+                "checkpoint": self.checkpoint,
+                "logs_indexed": self.logs_indexed,
+                "live": self.is_live()
+            }
+
+    # ==================== HELPERS ====================
+
+    @staticmethod
+    def _hex(value) -> str:
+        text = value.hex() if hasattr(value, "hex") else str(value)
+        return text if text.startswith("0x") else "0x" + text
+
+    @classmethod
+    def _topic_address(cls, topic) -> str:
+        return "0x" + cls._hex(topic)[-40:].lower()
+
+    @staticmethod
+    def _address_topic(address: str) -> str:
+        return "0x" + "0" * 24 + address.lower()[2:]
+
+    # ==================== PERSISTENCE ====================
+
+    def load(self):
+        """Load the checkpoint and ledger"""
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+
+            self.checkpoint = data.get("checkpoint")
+            self._ledger = data.get("ledger", {})
+            self._tracked.update(self._ledger.keys())
+
+            print(f"[INDEXER] Resuming from block {self.checkpoint} ({len(self._ledger)} ledgers) from {self.path}")
+
+        except Exception as e:
+            print(f"[INDEXER WARNING] Could not load {self.path}: {e}")
+
+    def save(self):
+        """Persist the checkpoint and ledger (atomic replace)"""
+        if not self.path:
+            return
+
+        try:
+            with self._save_lock:
+                with self._lock:
+                    data = {
+                        "saved_at": time.time(),
+                        "checkpoint": self.checkpoint,
+                        "ledger": {a: list(entries) for a, entries in self._ledger.items()}
+                    }
+
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+
+        except Exception as e:
+            print(f"[INDEXER WARNING] Could not save {self.path}: {e}")
@@ -0,0 +1,362 @@
+"""
+Market Catalog for Polymarket Trading Bot
+Keeps a warm market_id -> trading metadata lookup table (condition ID, token IDs,
+tick size, neg-risk flag) so trades can resolve markets without a free-text search,
+plus a token_id -> order-construction metadata cache built from the CLOB listing
+"""
+
+import os
+import json
+import threading
+import time
+from typing import Dict, List, Optional
+
+from polymarket_api import PolymarketAPI
+
+# Where the lookup table is persisted between restarts
+CATALOG_PATH = os.environ.get('MARKET_CATALOG_PATH', 'market_catalog.json')
+
+# How often the background refresher re-reads the Gamma catalog (seconds)
+CATALOG_REFRESH_SECONDS = int(os.environ.get('MARKET_CATALOG_REFRESH_SECONDS', '300'))
+
+# How many of the most active markets to keep warm (Gamma pages are 100 markets)
+CATALOG_WARM_LIMIT = int(os.environ.get('MARKET_CATALOG_WARM_LIMIT', '500'))
+CATALOG_PAGE_SIZE = 100
+
+# How often token metadata is re-read from the CLOB markets listing (seconds)
+METADATA_REFRESH_SECONDS = int(os.environ.get('MARKET_METADATA_REFRESH_SECONDS', '900'))
+
+# Upper bound on CLOB listing pages read per refresh
+METADATA_MAX_PAGES = int(os.environ.get('MARKET_METADATA_MAX_PAGES', '200'))
+CLOB_END_CURSOR = "LTE="
+
+
+class MarketCatalog:
+    """
+    In-memory market lookup table, warmed from the Gamma catalog and persisted locally
+    """
+
+    def __init__(self, api: PolymarketAPI, path: str = CATALOG_PATH):
+        """
+        Initialize the catalog and load any previously persisted entries
+
+        Args:
+            api: PolymarketAPI instance used to fetch markets
+            path: JSON file used to persist the lookup table
+        """
+        self.api = api
+        self.path = path
+
+        self._markets: Dict[str, Dict] = {}        # market_id -> entry
+        self._by_condition: Dict[str, str] = {}    # condition_id -> market_id
+        self._tokens: Dict[str, Dict] = {}         # token_id -> order-construction metadata
+        self._lock = threading.Lock()
+
+        self._refresh_thread = None
+        self._stop_event = threading.Event()
+        self.last_refresh = None
+        self.last_metadata_refresh = None
+
+        self.load()
+
+    # ==================== ENTRY PARSING ====================
+
+    @staticmethod
+    def build_entry(market: Dict) -> Optional[Dict]:
+        """
+        Build a catalog entry from a raw Gamma market or a formatted market
+
+        Args:
+            market: Market dictionary (raw Gamma fields or format_market_data output)
+
+        Returns:
+            Catalog entry or None if the market has no trading identifiers
+        """
+        market_id = market.get("id") or market.get("market_id")
+        condition_id = market.get("conditionId") or market.get("condition_id")
+
+        token_ids = market.get("token_ids") or market.get("clobTokenIds") or []
+        if isinstance(token_ids, str):
+            try:
+                token_ids = json.loads(token_ids)
+            except Exception:
+                token_ids = []
+
+        if not market_id or not condition_id or not token_ids:
+            return None
+
+        tick_size = market.get("orderPriceMinTickSize") or market.get("tick_size")
+        min_order_size = market.get("orderMinSize") or market.get("min_order_size")
+
+        return {
+            "market_id": str(market_id),
+            "question": market.get("question", ""),
+            "condition_id": condition_id,
+            "token_ids": [str(t) for t in token_ids],  # [YES_token_id, NO_token_id]
+            "tick_size": float(tick_size) if tick_size else None,
+            "min_order_size": float(min_order_size) if min_order_size else None,
+            "neg_risk": bool(market.get("negRisk", market.get("neg_risk", False))),
+            "active": market.get("active", True),
+            "closed": market.get("closed", False),
+            "updated_at": time.time()
+        }
+
+    # ==================== LOOKUPS ====================
+
+    def ingest(self, markets: List[Dict]) -> int:
+        """
+        Add or update catalog entries from a list of markets
+
+        Args:
+            markets: Raw or formatted market dictionaries
+
+        Returns:
+            Number of entries added or updated
+        """
+        count = 0
+        with self._lock:
+            for market in markets:
+                entry = self.build_entry(market)
+                if not entry:
+                    continue
+                self._markets[entry["market_id"]] = entry
+                self._by_condition[entry["condition_id"]] = entry["market_id"]
+                self._index_tokens(entry)
+                count += 1
+        return count
+
+    def _index_tokens(self, entry: Dict):
+        """Record Gamma tick size / neg-risk per token unless the CLOB listing already did (lock held)"""
+        if not entry.get("tick_size"):
+            return
+        for token_id in entry["token_ids"]:
+            existing = self._tokens.get(token_id)
+            if existing and existing.get("source") == "clob":
+                continue
+            self._tokens[token_id] = {
+                "token_id": token_id,
+                "condition_id": entry["condition_id"],
+                "tick_size": entry["tick_size"],
+                "min_order_size": entry.get("min_order_size"),
+                "neg_risk": entry["neg_risk"],
+                "fee_rate_bps": None,
+                "source": "gamma",
+                "updated_at": entry["updated_at"]
+            }
+
+    def get(self, market_id: str) -> Optional[Dict]:
+        """
+        Look up a market by market ID or condition ID without any network access
+
+        Args:
+            market_id: Gamma market ID or condition ID
+
+        Returns:
+            Catalog entry or None
+        """
+        with self._lock:
+            entry = self._markets.get(str(market_id))
+            if not entry:
+                resolved_id = self._by_condition.get(market_id)
+                entry = self._markets.get(resolved_id) if resolved_id else None
+            return dict(entry) if entry else None
+
+    def resolve(self, market_id: str) -> Optional[Dict]:
+        """
+        Resolve a market ID to its trading identifiers
+        Served from memory when warm; a miss costs one Gamma lookup by ID (never a search)
+
+        Args:
+            market_id: Gamma market ID or condition ID
+
+        Returns:
+            Catalog entry or None if the market does not exist
+        """
+        entry = self.get(market_id)
+        if entry:
+            return entry
+
+        print(f"[CATALOG] Cache miss for market {market_id}, fetching by ID...")
+        market = self.api.get_market(market_id)
+        if not market or not self.ingest([market]):
+            return None
+
+        self.save()
+        return self.get(market_id)
+
+    def get_token_metadata(self, token_id: str) -> Optional[Dict]:
+        """
+        Get order-construction metadata for an outcome token (no network)
+
+        Args:
+            token_id: CLOB token ID
+
+        Returns:
+            Dict with tick_size, min_order_size, neg_risk, fee_rate_bps or None
+        """
+        with self._lock:
+            meta = self._tokens.get(str(token_id))
+            return dict(meta) if meta else None
+
+    def size(self) -> int:
+        """Number of markets in the catalog"""
+        with self._lock:
+            return len(self._markets)
+
+    # ==================== REFRESH ====================
+
+    def refresh(self, limit: int = CATALOG_WARM_LIMIT) -> int:
+        """
+        Re-read the most active markets from Gamma and persist the table
+
+        Args:
+            limit: Number of markets to fetch (in pages of 100)
+
+        Returns:
+            Number of entries added or updated
+        """
+        updated = 0
+        for offset in range(0, limit, CATALOG_PAGE_SIZE):
+            page = self.api.get_markets(limit=CATALOG_PAGE_SIZE, offset=offset)
+            if not page:
+                break
+            updated += self.ingest(page)
+            if len(page) < CATALOG_PAGE_SIZE:
+                break
+
+        self.last_refresh = time.time()
+        print(f"[CATALOG] OK Refreshed {updated} markets ({self.size()} cached)")
+
+        self.save()
+        return updated
+
+    def refresh_metadata(self, max_pages: int = METADATA_MAX_PAGES) -> int:
+        """
+        Bulk-load tick size, min order size, neg-risk and fee rate for every
+        open market from the CLOB listing (replaces per-order lookups)
+
+        Args:
+            max_pages: Upper bound on listing pages to read
+
+        Returns:
+            Number of tokens indexed
+        """
+        tokens = {}
+        cursor = "MA=="
+        for _ in range(max_pages):
+            page = self.api.get_clob_markets_page(cursor)
+            for market in page.get("data") or []:
+                if market.get("closed") or not market.get("minimum_tick_size"):
+                    continue
+                for token in market.get("tokens") or []:
+                    token_id = str(token.get("token_id") or "")
+                    if not token_id:
+                        continue
+                    tokens[token_id] = {
+                        "token_id": token_id,
+                        "condition_id": market.get("condition_id"),
+                        "tick_size": float(market["minimum_tick_size"]),
+                        "min_order_size": float(market.get("minimum_order_size") or 0) or None,
+                        "neg_risk": bool(market.get("neg_risk", False)),
+                        "fee_rate_bps": int(market.get("taker_base_fee") or 0),
+                        "source": "clob",
+                        "updated_at": time.time()
+                    }
+
+            cursor = page.get("next_cursor")
+            if not cursor or cursor == CLOB_END_CURSOR:
+                break
+
+        if tokens:
+            with self._lock:
+                self._tokens.update(tokens)
+
+        self.last_metadata_refresh = time.time()
+        print(f"[CATALOG] OK Indexed metadata for {len(tokens)} tokens from CLOB listing")
+        return len(tokens)
+
+    def _refresh_loop(self, interval: int):
+        """Background loop that keeps the catalog and token metadata warm"""
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"[CATALOG ERROR] Refresh failed: {e}")
+
+            try:
+                metadata_age = time.time() - (self.last_metadata_refresh or 0)
+                if metadata_age >= METADATA_REFRESH_SECONDS:
+                    self.refresh_metadata()
+            except Exception as e:
+                print(f"[CATALOG ERROR] Metadata refresh failed: {e}")
+
+            self._stop_event.wait(interval)
+
+    def start(self, interval: int = CATALOG_REFRESH_SECONDS):
+        """
+        Start the background refresher (no-op if already running)
+
+        Args:
+            interval: Seconds between refreshes
+        """
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop,
+            args=(interval,),
+            name="market-catalog-refresh",
+            daemon=True
+        )
+        self._refresh_thread.start()
+        print(f"[CATALOG] Background refresh started (every {interval}s)")
+
+    def stop(self):
+        """Stop the background refresher"""
+        self._stop_event.set()
+
+    # ==================== PERSISTENCE ====================
+
+    def load(self):
+        """Load persisted entries from disk (missing or corrupt files are ignored)"""
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+
+            entries = data.get("markets", []) if isinstance(data, dict) else []
+            tokens = data.get("tokens", {}) if isinstance(data, dict) else {}
+            with self._lock:
+                for entry in entries:
+                    self._markets[entry["market_id"]] = entry
+                    self._by_condition[entry["condition_id"]] = entry["market_id"]
+                self._tokens.update(tokens)
+
+            print(f"[CATALOG] Loaded {len(entries)} markets from {self.path}")
+
+        except Exception as e:
+            print(f"[CATALOG WARNING] Could not load {self.path}: {e}")
+
+    def save(self):
+        """Persist the lookup table to disk (atomic replace)"""
+        if not self.path:
+            return
+
+        try:
+            with self._lock:
+                data = {
+                    "saved_at": time.time(),
+                    "markets": list(self._markets.values()),
+                    "tokens": dict(self._tokens)
+                }
+
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+
+        except Exception as e:
+            print(f"[CATALOG WARNING] Could not save {self.path}: {e}")
@@ -44,6 +44,9 @@ class MongoDatabase:
             self.settings = self.db['settings']
             self.points = self.db['points']
             self.activity = self.db['activity_log']
+            self.transactions = self.db['transactions']
+            self.wallet_pool = self.db['wallet_pool']
+            self.wallets = self.db['wallets']
 
             print(f"[DB] Testing connection...")
             # Test connection
@@ -96,12 +99,24 @@ class MongoDatabase:
                 else:
                     print(f"[DB WARNING] Could not create users.wallet_address index: {e}")
 
+            print(f"[DB] Creating index on users.wallet_status (sparse)...")
+            try:
+                self.users.create_index("wallet_status", sparse=True)
+            except Exception as e:
+                print(f"[DB WARNING] Could not create users.wallet_status index: {e}")
+
             print(f"[DB] Creating index on trades.user_id...")
             try:
                 self.trades.create_index("user_id")
             except Exception as e:
                 print(f"[DB WARNING] Could not create trades.user_id index: {e}")
 
+            print(f"[DB] Creating index on trades.order_id (sparse)...")
+            try:
+                self.trades.create_index("order_id", sparse=True)
+            except Exception as e:
+                print(f"[DB WARNING] Could not create trades.order_id index: {e}")
+
             print(f"[DB] Creating index on settings.user_id (unique)...")
             try:
                 self.settings.create_index("user_id", unique=True)
@@ -117,6 +132,33 @@ class MongoDatabase:
             except Exception as e:
                 print(f"[DB WARNING] Could not create points.user_id index: {e}")
 
+            print(f"[DB] Creating index on transactions.tx_hash (unique)...")
+            try:
+                self.transactions.create_index("tx_hash", unique=True)
+            except Exception as e:
+                if "already exists" in str(e):
+                    print(f"[DB] Index transactions.tx_hash already exists (OK)")
+                else:
+                    print(f"[DB WARNING] Could not create transactions.tx_hash index: {e}")
+
+            try:
+                self.transactions.create_index("status")  # Pending rows reloaded on startup
+            except Exception as e:
+                print(f"[DB WARNING] Could not create transactions.status index: {e}")
+
+            print(f"[DB] Creating index on wallet_pool (status, created_at)...")
+            try:
+                self.wallet_pool.create_index([("status", 1), ("created_at", 1)])
+                self.wallet_pool.create_index("owner_address", unique=True)
+            except Exception as e:
+                print(f"[DB WARNING] Could not create wallet_pool indexes: {e}")
+
+            print(f"[DB] Creating index on wallets (user_id, wallet_address, wallet_type)...")
+            try:
+                self.wallets.create_index([("user_id", 1), ("wallet_address", 1), ("wallet_type", 1)])
+            except Exception as e:
+                print(f"[DB WARNING] Could not create wallets index: {e}")
+
             print("[DB] OK Database indexes created/verified!")
 
         except Exception as e:
@@ -126,10 +168,16 @@ class MongoDatabase:
     
     # USER OPERATIONS
     
-    def create_user(self, email: str, wallet_address: str = None) -> Optional[str]:
+    def create_user(self, email: str, wallet_address: str = None, extra_fields: Dict = None) -> Optional[str]:
         """
         Create a new user
         ⚠️ ENHANCED: Now includes detailed error logging for debugging
+
+        Args:
+            email: User's email
+            wallet_address: Initial wallet address (optional)
+            extra_fields: More fields stored on the document in the same insert
+                          (e.g. password hash, wallet_status)
         """
         try:
             print(f"[DB] Creating user: {email}")
@@ -149,6 +197,8 @@ class MongoDatabase:
                 "total_volume": 0.0,
                 "created_at": datetime.now()
             }
+            if extra_fields:
+                user_doc.update(extra_fields)
 
             print(f"[DB] Inserting user document into database...")
 
@@ -223,6 +273,109 @@ class MongoDatabase:
             print(f"[ERROR] Error getting user: {e}")
             return None
     
+    def get_users(self, user_ids: List[str], fields: List[str] = None) -> List[Dict]:
+        """
+        Get many users by ID in one query
+
+        Args:
+            user_ids: User IDs (invalid ones are skipped)
+            fields: Fields to return (all when None)
+
+        Returns:
+            List of users (same shape as get_user)
+        """
+        try:
+            from bson.objectid import ObjectId
+            ids = [ObjectId(u) for u in user_ids if ObjectId.is_valid(u)]
+            projection = {f: 1 for f in fields} if fields else None
+
+            users = list(self.users.find({"_id": {"$in": ids}}, projection))
+            for user in users:
+                user['id'] = str(user['_id'])
+                del user['_id']
+            return users
+
+        except Exception as e:
+            print(f"[ERROR] Error getting users: {e}")
+            return []
+
+    def get_wallet(self, user_id: str) -> Optional[Dict]:
+        """
+        A user's active wallet (projection of the user document)
+
+        Args:
+            user_id: User's database ID
+
+        Returns:
+            Dictionary with wallet_address, wallet_type, owner_address, or None
+        """
+        try:
+            from bson.objectid import ObjectId
+            user = self.users.find_one(
+                {"_id": ObjectId(user_id)},
+                {"wallet_address": 1, "wallet_type": 1, "owner_address": 1}
+            )
+            if not user or not user.get('wallet_address'):
+                return None
+
+            return {
+                "user_id": user_id,
+                "wallet_address": user['wallet_address'],
+                "wallet_type": user.get('wallet_type'),
+                "owner_address": user.get('owner_address')
+            }
+
+        except Exception as e:
+            print(f"[ERROR] Error getting wallet: {e}")
+            return None
+
+    def get_wallet_addresses(self) -> List[str]:
+        """
+        Every on-chain address we hold for users (active wallets + Safe owners)
+
+        Returns:
+            List of distinct addresses
+        """
+        try:
+            addresses = set(self.users.distinct("wallet_address"))
+            addresses.update(self.wallets.distinct("wallet_address"))
+            addresses.update(self.wallets.distinct("owner_address"))
+            return [a for a in addresses if a]
+
+        except Exception as e:
+            print(f"[ERROR] Error getting wallet addresses: {e}")
+            return []
+
+    def set_wallet_status(self, user_id: str, status: str, **fields) -> bool:
+        """
+        Update a user's wallet provisioning state
+
+        Args:
+            user_id: User ID
+            status: "provisioning", "ready" or "failed"
+            **fields: Extra fields to set (wallet_error, wallet_attempts...)
+
+        Returns:
+            True if the user was found
+        """
+        try:
+            from bson.objectid import ObjectId
+            updates = dict(fields, wallet_status=status, wallet_status_updated_at=datetime.now())
+            result = self.users.update_one({"_id": ObjectId(user_id)}, {"$set": updates})
+            return result.matched_count > 0
+
+        except Exception as e:
+            print(f"[ERROR] Error setting wallet status: {e}")
+            return False
+
+    def get_users_by_wallet_status(self, status: str, limit: int = 500) -> List[str]:
+        """IDs of users in a wallet provisioning state (uses the wallet_status index)"""
+        try:
+            return [str(u["_id"]) for u in self.users.find({"wallet_status": status}, {"_id": 1}).limit(limit)]
+        except Exception as e:
+            print(f"[ERROR] Error listing users by wallet status: {e}")
+            return []
+
     def update_user_subscription(self, user_id: str, status: str, end_date: datetime = None):
         """Update user subscription status"""
         try:
@@ -261,6 +414,11 @@ class MongoDatabase:
                 "executed_at": datetime.now(),
                 "closed_at": None
             }
+
+            # Exchange order details (used to reconcile fills later)
+            for field in ['order_id', 'order_status', 'shares', 'condition_id', 'token_id', 'builder_attributed']:
+                if trade_data.get(field) is not None:
+                    trade_doc[field] = trade_data[field]
             
             result = self.trades.insert_one(trade_doc)
             trade_id = str(result.inserted_id)
@@ -288,6 +446,78 @@ class MongoDatabase:
             print(f"[ERROR] Error creating trade: {e}")
             return None
     
+    def update_trade_by_order(self, order_id: str, updates: Dict) -> bool:
+        """
+        Update the trade that was opened by an exchange order (fills, status)
+
+        Args:
+            order_id: Exchange order ID stored on the trade
+            updates: Fields to set
+
+        Returns:
+            True if a trade was updated
+        """
+        try:
+            result = self.trades.update_one(
+                {"order_id": order_id},
+                {"$set": updates}
+            )
+            return result.modified_count > 0
+
+        except Exception as e:
+            print(f"[ERROR] Error updating trade for order {order_id}: {e}")
+            return False
+
+    # TRANSACTION OPERATIONS
+
+    def save_transaction(self, tx_hash: str, tx_data: Dict) -> bool:
+        """
+        Insert or update an on-chain transaction we submitted
+
+        Args:
+            tx_hash: Transaction hash (0x...)
+            tx_data: Fields to set (status, from/to, kind, block_number...)
+
+        Returns:
+            True on success
+        """
+        try:
+            self.transactions.update_one(
+                {"tx_hash": tx_hash},
+                {
+                    "$set": dict(tx_data, updated_at=datetime.now()),
+                    "$setOnInsert": {"created_at": datetime.now()}
+                },
+                upsert=True
+            )
+            return True
+
+        except Exception as e:
+            print(f"[ERROR] Error saving transaction {tx_hash}: {e}")
+            return False
+
+    def get_transaction(self, tx_hash: str) -> Optional[Dict]:
+        """Get a submitted transaction by hash"""
+        try:
+            tx = self.transactions.find_one({"tx_hash": tx_hash})
+            if tx:
+                tx['id'] = str(tx.pop('_id'))
+            return tx
+
+        except Exception as e:
+            print(f"[ERROR] Error getting transaction {tx_hash}: {e}")
+            return None
+
+    def get_pending_transactions(self, limit: int = 1000) -> List[Dict]:
+        """Submitted transactions not yet seen mined (reloaded by the receipt watcher on startup)"""
+        try:
+            txs = list(self.transactions.find({"status": "pending"}, {"_id": 0}).limit(limit))
+            return txs
+
+        except Exception as e:
+            print(f"[ERROR] Error getting pending transactions: {e}")
+            return []
+
     def get_user_trades(self, user_id: str, limit: int = 10) -> List[Dict]:
         """Get recent trades for a user"""
         try:
@@ -0,0 +1,246 @@
+"""
+Node Service Client for Polymarket Trading Bot
+One keep-alive, connection-pooled HTTP session to the Node.js builder service
+(Safe deployment/derivation, gasless orders), shared by PolymarketBuilder and
+WalletManager. Per-endpoint timeouts, retries with backoff (one retry loop, in
+request()), and an optional Unix-domain-socket transport when the service runs
+on the same host
+"""
+
+import os
+import socket
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.retry import Retry
+
+# Base URL of the Node.js microservice
+NODE_SERVICE_URL = os.environ.get('POLYMARKET_NODE_SERVICE_URL', 'http://localhost:3001')
+
+# Unix socket the co-located service listens on (SOCKET_PATH in the Node service); overrides the URL's host
+NODE_SERVICE_SOCKET = os.environ.get('POLYMARKET_NODE_SERVICE_SOCKET')
+
+# Keep-alive connections held open to the service
+NODE_SERVICE_POOL_SIZE = int(os.environ.get('NODE_SERVICE_POOL_SIZE', '20'))
+
+# Retries after a connection failure / 5xx, backing off NODE_SERVICE_BACKOFF * 2^(n-1) seconds
+NODE_SERVICE_RETRIES = int(os.environ.get('NODE_SERVICE_RETRIES', '2'))
+NODE_SERVICE_BACKOFF = 0.25
+
+# Seconds to establish a connection
+NODE_SERVICE_CONNECT_TIMEOUT = 3
+
+# Read timeout per endpoint (seconds); anything unlisted uses the default
+ENDPOINT_TIMEOUTS = {
+    "/health": 5,
+    "/get-safe-address": 10,
+    "/get-orders": 10,
+    "/get-order": 10,
+    "/deploy-safe": 30,
+    "/create-order": 30,
+    "/cancel-order": 30,
+    "/get-safe-addresses": 60,
+    "/get-orders-batch": 30,
+    "/create-orders": 60,
+    "/cancel-orders": 60
+}
+DEFAULT_TIMEOUT = 15
+
+# Endpoints safe to resend after the request may have reached the service
+IDEMPOTENT_ENDPOINTS = {
+    "/health", "/get-safe-address", "/get-orders", "/get-order", "/get-safe-addresses", "/get-orders-batch"
+}
+
+# Statuses worth retrying on an idempotent endpoint
+RETRY_STATUSES = (502, 503, 504)
+
+
+def never_sent(error: Exception) -> bool:
+    """True if a request failed before it reached the service (safe to report as not done)"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError) and error.args:
+        return isinstance(getattr(error.args[0], "reason", None), NewConnectionError)
+    return False
+
+
+# ==================== UNIX SOCKET TRANSPORT ====================
+
+class _UnixHTTPConnection(HTTPConnection):
+    """HTTP over a Unix domain socket"""
+
+    def __init__(self, *args, socket_path: str = None, **kwargs):
+        self.socket_path = socket_path
+        super().__init__(*args, **kwargs)
+
+    def _new_conn(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if isinstance(self.timeout, (int, float)):
+            sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError as e:
+            sock.close()
+            # Same error urllib3 raises for TCP, so callers can tell nothing was sent
+            raise NewConnectionError(self, f"Failed to connect to {self.socket_path}: {e}") from e
+        return sock
+
+
+class _UnixConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _UnixHTTPConnection
+
+
+class _UnixSocketAdapter(HTTPAdapter):
+    """Sends every request on the mount point to one Unix socket (keep-alive pooled)"""
+
+    def __init__(self, socket_path: str, pool_maxsize: int, max_retries):
+        self.socket_path = socket_path
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        super().__init__(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=max_retries)
+
+    def _unix_pool(self) -> _UnixConnectionPool:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = _UnixConnectionPool(
+                    "localhost",
+                    maxsize=self._pool_maxsize,
+                    block=False,
+                    socket_path=self.socket_path
+                )
+            return self._pool
+
+    def get_connection_with_tls_context(self, request, verify, proxies=None, cert=None):
+        return self._unix_pool()
+
+    def get_connection(self, url, proxies=None):
+        return self._unix_pool()
+
+    def close(self):
+        super().close()
+        if self._pool is not None:
+            self._pool.close()
+
+
+# ==================== CLIENT ====================
+
+class NodeServiceClient:
+    """
+    Pooled client for the Node.js builder service
+    """
+
+    def __init__(
+        self,
+        base_url: str = NODE_SERVICE_URL,
+        socket_path: Optional[str] = NODE_SERVICE_SOCKET,
+        pool_size: int = NODE_SERVICE_POOL_SIZE,
+        retries: int = NODE_SERVICE_RETRIES
+    ):
+        """
+        Initialize the client
+
+        Args:
+            base_url: Service URL (only its path prefix is used with a socket)
+            socket_path: Unix socket to connect through instead of TCP (optional)
+            pool_size: Keep-alive connections to hold
+            retries: Retries after connection failures (and 5xx on idempotent endpoints)
+        """
+        self.base_url = base_url.rstrip('/')
+        self.socket_path = socket_path
+        self.retries = retries
+
+        # urllib3 never retries on its own - request() is the only retry layer
+        no_retries = Retry(total=0, read=False)
+
+        self.session = requests.Session()
+        if socket_path:
+            adapter = _UnixSocketAdapter(socket_path, pool_size, no_retries)
+        else:
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=no_retries)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.requests = 0
+        self.retried = 0
+        self.failures = 0
+        self._stats_lock = threading.Lock()
+
+        transport = f"unix:{socket_path}" if socket_path else self.base_url
+        print(f"[NODE SERVICE] Pooled client ready ({transport}, {pool_size} connections)")
+
+    def request(self, method: str, path: str, payload: Dict = None) -> requests.Response:
+        """
+        Send a request to the service
+
+        Connection failures (nothing was sent) are retried on every endpoint;
+        read timeouts and 5xx only on idempotent ones
+
+        Args:
+            method: "GET" or "POST"
+            path: Endpoint path (e.g. "/deploy-safe")
+            payload: JSON body
+
+        Returns:
+            Response (raise_for_status is left to the caller)
+
+        Raises:
+            requests.exceptions.RequestException: After retries are exhausted
+        """
+        timeout = (NODE_SERVICE_CONNECT_TIMEOUT, ENDPOINT_TIMEOUTS.get(path, DEFAULT_TIMEOUT))
+        idempotent = path in IDEMPOTENT_ENDPOINTS
+        attempts = 1 + self.retries
+
+        for attempt in range(1, attempts + 1):
+            self._count("requests")
+            try:
+                response = self.session.request(method, self.base_url + path, json=payload, timeout=timeout)
+                if response.status_code not in RETRY_STATUSES or not idempotent or attempt == attempts:
+                    return response
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                if attempt == attempts or not (idempotent or never_sent(e)):
+                    self._count("failures")
+                    raise
+
+            self._count("retried")
+            time.sleep(NODE_SERVICE_BACKOFF * (2 ** (attempt - 1)))
+
+    def _count(self, counter: str):
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, path: str) -> requests.Response:
+        return self.request("GET", path)
+
+    def post(self, path: str, payload: Dict) -> requests.Response:
+        return self.request("POST", path, payload)
+
+    def close(self):
+        self.session.close()
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            return {
+                "transport": "unix" if self.socket_path else "tcp",
+                "requests": self.requests,
+                "retried": self.retried,
+                "failures": self.failures
+            }
+
+
+_client: Optional[NodeServiceClient] = None
+_client_lock = threading.Lock()
+
+
+def get_node_service_client() -> NodeServiceClient:
+    """Process-wide client (created on first use)"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = NodeServiceClient()
+        return _client
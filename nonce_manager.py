@@ -0,0 +1,227 @@
+"""
+Nonce Manager for Polymarket Trading Bot
+Reserves transaction nonces locally per address so concurrent sends from one
+wallet never collide and don't pay a get_transaction_count RPC each time.
+Resyncs from the chain on nonce errors; a nonce given back below ones still
+in flight is handed out again before any new one. Pending nonces are persisted
+"""
+
+import os
+import json
+import threading
+import time
+from typing import Dict
+
+# Where pending nonces are persisted between restarts
+NONCE_STATE_PATH = os.environ.get('NONCE_STATE_PATH', 'nonce_state.json')
+
+# Node error fragments that mean our local nonce is out of step with the chain
+NONCE_ERROR_MARKERS = (
+    "nonce too low",
+    "nonce too high",
+    "replacement transaction underpriced",
+    "invalid nonce"
+)
+
+# Node error fragments that mean the node already has this exact signed transaction
+# (a rebroadcast, e.g. after failover) - the send succeeded, nothing to resync
+ALREADY_KNOWN_MARKERS = (
+    "already known",
+    "known transaction"
+)
+
+
+class NonceManager:
+    """
+    Per-address local nonce reservation
+    """
+
+    def __init__(self, w3, path: str = NONCE_STATE_PATH):
+        """
+        Initialize the manager and load persisted pending nonces
+
+        Args:
+            w3: Web3 instance used to sync with the chain
+            path: JSON file used to persist pending nonces
+        """
+        self.w3 = w3
+        self.path = path
+
+        self._next: Dict[str, int] = {}                   # address -> next nonce to hand out
+        self._pending: Dict[str, Dict[int, Dict]] = {}    # address -> nonce -> {"tx_hash", "reserved_at"}
+        self._gaps: Dict[str, set] = {}                   # address -> released nonces below _next (reused first)
+        self._needs_sync: set = set()                     # addresses to resync before the next reservation
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        self._save_lock = threading.Lock()
+
+        self.load()
+
+    @staticmethod
+    def is_nonce_error(error: Exception) -> bool:
+        """True if a send failed because the nonce was wrong"""
+        message = str(error).lower()
+        return any(marker in message for marker in NONCE_ERROR_MARKERS)
+
+    @staticmethod
+    def is_already_known(error: Exception) -> bool:
+        """True if a send was rejected only because the node already has the transaction"""
+        message = str(error).lower()
+        return any(marker in message for marker in ALREADY_KNOWN_MARKERS)
+
+    def _lock_for(self, address: str) -> threading.Lock:
+        with self._locks_lock:
+            if address not in self._locks:
+                self._locks[address] = threading.Lock()
+            return self._locks[address]
+
+    # ==================== RESERVATION ====================
+
+    def reserve(self, address: str) -> int:
+        """
+        Reserve the next nonce for an address (syncs from the chain only when needed)
+        A gap left by a released nonce is filled before a new nonce is handed out
+
+        Args:
+            address: Sending address
+
+        Returns:
+            Nonce to sign the transaction with
+        """
+        with self._lock_for(address):
+            if address not in self._next or address in self._needs_sync:
+                self._sync(address)
+
+            gaps = self._gaps.get(address)
+            if gaps:
+                nonce = min(gaps)
+                gaps.discard(nonce)
+            else:
+                nonce = self._next[address]
+                self._next[address] = nonce + 1
+            self._pending.setdefault(address, {})[nonce] = {
+                "tx_hash": None,
+                "reserved_at": time.time()
+            }
+
+        self.save()
+        return nonce
+
+    def mark_sent(self, address: str, nonce: int, tx_hash: str):
+        """Record the hash broadcast with a reserved nonce"""
+        with self._lock_for(address):
+            entry = self._pending.get(address, {}).get(nonce)
+            if entry is not None:
+                entry["tx_hash"] = tx_hash
+        self.save()
+
+    def release(self, address: str, nonce: int, error: Exception = None):
+        """
+        Give back a nonce whose transaction never reached the network
+
+        Args:
+            address: Sending address
+            nonce: Nonce returned by reserve()
+            error: The send error (nonce errors force a resync)
+        """
+        with self._lock_for(address):
+            self._pending.get(address, {}).pop(nonce, None)
+
+            if error is not None and self.is_nonce_error(error):
+                self._needs_sync.add(address)
+            elif self._next.get(address) == nonce + 1:
+                # Last one handed out - just roll back (over any gaps it was sitting on)
+                gaps = self._gaps.get(address, set())
+                while nonce - 1 in gaps:
+                    gaps.discard(nonce - 1)
+                    nonce -= 1
+                self._next[address] = nonce
+            else:
+                # Later nonces are already out (and may not be broadcast yet): the next
+                # reservation reuses this one rather than resyncing over theirs
+                self._gaps.setdefault(address, set()).add(nonce)
+
+        self.save()
+
+    def mark_mined(self, address: str, nonce: int):
+        """Forget pending entries up to and including a mined nonce"""
+        with self._lock_for(address):
+            pending = self._pending.get(address, {})
+            for n in [n for n in pending if n <= nonce]:
+                del pending[n]
+        self.save()
+
+    def resync(self, address: str):
+        """Force the next reservation to re-read the nonce from the chain"""
+        with self._lock_for(address):
+            self._needs_sync.add(address)
+
+    def _sync(self, address: str):
+        """
+        Read the chain's pending nonce and drop entries it already covers (lock held)
+
+        Nonces we still hold above the chain's (reserved by sends in flight) are kept:
+        the next new nonce comes after all of them, and only the holes between the
+        chain's nonce and them are handed out again
+        """
+        chain_next = self.w3.eth.get_transaction_count(address, 'pending')
+
+        pending = self._pending.get(address, {})
+        for n in [n for n in pending if n < chain_next]:
+            del pending[n]
+
+        next_nonce = max([chain_next] + [n + 1 for n in pending])
+        self._next[address] = next_nonce
+        self._gaps[address] = {n for n in range(chain_next, next_nonce) if n not in pending}
+        self._needs_sync.discard(address)
+
+        gaps = f" (refilling {sorted(self._gaps[address])})" if self._gaps[address] else ""
+        print(f"[NONCE] Synced {address[:10]}... -> chain {chain_next}, next nonce {next_nonce}{gaps}")
+
+    def get_pending(self, address: str) -> Dict[int, Dict]:
+        """Nonces reserved for an address that haven't been seen mined"""
+        with self._lock_for(address):
+            return {n: dict(e) for n, e in self._pending.get(address, {}).items()}
+
+    # ==================== PERSISTENCE ====================
+
+    def load(self):
+        """Load persisted pending nonces (every address still resyncs on first use)"""
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+
+            for address, pending in data.get("pending", {}).items():
+                # Reserved but never broadcast before the restart - nothing holds them any more
+                self._pending[address] = {int(n): e for n, e in pending.items() if e.get("tx_hash")}
+
+            print(f"[NONCE] Loaded pending nonces for {len(self._pending)} addresses from {self.path}")
+
+        except Exception as e:
+            print(f"[NONCE WARNING] Could not load {self.path}: {e}")
+
+    def save(self):
+        """Persist pending nonces to disk (atomic replace)"""
+        if not self.path:
+            return
+
+        try:
+            with self._save_lock:
+                data = {
+                    "saved_at": time.time(),
+                    "pending": {
+                        address: {str(n): dict(e) for n, e in list(pending.items())}
+                        for address, pending in list(self._pending.items()) if pending
+                    }
+                }
+
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+
+        except Exception as e:
+            print(f"[NONCE WARNING] Could not save {self.path}: {e}")
@@ -0,0 +1,357 @@
+"""
+Smart Order Router for Polymarket Trading Bot
+Chooses between the in-process py-clob-client path and the Node.js builder
+service path using rolling latency and error rates, with optional hedging.
+Only paths that spend from the same wallet are ever mixed: Safe orders can go
+either way (both sign for the Safe as funder), EOA orders only through the clob path
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Optional
+
+# Paths the router can send orders down
+ROUTE_CLOB = "clob"         # PolymarketTrading (py-clob-client, in-process signing)
+ROUTE_BUILDER = "builder"   # PolymarketBuilder (Node.js service on port 3001, Safe wallets)
+
+# Rolling window of samples kept per path
+ROUTE_WINDOW = 50
+
+# A path with this error rate over the window is considered unhealthy...
+ROUTE_MAX_ERROR_RATE = 0.5
+
+# ...until this many seconds have passed since its last error (then it gets one probe)
+ROUTE_COOLDOWN_SECONDS = 30
+
+# Latency assumed for a path with no samples yet (seconds)
+ROUTE_DEFAULT_LATENCY = 1.0
+
+# Fire on the second path if the first hasn't answered after this many seconds (0 = off)
+ORDER_HEDGE_AFTER = float(os.environ.get('ORDER_HEDGE_AFTER', '0'))
+
+# How many idempotency keys (and their results) are remembered
+IDEMPOTENCY_CACHE_SIZE = 1000
+
+# Failures that say the path itself is unhealthy (anything else is the exchange rejecting the order)
+TRANSPORT_ERROR_TYPES = {
+    "ConnectionError", "ConnectTimeout", "ReadTimeout", "Timeout", "TimeoutError",
+    "ConnectError", "ReadError", "RemoteProtocolError"
+}
+
+# ...of which these mean the order never left this process (safe to send down another path).
+# A plain ConnectionError isn't one: requests raises it for connections dropped after the body was sent
+UNSENT_ERROR_TYPES = {"ConnectTimeout", "ConnectError"}
+
+# Gateway statuses from the builder service that mean it didn't handle the request
+TRANSPORT_STATUS_CODES = (502, 503, 504)
+
+
+class RouteStats:
+    """Rolling latency and error statistics for one order path"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies = deque(maxlen=ROUTE_WINDOW)
+        self.outcomes = deque(maxlen=ROUTE_WINDOW)
+        self.last_error_at = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, ok: bool):
+        """Record the outcome of one request"""
+        with self._lock:
+            self.latencies.append(latency)
+            self.outcomes.append(ok)
+            if not ok:
+                self.last_error_at = time.time()
+
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self.outcomes:
+                return 0.0
+            return 1 - (sum(self.outcomes) / len(self.outcomes))
+
+    def percentile(self, pct: float) -> float:
+        """Latency percentile over the window (default latency if no samples)"""
+        with self._lock:
+            samples = sorted(self.latencies)
+        if not samples:
+            return ROUTE_DEFAULT_LATENCY
+        index = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def is_healthy(self) -> bool:
+        if self.error_rate() < ROUTE_MAX_ERROR_RATE:
+            return True
+        return time.time() - self.last_error_at >= ROUTE_COOLDOWN_SECONDS
+
+    def summary(self) -> Dict:
+        return {
+            "route": self.name,
+            "samples": len(self.latencies),
+            "p50_ms": round(self.percentile(50) * 1000, 1),
+            "p90_ms": round(self.percentile(90) * 1000, 1),
+            "error_rate": round(self.error_rate(), 3),
+            "healthy": self.is_healthy()
+        }
+
+
+class OrderRouter:
+    """
+    Routes market orders down the fastest healthy path
+    """
+
+    def __init__(self, trading, builder=None, hedge_after: float = ORDER_HEDGE_AFTER):
+        """
+        Initialize the router
+
+        Args:
+            trading: PolymarketTrading instance (clob path, also used for quoting)
+            builder: PolymarketBuilder instance (builder path, Safe wallets only)
+            hedge_after: Seconds before firing on the second path (0 disables hedging)
+        """
+        self.trading = trading
+        self.builder = builder
+        self.hedge_after = hedge_after
+
+        self.stats = {
+            ROUTE_CLOB: RouteStats(ROUTE_CLOB),
+            ROUTE_BUILDER: RouteStats(ROUTE_BUILDER)
+        }
+
+        self._executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="order-router")
+
+        # (user_id, idempotency_key) -> {"event": Event, "result": Dict}
+        self._requests: OrderedDict = OrderedDict()
+        self._requests_lock = threading.Lock()
+
+    # ==================== ROUTE SELECTION ====================
+
+    def rank_routes(self, safe_address: Optional[str] = None) -> List[str]:
+        """
+        Order the paths that spend from the order's wallet best-first:
+        healthy before unhealthy, then by p90 latency
+
+        Both paths can sign for a Safe (signatureType 1, funder = Safe), so Safe orders
+        are ranked across them; EOA orders (signatureType 0) only have the clob path,
+        since the builder service only trades for Safes
+
+        Args:
+            safe_address: User's Safe address (None for EOA wallets)
+
+        Returns:
+            List of route names
+        """
+        if safe_address and self.builder:
+            routes = [ROUTE_BUILDER, ROUTE_CLOB]
+        else:
+            routes = [ROUTE_CLOB]
+
+        return sorted(
+            routes,
+            key=lambda r: (not self.stats[r].is_healthy(), self.stats[r].percentile(90))
+        )
+
+    def get_stats(self) -> List[Dict]:
+        """Rolling statistics for every path"""
+        return [stats.summary() for stats in self.stats.values()]
+
+    # ==================== ORDER PLACEMENT ====================
+
+    def place_market_order(
+        self,
+        private_key: str,
+        token_id: str,
+        side: str,
+        amount: float,
+        condition_id: str,
+        safe_address: str = None,
+        idempotency_key: str = None,
+        user_id: str = None
+    ) -> Dict:
+        """
+        Place a market order on the best path, hedging on the second path if configured
+
+        Args:
+            private_key: User's wallet private key
+            token_id: The token ID for the market outcome
+            side: 'YES' or 'NO' position
+            amount: Amount in USDC to spend
+            condition_id: Market's condition ID
+            safe_address: User's Safe address (orders are then funded by the Safe, on either path)
+            idempotency_key: Client-supplied key; repeats by the same user return the first successful result
+            user_id: Owner's database ID (scopes the idempotency key)
+
+        Returns:
+            Order result (same shape as PolymarketTrading.create_market_order) plus "route"
+        """
+        idempotency_key = idempotency_key or uuid.uuid4().hex
+        request_key = (user_id, idempotency_key)
+
+        # Idempotency: a repeated key waits for / returns the original result
+        with self._requests_lock:
+            existing = self._requests.get(request_key)
+            if not existing:
+                self._requests[request_key] = {"event": threading.Event(), "result": None}
+                while len(self._requests) > IDEMPOTENCY_CACHE_SIZE:
+                    self._requests.popitem(last=False)
+            entry = self._requests[request_key]
+
+        if existing:
+            print(f"[ROUTER] Duplicate request {idempotency_key} - returning original result")
+            entry["event"].wait(timeout=120)
+            return entry["result"] or {"success": False, "error": "Original request still in flight"}
+
+        try:
+            result = self._place(private_key, token_id, side, amount, condition_id, safe_address)
+        except Exception as e:
+            result = {"success": False, "error": str(e), "error_type": type(e).__name__}
+
+        result["idempotency_key"] = idempotency_key
+        entry["result"] = result
+        if not result.get('success'):
+            # Only placed orders are remembered - a retry after a failure places it again
+            with self._requests_lock:
+                if self._requests.get(request_key) is entry:
+                    del self._requests[request_key]
+        entry["event"].set()
+        return result
+
+    def _place(self, private_key, token_id, side, amount, condition_id, safe_address) -> Dict:
+        """Run the primary path and (optionally) a hedge on the secondary"""
+        routes = self.rank_routes(safe_address)
+        primary = routes[0]
+        secondary = routes[1] if len(routes) > 1 and self.stats[routes[1]].is_healthy() else None
+
+        # Quote once; every path submits exactly this price and size
+        quote = self.trading.quote_market_order(token_id, side, amount, condition_id)
+        if not quote.get('success'):
+            return quote
+
+        args = (private_key, token_id, side, amount, condition_id, safe_address, quote)
+        print(f"[ROUTER] Routing {side} ${amount} order via {primary}")
+
+        futures = {self._executor.submit(self._run_route, primary, *args): primary}
+
+        if secondary and self.hedge_after > 0:
+            done, _ = wait(futures, timeout=self.hedge_after)
+            if not done:
+                print(f"[ROUTER] {primary} slower than {self.hedge_after}s - hedging via {secondary}")
+                futures[self._executor.submit(self._run_route, secondary, *args)] = secondary
+
+        winner = None
+        failures = []
+        pending = set(futures)
+        while pending and not winner:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if result.get('success') and not winner:
+                    winner = result
+                elif result.get('success'):
+                    # Both paths answered in the same instant - keep the first
+                    self._cancel_duplicate(result, private_key, safe_address)
+                else:
+                    failures.append(result)
+
+        if winner:
+            # A hedge still in flight is cancelled when it lands (don't hold the response)
+            for future in pending:
+                future.add_done_callback(
+                    lambda f: f.result().get('success') and
+                    self._cancel_duplicate(f.result(), private_key, safe_address)
+                )
+            return winner
+
+        # Primary never reached the exchange - fail over to the secondary once.
+        # A rejection or a timeout (the order may be live) is returned as is
+        if secondary and len(futures) == 1 and self._never_sent(failures[0]):
+            print(f"[ROUTER] {primary} unreachable - failing over to {secondary}")
+            result = self._run_route(secondary, *args)
+            if result.get('success'):
+                return result
+            failures.append(result)
+
+        return failures[0] if failures else {"success": False, "error": "No order path available"}
+
+    @staticmethod
+    def _is_transport_error(result: Dict) -> bool:
+        """True if a failed order is the path's fault (connection, timeout, gateway), not a rejection"""
+        if result.get('success'):
+            return False
+        if result.get('error_type') in TRANSPORT_ERROR_TYPES or result.get('status_code') in TRANSPORT_STATUS_CODES:
+            return True
+        # py-clob-client reports requests that got no response as PolyApiException(status_code=None)
+        return result.get('error_type') == "PolyApiException" and "status_code=None" in str(result.get('error'))
+
+    @staticmethod
+    def _never_sent(result: Dict) -> bool:
+        """True if a failed order never reached the exchange"""
+        return result.get('error_type') in UNSENT_ERROR_TYPES
+
+    def _run_route(self, route, private_key, token_id, side, amount, condition_id, safe_address, quote) -> Dict:
+        """Execute the order on one path and record its latency/outcome"""
+        started = time.time()
+        try:
+            if route == ROUTE_BUILDER:
+                raw = self.builder.create_order(
+                    private_key=private_key,
+                    safe_address=safe_address,
+                    token_id=token_id,
+                    side=quote['order_side'],
+                    price=quote['price'],
+                    size=quote['size']
+                )
+                result = {
+                    "success": bool(raw.get('success')),
+                    "order_id": raw.get('orderID'),
+                    "status": raw.get('status'),
+                    "wallet_address": safe_address,  # Funder - the tracker polls it through the builder
+                    "price": quote['price'],
+                    "size": quote['size'],
+                    "side": side,
+                    "amount": amount,
+                    "builder_attributed": bool(raw.get('builderAttribution')),
+                    "error": raw.get('error'),
+                    "error_type": raw.get('error_type'),
+                    "status_code": raw.get('status_code'),
+                    "details": raw.get('details'),
+                    "message": f"Order executed: {quote['size']:.2f} shares at ${quote['price']:.4f}"
+                }
+            else:
+                result = self.trading.create_market_order(
+                    private_key=private_key,
+                    token_id=token_id,
+                    side=side,
+                    amount=amount,
+                    condition_id=condition_id,
+                    quote=quote,
+                    funder=safe_address
+                )
+        except Exception as e:
+            result = {"success": False, "error": str(e), "error_type": type(e).__name__}
+
+        latency = time.time() - started
+        # Exchange rejections (FOK not filled, balance, min size) say nothing about the path's health
+        self.stats[route].record(latency, not self._is_transport_error(result))
+        result["route"] = route
+        result["route_latency_ms"] = round(latency * 1000, 1)
+        return result
+
+    def _cancel_duplicate(self, result: Dict, private_key: str, safe_address: str):
+        """Cancel the slower of two successful hedged orders (best effort)"""
+        order_id = result.get('order_id')
+        if not order_id:
+            return
+
+        print(f"[ROUTER] Cancelling duplicate hedged order {order_id} on {result.get('route')}")
+        try:
+            if result.get('route') == ROUTE_BUILDER:
+                self.builder.cancel_order(private_key, safe_address, order_id)
+            else:
+                self.trading.get_order_client(private_key, safe_address).cancel(order_id)
+        except Exception as e:
+            print(f"[ROUTER WARNING] Could not cancel duplicate order {order_id}: {e}")
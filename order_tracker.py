@@ -0,0 +1,277 @@
+"""
+Order Tracker for Polymarket Trading Bot
+Keeps our open orders in an in-memory index, refreshes them in bulk
+(one CLOB call per wallet per interval), pushes status changes to clients
+and writes fills back to the trades collection
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from event_bus import EventBus
+
+# Seconds between bulk refreshes
+ORDER_TRACKER_INTERVAL = float(os.environ.get('ORDER_TRACKER_INTERVAL', '5'))
+
+# How long finished orders stay queryable from memory (seconds)
+FINISHED_ORDER_RETENTION = 3600
+
+# CLOB statuses after which an order can no longer change
+TERMINAL_STATUSES = {"MATCHED", "CANCELED", "CANCELLED", "UNMATCHED", "EXPIRED"}
+
+
+class OrderTracker:
+    """
+    In-memory index of orders placed through this server
+    """
+
+    def __init__(
+        self,
+        trading,
+        db=None,
+        event_bus: EventBus = None,
+        builder=None,
+        key_resolver: Callable[[str], Optional[str]] = None
+    ):
+        """
+        Initialize the tracker
+
+        Args:
+            trading: PolymarketTrading instance (provides per-wallet CLOB clients)
+            db: MongoDatabase used to write fills back to trades (optional)
+            event_bus: EventBus used to push order updates (optional)
+            builder: PolymarketBuilder that polls orders placed through the builder service (optional)
+            key_resolver: user_id -> private key, needed to poll builder orders (optional)
+        """
+        self.trading = trading
+        self.db = db
+        self.event_bus = event_bus
+        self.builder = builder
+        self.key_resolver = key_resolver
+
+        self._orders: Dict[str, Dict] = {}         # order_id -> record
+        self._open_by_wallet: Dict[str, set] = {}  # wallet -> open order IDs
+        self._lock = threading.Lock()
+
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    # ==================== INDEX ====================
+
+    def track(self, order_id: str, user_id: str, wallet_address: str, status: str = "LIVE", **details) -> Dict:
+        """
+        Start tracking an order
+
+        Args:
+            order_id: Exchange order ID
+            user_id: Owner's database ID
+            wallet_address: Address whose CLOB client placed the order (the Safe/funder for builder orders)
+            status: Status returned when the order was posted
+            **details: Extra fields kept on the record (token_id, side, price, size, route...)
+
+        Returns:
+            The tracked record
+        """
+        record = {
+            "order_id": order_id,
+            "user_id": user_id,
+            "wallet_address": wallet_address,
+            "status": (status or "LIVE").upper(),
+            "size_matched": 0.0,
+            "updated_at": time.time()
+        }
+        record.update(details)
+
+        with self._lock:
+            self._orders[order_id] = record
+            if record["status"] not in TERMINAL_STATUSES:
+                self._open_by_wallet.setdefault(wallet_address, set()).add(order_id)
+
+        self._publish(record)
+        return dict(record)
+
+    def get_order(self, order_id: str) -> Optional[Dict]:
+        """Get a tracked order from memory (no network)"""
+        with self._lock:
+            record = self._orders.get(order_id)
+            return dict(record) if record else None
+
+    def get_user_orders(self, user_id: str, limit: int = 10) -> List[Dict]:
+        """Get a user's tracked orders, newest first (no network)"""
+        with self._lock:
+            orders = [dict(r) for r in self._orders.values() if r["user_id"] == user_id]
+        orders.sort(key=lambda r: r["updated_at"], reverse=True)
+        return orders[:limit]
+
+    def open_order_count(self) -> int:
+        """Number of orders still being polled"""
+        with self._lock:
+            return sum(len(ids) for ids in self._open_by_wallet.values())
+
+    # ==================== BULK REFRESH ====================
+
+    def refresh(self) -> int:
+        """
+        Refresh every open order: one get_orders call per wallet
+
+        Returns:
+            Number of orders whose status changed
+        """
+        with self._lock:
+            wallets = {w: set(ids) for w, ids in self._open_by_wallet.items() if ids}
+
+        changed = 0
+        for wallet_address, order_ids in wallets.items():
+            source = self._order_source(wallet_address, order_ids)
+            if not source:
+                continue
+            get_orders, get_order = source
+
+            try:
+                open_orders = {o.get("id"): o for o in get_orders()}
+            except Exception as e:
+                print(f"[ORDERS] Refresh failed for {wallet_address[:10]}...: {e}")
+                continue
+
+            for order_id in order_ids:
+                order = open_orders.get(order_id)
+                if order is None:
+                    # No longer open - one final lookup to learn how it ended
+                    try:
+                        order = get_order(order_id) or {}
+                    except Exception as e:
+                        print(f"[ORDERS] Final lookup failed for {order_id}: {e}")
+                        continue
+                    order.setdefault("status", "CANCELED")
+
+                if self._apply_update(order_id, order):
+                    changed += 1
+
+        self._prune()
+        return changed
+
+    def _order_source(self, wallet_address: str, order_ids: set):
+        """
+        (get_orders, get_order) for the path that placed a wallet's orders
+
+        Returns:
+            Pair of callables, or None if the wallet can't be polled right now
+        """
+        with self._lock:
+            record = next((self._orders[i] for i in order_ids if i in self._orders), None)
+        if record is None:
+            return None
+
+        if record.get("route") != "builder":
+            client = self.trading.get_cached_order_client(wallet_address)
+            return (client.get_orders, client.get_order) if client else None
+
+        # Builder orders belong to the service's client for this key + Safe
+        private_key = self.key_resolver(record["user_id"]) if self.builder and self.key_resolver else None
+        if not private_key:
+            return None
+
+        def get_orders():
+            result = self.builder.get_orders(private_key, wallet_address)
+            if not result.get("success"):
+                raise RuntimeError(result.get("details") or result.get("error"))
+            return result.get("orders") or []
+
+        def get_order(order_id):
+            result = self.builder.get_order(private_key, wallet_address, order_id)
+            if not result.get("success"):
+                raise RuntimeError(result.get("details") or result.get("error"))
+            return result.get("order")
+
+        return get_orders, get_order
+
+    def _apply_update(self, order_id: str, order: Dict) -> bool:
+        """Merge an exchange order snapshot into the index; returns True on change"""
+        status = str(order.get("status", "")).upper() or "LIVE"
+        size_matched = float(order.get("size_matched") or 0)
+
+        with self._lock:
+            record = self._orders.get(order_id)
+            if not record:
+                return False
+            if record["status"] == status and record["size_matched"] == size_matched:
+                return False
+
+            filled_more = size_matched > record["size_matched"]
+            record["status"] = status
+            record["size_matched"] = size_matched
+            record["original_size"] = float(order.get("original_size") or record.get("size") or 0)
+            record["updated_at"] = time.time()
+
+            if status in TERMINAL_STATUSES:
+                self._open_by_wallet.get(record["wallet_address"], set()).discard(order_id)
+
+            snapshot = dict(record)
+
+        if filled_more or status in TERMINAL_STATUSES:
+            self._write_fill(snapshot)
+        self._publish(snapshot)
+        return True
+
+    def _write_fill(self, record: Dict):
+        """Write the latest fill state back to the trade opened by this order"""
+        if not self.db:
+            return
+
+        updates = {
+            "order_status": record["status"],
+            "shares_filled": record["size_matched"]
+        }
+        if record["status"] in TERMINAL_STATUSES and record["size_matched"] == 0:
+            updates["status"] = "canceled"
+
+        self.db.update_trade_by_order(record["order_id"], updates)
+
+    def _publish(self, record: Dict):
+        """Push an order update to subscribed clients"""
+        if self.event_bus:
+            self.event_bus.publish("order_update", record)
+
+    def _prune(self):
+        """Drop finished orders older than the retention window"""
+        cutoff = time.time() - FINISHED_ORDER_RETENTION
+        with self._lock:
+            stale = [
+                order_id for order_id, r in self._orders.items()
+                if r["status"] in TERMINAL_STATUSES and r["updated_at"] < cutoff
+            ]
+            for order_id in stale:
+                del self._orders[order_id]
+
+    # ==================== BACKGROUND LOOP ====================
+
+    def _run(self, interval: float):
+        """Background refresh loop"""
+        while not self._stop_event.is_set():
+            try:
+                if self.open_order_count():
+                    self.refresh()
+            except Exception as e:
+                print(f"[ORDERS ERROR] Tracker refresh failed: {e}")
+            self._stop_event.wait(interval)
+
+    def start(self, interval: float = ORDER_TRACKER_INTERVAL):
+        """Start the background refresher (no-op if already running)"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(interval,),
+            name="order-tracker",
+            daemon=True
+        )
+        self._thread.start()
+        print(f"[ORDERS] Order tracker started (every {interval}s)")
+
+    def stop(self):
+        """Stop the background refresher"""
+        self._stop_event.set()
@@ -42,6 +42,140 @@ function createClobClient(privateKey, proxyWalletAddress = null) {
   return client;
 }
 
+// ==================== CLIENT CACHE ====================
+
+// Clients (wallet + builder creds) reused per key/funder instead of rebuilt per request
+const CLIENT_CACHE_SIZE = parseInt(process.env.CLIENT_CACHE_SIZE) || 500;
+const CLIENT_CACHE_TTL_MS = (parseInt(process.env.CLIENT_CACHE_TTL_SECONDS) || 600) * 1000;
+const clientCache = new Map(); // keccak(key:funder) -> { promise, expiresAt } (insertion order = LRU)
+
+function getClobClient(privateKey, proxyWalletAddress = null) {
+  // Hash the key so raw private keys aren't held as map keys
+  const cacheKey = ethers.utils.id(`${privateKey}:${proxyWalletAddress || ''}`);
+  const now = Date.now();
+
+  const cached = clientCache.get(cacheKey);
+  if (cached && cached.expiresAt > now) {
+    clientCache.delete(cacheKey);
+    clientCache.set(cacheKey, cached);
+    return cached.promise;
+  }
+
+  const promise = (async () => {
+    const client = createClobClient(privateKey, proxyWalletAddress);
+    await client.setCreds({
+      key: process.env.POLYMARKET_API_KEY,
+      secret: process.env.POLYMARKET_SECRET,
+      passphrase: process.env.POLYMARKET_PASSPHRASE
+    });
+    return client;
+  })();
+  // A failed setup shouldn't stay cached
+  promise.catch(() => clientCache.delete(cacheKey));
+
+  clientCache.set(cacheKey, { promise, expiresAt: now + CLIENT_CACHE_TTL_MS });
+  while (clientCache.size > CLIENT_CACHE_SIZE) {
+    clientCache.delete(clientCache.keys().next().value);
+  }
+  return promise;
+}
+
+// ==================== BATCH HELPERS ====================
+
+// Max items per batch request, and how many run at once
+const BATCH_MAX_ITEMS = parseInt(process.env.BATCH_MAX_ITEMS) || 100;
+const BATCH_CONCURRENCY = parseInt(process.env.BATCH_CONCURRENCY) || 8;
+
+// Run fn over items with bounded concurrency; every item gets { index, success, ... }
+async function runBatch(items, fn) {
+  const results = new Array(items.length);
+  let next = 0;
+
+  async function worker() {
+    while (next < items.length) {
+      const index = next++;
+      try {
+        results[index] = { index, success: true, ...(await fn(items[index])) };
+      } catch (error) {
+        results[index] = { index, success: false, error: error.message };
+      }
+    }
+  }
+
+  await Promise.all(Array.from({ length: Math.min(BATCH_CONCURRENCY, items.length) }, worker));
+  return results;
+}
+
+function batchHandler(name, field, fn) {
+  return async (req, res) => {
+    const items = req.body[field];
+    if (!Array.isArray(items) || items.length === 0) {
+      return res.status(400).json({ success: false, error: `Missing required parameter: ${field} (non-empty array)` });
+    }
+    if (items.length > BATCH_MAX_ITEMS) {
+      return res.status(400).json({ success: false, error: `Too many items (max ${BATCH_MAX_ITEMS})` });
+    }
+
+    console.log(`[${name}] Processing ${items.length} items...`);
+    const results = await runBatch(items, fn);
+    const succeeded = results.filter(r => r.success).length;
+    console.log(`[${name}] ✅ ${succeeded}/${items.length} succeeded`);
+
+    res.json({ success: true, results, succeeded, failed: items.length - succeeded });
+  };
+}
+
+// ==================== OPERATIONS ====================
+
+async function getSafeAddress({ privateKey }) {
+  if (!privateKey) throw new Error('Missing required parameter: privateKey');
+  const client = await getClobClient(privateKey);
+
+  // This will derive the Safe address without deploying if it already exists
+  const result = await client.createOrDeriveAPIKey();
+  return { safeAddress: result.address, deployed: result.deployed || false };
+}
+
+async function createOrder({ privateKey, safeAddress, tokenID, side, price, size }) {
+  if (!privateKey || !tokenID || !side || !price || !size) {
+    throw new Error('Missing required parameters: privateKey, tokenID, side, price, size');
+  }
+  const client = await getClobClient(privateKey, safeAddress);
+
+  const order = await client.createOrder({
+    tokenID,
+    price: price.toString(),
+    size: size.toString(),
+    side: side.toUpperCase(), // BUY or SELL
+    feeRateBps: '0' // No fees for builder orders!
+  });
+
+  // Post order to Polymarket (GASLESS!)
+  const response = await client.postOrder(order);
+  return { orderID: response.orderID, order };
+}
+
+async function cancelOrder({ privateKey, safeAddress, orderID }) {
+  if (!privateKey || !orderID) throw new Error('Missing required parameters: privateKey, orderID');
+  const client = await getClobClient(privateKey, safeAddress);
+  await client.cancelOrder(orderID);
+  return { orderID };
+}
+
+async function getOrders({ privateKey, safeAddress }) {
+  if (!privateKey) throw new Error('Missing required parameter: privateKey');
+  const client = await getClobClient(privateKey, safeAddress);
+  const orders = await client.getOrders();
+  return { orders, count: orders.length };
+}
+
+async function getOrder({ privateKey, safeAddress, orderID }) {
+  if (!privateKey || !orderID) throw new Error('Missing required parameters: privateKey, orderID');
+  const client = await getClobClient(privateKey, safeAddress);
+  const order = await client.getOrder(orderID);
+  return { order };
+}
+
 // ==================== HEALTH CHECK ====================
 
 app.get('/health', (req, res) => {
@@ -51,7 +185,8 @@ app.get('/health', (req, res) => {
     version: '1.0.0',
     timestamp: new Date().toISOString(),
     polymarket_host: POLYMARKET_HOST,
-    chain_id: CHAIN_ID
+    chain_id: CHAIN_ID,
+    cached_clients: clientCache.size
   });
 });
 
@@ -71,15 +206,8 @@ app.post('/deploy-safe', async (req, res) => {
     console.log('[DEPLOY-SAFE] Starting Safe wallet deployment...');
     console.log('[DEPLOY-SAFE] Owner address:', ownerAddress);
 
-    // Create CLOB client
-    const client = createClobClient(privateKey);
-
-    // Set API credentials
-    await client.setCreds({
-      key: process.env.POLYMARKET_API_KEY,
-      secret: process.env.POLYMARKET_SECRET,
-      passphrase: process.env.POLYMARKET_PASSPHRASE
-    });
+    // CLOB client with API credentials (cached per key)
+    const client = await getClobClient(privateKey);
 
     // Deploy Safe wallet using Polymarket relayer (FREE GAS!)
     console.log('[DEPLOY-SAFE] Deploying Safe via Polymarket relayer...');
@@ -121,23 +249,13 @@ app.post('/get-safe-address', async (req, res) => {
 
     console.log('[GET-SAFE] Getting Safe address for wallet...');
 
-    const client = createClobClient(privateKey);
+    const result = await getSafeAddress({ privateKey });
 
-    await client.setCreds({
-      key: process.env.POLYMARKET_API_KEY,
-      secret: process.env.POLYMARKET_SECRET,
-      passphrase: process.env.POLYMARKET_PASSPHRASE
-    });
-
-    // This will derive the Safe address without deploying if it already exists
-    const result = await client.createOrDeriveAPIKey();
-
-    console.log('[GET-SAFE] ✅ Safe address:', result.address);
+    console.log('[GET-SAFE] ✅ Safe address:', result.safeAddress);
 
     res.json({
       success: true,
-      safeAddress: result.address,
-      deployed: result.deployed || false
+      ...result
     });
 
   } catch (error) {
@@ -168,34 +286,14 @@ app.post('/create-order', async (req, res) => {
     console.log('[CREATE-ORDER] Price:', price);
     console.log('[CREATE-ORDER] Size:', size);
 
-    const client = createClobClient(privateKey, safeAddress);
-
-    await client.setCreds({
-      key: process.env.POLYMARKET_API_KEY,
-      secret: process.env.POLYMARKET_SECRET,
-      passphrase: process.env.POLYMARKET_PASSPHRASE
-    });
-
-    // Create order
-    const order = await client.createOrder({
-      tokenID,
-      price: price.toString(),
-      size: size.toString(),
-      side: side.toUpperCase(), // BUY or SELL
-      feeRateBps: '0' // No fees for builder orders!
-    });
-
-    console.log('[CREATE-ORDER] Order created:', order.orderID);
-
-    // Post order to Polymarket (GASLESS!)
-    const response = await client.postOrder(order);
+    const { orderID, order } = await createOrder(req.body);
 
     console.log('[CREATE-ORDER] ✅ Order posted successfully!');
-    console.log('[CREATE-ORDER] Order ID:', response.orderID);
+    console.log('[CREATE-ORDER] Order ID:', orderID);
 
     res.json({
       success: true,
-      orderID: response.orderID,
+      orderID: orderID,
       order: order,
       message: 'Order placed with FREE gas via Polymarket relayer!',
       gasless: true,
@@ -226,15 +324,7 @@ app.post('/cancel-order', async (req, res) => {
 
     console.log('[CANCEL-ORDER] Canceling order:', orderID);
 
-    const client = createClobClient(privateKey, safeAddress);
-
-    await client.setCreds({
-      key: process.env.POLYMARKET_API_KEY,
-      secret: process.env.POLYMARKET_SECRET,
-      passphrase: process.env.POLYMARKET_PASSPHRASE
-    });
-
-    const response = await client.cancelOrder(orderID);
+    await cancelOrder(req.body);
 
     console.log('[CANCEL-ORDER] ✅ Order canceled successfully!');
 
@@ -269,26 +359,47 @@ app.post('/get-orders', async (req, res) => {
 
     console.log('[GET-ORDERS] Fetching orders...');
 
-    const client = createClobClient(privateKey, safeAddress);
+    const { orders, count } = await getOrders(req.body);
 
-    await client.setCreds({
-      key: process.env.POLYMARKET_API_KEY,
-      secret: process.env.POLYMARKET_SECRET,
-      passphrase: process.env.POLYMARKET_PASSPHRASE
+    console.log('[GET-ORDERS] ✅ Found', count, 'orders');
+
+    res.json({
+      success: true,
+      orders: orders,
+      count: count
     });
 
-    const orders = await client.getOrders();
+  } catch (error) {
+    console.error('[GET-ORDERS] ❌ Error:', error);
+    res.status(500).json({
+      success: false,
+      error: error.message
+    });
+  }
+});
 
-    console.log('[GET-ORDERS] ✅ Found', orders.length, 'orders');
+// ==================== GET ORDER ====================
+
+app.post('/get-order', async (req, res) => {
+  try {
+    const { privateKey, orderID } = req.body;
+
+    if (!privateKey || !orderID) {
+      return res.status(400).json({
+        success: false,
+        error: 'Missing required parameters: privateKey, orderID'
+      });
+    }
+
+    const { order } = await getOrder(req.body);
 
     res.json({
       success: true,
-      orders: orders,
-      count: orders.length
+      order: order
     });
 
   } catch (error) {
-    console.error('[GET-ORDERS] ❌ Error:', error);
+    console.error('[GET-ORDER] ❌ Error:', error);
     res.status(500).json({
       success: false,
       error: error.message
@@ -296,6 +407,14 @@ app.post('/get-orders', async (req, res) => {
   }
 });
 
+// ==================== BATCH ENDPOINTS ====================
+// One round trip for many wallets/orders; per-item results keep the request's order
+
+app.post('/get-safe-addresses', batchHandler('GET-SAFE-BATCH', 'wallets', getSafeAddress));
+app.post('/create-orders', batchHandler('CREATE-ORDERS', 'orders', createOrder));
+app.post('/cancel-orders', batchHandler('CANCEL-ORDERS', 'orders', cancelOrder));
+app.post('/get-orders-batch', batchHandler('GET-ORDERS-BATCH', 'wallets', getOrders));
+
 // ==================== ERROR HANDLER ====================
 
 app.use((err, req, res, next) => {
@@ -309,7 +428,19 @@ app.use((err, req, res, next) => {
 
 // ==================== START SERVER ====================
 
-app.listen(PORT, () => {
+// Optional Unix socket for a co-located Python backend (POLYMARKET_NODE_SERVICE_SOCKET on that side)
+const SOCKET_PATH = process.env.SOCKET_PATH;
+if (SOCKET_PATH) {
+  const fs = require('fs');
+  if (fs.existsSync(SOCKET_PATH)) fs.unlinkSync(SOCKET_PATH);
+  const socketServer = app.listen(SOCKET_PATH, () => {
+    console.log(`📡 Also listening on unix socket: ${SOCKET_PATH}`);
+  });
+  socketServer.keepAliveTimeout = 65000;
+  socketServer.headersTimeout = 66000;
+}
+
+const server = app.listen(PORT, () => {
   console.log('');
   console.log('🚀 Polymarket Service Started!');
   console.log('━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━');
@@ -326,6 +457,11 @@ app.listen(PORT, () => {
   console.log('  POST /create-order       - Create order (GASLESS)');
   console.log('  POST /cancel-order       - Cancel order (GASLESS)');
   console.log('  POST /get-orders         - Get all orders');
+  console.log('  POST /get-order          - Get one order (status, size matched)');
+  console.log('  POST /get-safe-addresses - Batch: Safe addresses for many keys');
+  console.log('  POST /create-orders      - Batch: create many orders');
+  console.log('  POST /cancel-orders      - Batch: cancel many orders');
+  console.log('  POST /get-orders-batch   - Batch: orders for many wallets');
   console.log('');
   console.log('💡 Features:');
   console.log('  ✅ FREE gas via Polymarket relayer');
@@ -335,4 +471,8 @@ app.listen(PORT, () => {
   console.log('');
 });
 
+// Outlive the Python client's idle pooled connections so reused sockets aren't reset mid-request
+server.keepAliveTimeout = 65000;
+server.headersTimeout = 66000;
+
 module.exports = app;
@@ -14,6 +14,7 @@ class PolymarketAPI:
         self.gamma_url = "https://gamma-api.polymarket.com"
         self.gamma_markets_endpoint = f"{self.gamma_url}/markets"
         self.gamma_events_endpoint = f"{self.gamma_url}/events"
+        self.clob_url = "https://clob.polymarket.com"
 
         # Set up httpx client with browser-like headers to avoid Cloudflare blocking
         headers = {
@@ -33,7 +34,7 @@ class PolymarketAPI:
 
         self.client = httpx.Client(timeout=30.0, headers=headers, follow_redirects=True)
     
-    def get_markets(self, limit: int = 20, active: bool = True, closed: bool = False, order: str = "volume24hr") -> List[Dict]:
+    def get_markets(self, limit: int = 20, active: bool = True, closed: bool = False, order: str = "volume24hr", offset: int = 0) -> List[Dict]:
         """
         Fetch markets from Polymarket Gamma API
         ⚠️ FIXED: Now sorts by 24hr volume to match Polymarket.com trending
@@ -43,6 +44,7 @@ class PolymarketAPI:
             active: Only show active markets
             closed: Include closed markets
             order: Sort order - "volume24hr", "volume7d", "liquidity", etc.
+            offset: Number of markets to skip (for paging through the catalog)
 
         Returns:
             List of market dictionaries
@@ -55,6 +57,8 @@ class PolymarketAPI:
                 "archived": "false",  # Don't show archived markets
                 "order": order  # CRITICAL: Sort by 24hr volume for trending
             }
+            if offset:
+                params["offset"] = offset
 
             print(f"[API] Fetching markets with params: {params}")
 
@@ -74,6 +78,51 @@ class PolymarketAPI:
             traceback.print_exc()
             return []
 
+    def get_market(self, market_id: str) -> Optional[Dict]:
+        """
+        Fetch a single market by its Gamma market ID
+
+        Args:
+            market_id: Gamma market ID
+
+        Returns:
+            Raw market dictionary or None if not found
+        """
+        try:
+            response = self.client.get(f"{self.gamma_markets_endpoint}/{market_id}")
+
+            if response.status_code == 404:
+                print(f"[API] Market not found: {market_id}")
+                return None
+
+            response.raise_for_status()
+            market = response.json()
+            return market if isinstance(market, dict) else None
+
+        except Exception as e:
+            print(f"[ERROR] Error fetching market {market_id}: {e}")
+            return None
+
+    def get_clob_markets_page(self, next_cursor: str = "MA==") -> Dict:
+        """
+        Fetch one page of the CLOB markets listing (tick size, min order size, neg-risk, fees)
+
+        Args:
+            next_cursor: Pagination cursor ("MA==" for the first page)
+
+        Returns:
+            Dict with "data" (list of markets) and "next_cursor" ("LTE=" on the last page)
+        """
+        try:
+            response = self.client.get(f"{self.clob_url}/markets", params={"next_cursor": next_cursor})
+            response.raise_for_status()
+            page = response.json()
+            return page if isinstance(page, dict) else {"data": [], "next_cursor": "LTE="}
+
+        except Exception as e:
+            print(f"[ERROR] Error fetching CLOB markets page: {e}")
+            return {"data": [], "next_cursor": "LTE="}
+
     def search_markets(self, query: str, limit: int = 100) -> List[Dict]:
         """
         Search markets by keyword using Polymarket's search API
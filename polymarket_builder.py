@@ -31,13 +31,19 @@ Usage:
     )
 """
 
-import os
 import requests
 from typing import Dict, Optional, List
 import logging
 
+from node_service_client import (
+    NodeServiceClient, get_node_service_client, never_sent, NODE_SERVICE_URL, IDEMPOTENT_ENDPOINTS
+)
+
 logger = logging.getLogger(__name__)
 
+# Items per batch request (matches BATCH_MAX_ITEMS in the Node service)
+BATCH_MAX_ITEMS = 100
+
 
 class PolymarketBuilder:
     """
@@ -55,10 +61,13 @@ class PolymarketBuilder:
         Args:
             node_service_url: URL of the Node.js microservice (default: http://localhost:3001)
         """
-        self.node_service_url = node_service_url or os.environ.get(
-            'POLYMARKET_NODE_SERVICE_URL',
-            'http://localhost:3001'
-        )
+        self.node_service_url = node_service_url or NODE_SERVICE_URL
+
+        # Shared keep-alive pool unless pointed at a different service
+        if self.node_service_url == NODE_SERVICE_URL:
+            self.client = get_node_service_client()
+        else:
+            self.client = NodeServiceClient(self.node_service_url)
         logger.info(f"[BUILDER] Initialized with service URL: {self.node_service_url}")
 
     def health_check(self) -> Dict:
@@ -74,10 +83,7 @@ class PolymarketBuilder:
             >>> print(status['status'])  # 'ok'
         """
         try:
-            response = requests.get(
-                f"{self.node_service_url}/health",
-                timeout=5
-            )
+            response = self.client.get("/health")
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -118,13 +124,12 @@ class PolymarketBuilder:
         try:
             logger.info(f"[BUILDER] Deploying Safe wallet for owner: {owner_address}")
 
-            response = requests.post(
-                f"{self.node_service_url}/deploy-safe",
-                json={
+            response = self.client.post(
+                "/deploy-safe",
+                {
                     "privateKey": private_key,
                     "ownerAddress": owner_address
-                },
-                timeout=30
+                }
             )
             response.raise_for_status()
 
@@ -167,10 +172,9 @@ class PolymarketBuilder:
             ...     print(f"Safe exists at: {result['safeAddress']}")
         """
         try:
-            response = requests.post(
-                f"{self.node_service_url}/get-safe-address",
-                json={"privateKey": private_key},
-                timeout=10
+            response = self.client.post(
+                "/get-safe-address",
+                {"privateKey": private_key}
             )
             response.raise_for_status()
             return response.json()
@@ -229,17 +233,16 @@ class PolymarketBuilder:
         try:
             logger.info(f"[BUILDER] Creating {side} order: {size} @ {price}")
 
-            response = requests.post(
-                f"{self.node_service_url}/create-order",
-                json={
+            response = self.client.post(
+                "/create-order",
+                {
                     "privateKey": private_key,
                     "safeAddress": safe_address,
                     "tokenID": token_id,
                     "side": side.upper(),
                     "price": str(price),
                     "size": str(size)
-                },
-                timeout=30
+                }
             )
             response.raise_for_status()
 
@@ -257,7 +260,9 @@ class PolymarketBuilder:
             return {
                 "success": False,
                 "error": "Failed to create order",
-                "details": str(e)
+                "details": str(e),
+                "error_type": type(e).__name__,
+                "status_code": e.response.status_code if e.response is not None else None
             }
 
     def cancel_order(
@@ -290,14 +295,13 @@ class PolymarketBuilder:
         try:
             logger.info(f"[BUILDER] Canceling order: {order_id}")
 
-            response = requests.post(
-                f"{self.node_service_url}/cancel-order",
-                json={
+            response = self.client.post(
+                "/cancel-order",
+                {
                     "privateKey": private_key,
                     "safeAddress": safe_address,
                     "orderID": order_id
-                },
-                timeout=30
+                }
             )
             response.raise_for_status()
 
@@ -342,13 +346,12 @@ class PolymarketBuilder:
             ...     print(f"Order: {order['id']} - {order['side']} @ {order['price']}")
         """
         try:
-            response = requests.post(
-                f"{self.node_service_url}/get-orders",
-                json={
+            response = self.client.post(
+                "/get-orders",
+                {
                     "privateKey": private_key,
                     "safeAddress": safe_address
-                },
-                timeout=10
+                }
             )
             response.raise_for_status()
 
@@ -369,6 +372,193 @@ class PolymarketBuilder:
                 "count": 0
             }
 
+    def get_order(
+        self,
+        private_key: str,
+        safe_address: str,
+        order_id: str
+    ) -> Dict:
+        """
+        Get one order placed through the service (status and size matched).
+
+        Args:
+            private_key: User's private key (0x...)
+            safe_address: User's Safe wallet address (0x...)
+            order_id: Order ID returned by create_order
+
+        Returns:
+            Dict containing:
+                - success: bool
+                - order: dict (id, status, size_matched, original_size...)
+        """
+        try:
+            response = self.client.post(
+                "/get-order",
+                {
+                    "privateKey": private_key,
+                    "safeAddress": safe_address,
+                    "orderID": order_id
+                }
+            )
+            response.raise_for_status()
+            return response.json()
+
+        except requests.exceptions.RequestException as e:
+            logger.error(f"[BUILDER] Get order request failed: {e}")
+            return {
+                "success": False,
+                "error": "Failed to get order",
+                "details": str(e)
+            }
+
+    # ==================== BATCH OPERATIONS ====================
+
+    def _batch(self, path: str, field: str, items: List[Dict], label: str) -> Dict:
+        """
+        Send items to a batch endpoint, BATCH_MAX_ITEMS per request
+
+        When a chunk for a non-idempotent endpoint (create/cancel) fails after it may
+        have reached the service - read timeout, dropped connection, 5xx - its items may
+        have been applied, so they are reported with status "unknown" rather than failed.
+        Callers should reconcile them (e.g. get_orders_batch) before retrying.
+
+        Returns:
+            Dict with per-item results (same order as items), succeeded, failed, unknown
+        """
+        results = []
+        for start in range(0, len(items), BATCH_MAX_ITEMS):
+            chunk = items[start:start + BATCH_MAX_ITEMS]
+            try:
+                response = self.client.post(path, {field: chunk})
+                response.raise_for_status()
+                chunk_results = response.json().get('results', [])
+            except requests.exceptions.RequestException as e:
+                logger.error(f"[BUILDER] {label} batch request failed: {e}")
+                chunk_results = [self._batch_failure(path, label, i, e) for i in range(len(chunk))]
+
+            for result in chunk_results:
+                result['index'] = start + result.get('index', 0)
+            results.extend(chunk_results)
+
+        succeeded = sum(1 for r in results if r.get('success'))
+        unknown = sum(1 for r in results if r.get('status') == "unknown")
+        logger.info(f"[BUILDER] {label}: {succeeded}/{len(items)} succeeded"
+                    + (f", {unknown} unknown" if unknown else ""))
+        return {
+            "success": succeeded == len(items),
+            "results": results,
+            "succeeded": succeeded,
+            "failed": len(items) - succeeded - unknown,
+            "unknown": unknown
+        }
+
+    @staticmethod
+    def _batch_failure(path: str, label: str, index: int, error: Exception) -> Dict:
+        """Per-item result for a batch request that raised"""
+        # A 4xx is the service rejecting the whole batch before processing any item
+        response = getattr(error, 'response', None)
+        rejected = response is not None and 400 <= response.status_code < 500
+
+        if path in IDEMPOTENT_ENDPOINTS or rejected or never_sent(error):
+            return {"index": index, "success": False, "error": f"Failed to {label}", "details": str(error)}
+        return {
+            "index": index,
+            "success": False,
+            "status": "unknown",
+            "error": f"Outcome unknown: {label} request may have been processed",
+            "details": str(error)
+        }
+
+    def get_safe_addresses(self, private_keys: List[str]) -> Dict:
+        """
+        Get Safe wallet addresses for many keys in one round trip.
+
+        Args:
+            private_keys: Owner private keys (0x...)
+
+        Returns:
+            Dict containing:
+                - success: bool (True if every lookup succeeded)
+                - results: List[dict] with index, success, safeAddress, deployed
+                - succeeded / failed: int
+        """
+        return self._batch(
+            "/get-safe-addresses", "wallets",
+            [{"privateKey": key} for key in private_keys],
+            "get Safe addresses"
+        )
+
+    def create_orders(self, orders: List[Dict]) -> Dict:
+        """
+        Create many gasless orders in one round trip (bot / copy-trade fan-out).
+
+        Args:
+            orders: Dicts with private_key, safe_address, token_id, side, price, size
+
+        Returns:
+            Dict containing:
+                - success: bool (True if every order was placed)
+                - results: List[dict] with index, success, orderID / error
+                  (status "unknown" if the request failed after it may have been processed)
+                - succeeded / failed / unknown: int
+        """
+        return self._batch(
+            "/create-orders", "orders",
+            [
+                {
+                    "privateKey": o['private_key'],
+                    "safeAddress": o.get('safe_address'),
+                    "tokenID": o['token_id'],
+                    "side": o['side'].upper(),
+                    "price": str(o['price']),
+                    "size": str(o['size'])
+                }
+                for o in orders
+            ],
+            "create orders"
+        )
+
+    def cancel_orders(self, cancels: List[Dict]) -> Dict:
+        """
+        Cancel many orders in one round trip.
+
+        Args:
+            cancels: Dicts with private_key, safe_address, order_id
+
+        Returns:
+            Dict containing:
+                - success: bool (True if every cancel succeeded)
+                - results: List[dict] with index, success, orderID / error
+                  (status "unknown" if the request failed after it may have been processed)
+                - succeeded / failed / unknown: int
+        """
+        return self._batch(
+            "/cancel-orders", "orders",
+            [
+                {"privateKey": c['private_key'], "safeAddress": c.get('safe_address'), "orderID": c['order_id']}
+                for c in cancels
+            ],
+            "cancel orders"
+        )
+
+    def get_orders_batch(self, wallets: List[Dict]) -> Dict:
+        """
+        Get open orders for many Safe wallets in one round trip.
+
+        Args:
+            wallets: Dicts with private_key, safe_address
+
+        Returns:
+            Dict containing:
+                - success: bool (True if every lookup succeeded)
+                - results: List[dict] with index, success, orders, count
+                - succeeded / failed: int
+        """
+        return self._batch(
+            "/get-orders-batch", "wallets",
+            [{"privateKey": w['private_key'], "safeAddress": w.get('safe_address')} for w in wallets],
+            "get orders"
+        )
 
 # Example usage in your existing code
 if __name__ == "__main__":
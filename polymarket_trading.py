@@ -4,23 +4,51 @@ Uses py-clob-client with Builder Program attribution
 """
 
 import os
-from typing import Dict, Optional
+import threading
+from typing import Dict, List, Optional
 from py_clob_client.client import ClobClient
-from py_clob_client.clob_types import OrderArgs, OrderType, ApiCreds
+from py_clob_client.clob_types import OrderArgs, OrderType, ApiCreds, BookParams, CreateOrderOptions, PartialCreateOrderOptions
 from py_clob_client.order_builder.constants import BUY, SELL
 from py_builder_signing_sdk.config import BuilderConfig
 from dotenv import load_dotenv
 
+from signer_service import get_signer_service
+
 load_dotenv()
 
+# Order signature type for Safe-funded orders (what the builder service signs with too)
+SAFE_SIGNATURE_TYPE = 1
+
+
+def round_to_tick(price: float, tick_size: float) -> float:
+    """
+    Round a price to the market's tick size, keeping it inside [tick, 1 - tick]
+
+    Args:
+        price: Raw price (0-1)
+        tick_size: Market tick size (e.g. 0.01)
+
+    Returns:
+        Price the exchange will accept
+    """
+    decimals = len(f"{tick_size:g}".split('.')[-1]) if '.' in f"{tick_size:g}" else 0
+    rounded = round(round(price / tick_size) * tick_size, decimals)
+    return min(max(rounded, tick_size), round(1 - tick_size, decimals))
+
 
 class PolymarketTrading:
     """
     Real trading client for Polymarket with Builder Program integration
     """
 
-    def __init__(self):
-        """Initialize CLOB client with builder credentials"""
+    def __init__(self, market_catalog=None):
+        """
+        Initialize CLOB client with builder credentials
+
+        Args:
+            market_catalog: Optional MarketCatalog providing cached tick size / neg-risk per token
+        """
+        self.market_catalog = market_catalog
 
         # Polymarket CLOB endpoint
         self.host = "https://clob.polymarket.com"
@@ -52,6 +80,13 @@ class PolymarketTrading:
             # For now, trades will be attributed via ApiCreds
             self.builder_config = None
 
+        # Authenticated per-wallet clients (address -> ClobClient with derived API creds)
+        self._order_clients: Dict[str, ClobClient] = {}
+        self._order_clients_lock = threading.Lock()
+
+        # EIP-712 order signing runs on the shared signer process pool
+        self.signer_service = get_signer_service()
+
         # Initialize CLOB client
         try:
             self.client = ClobClient(
@@ -67,6 +102,103 @@ class PolymarketTrading:
             traceback.print_exc()
             self.client = None
 
+    def get_order_client(self, private_key: str, funder: str = None) -> ClobClient:
+        """
+        Get an authenticated CLOB client for a wallet, deriving API creds only once
+
+        Args:
+            private_key: Wallet private key (with or without 0x prefix)
+            funder: Safe address whose funds the orders spend (signatureType 1, same as
+                    the builder service); None signs and pays from the EOA (signatureType 0)
+
+        Returns:
+            ClobClient with Level 2 auth for the wallet
+        """
+        if private_key.startswith('0x'):
+            private_key = private_key[2:]
+
+        from eth_account import Account
+        address = Account.from_key(private_key).address
+
+        # Keyed by the paying wallet, so order tracking finds the client by an order's funder
+        wallet_address = funder or address
+        with self._order_clients_lock:
+            client = self._order_clients.get(wallet_address)
+        if client:
+            return client
+
+        if funder:
+            client = ClobClient(
+                host=self.host,
+                chain_id=self.chain_id,
+                key=private_key,
+                signature_type=SAFE_SIGNATURE_TYPE,
+                funder=funder
+            )
+        else:
+            client = ClobClient(
+                host=self.host,
+                chain_id=self.chain_id,
+                key=private_key
+            )
+
+        print("[TRADING] Generating API credentials from private key...")
+        client.set_api_creds(client.create_or_derive_api_creds())
+        print(f"[TRADING] OK API credentials derived for wallet {wallet_address[:10]}...")
+
+        with self._order_clients_lock:
+            self._order_clients[wallet_address] = client
+        return client
+
+    def get_cached_order_client(self, wallet_address: str) -> Optional[ClobClient]:
+        """Get a previously authenticated client for a paying wallet address - EOA or Safe (no network)"""
+        with self._order_clients_lock:
+            return self._order_clients.get(wallet_address)
+
+    def get_token_metadata(self, token_id: str) -> Optional[Dict]:
+        """Cached tick size, min order size, neg-risk and fee rate for a token (no network)"""
+        if not self.market_catalog:
+            return None
+        return self.market_catalog.get_token_metadata(token_id)
+
+    def sign_order(self, order_client: ClobClient, order_args: OrderArgs):
+        """
+        Sign an order, using cached market metadata instead of per-order CLOB lookups
+
+        Args:
+            order_client: Authenticated client for the signing wallet
+            order_args: Order arguments (price already rounded to tick)
+
+        Returns:
+            Signed order ready for post_order
+        """
+        meta = self.get_token_metadata(order_args.token_id)
+
+        if meta and meta.get('tick_size') and meta.get('fee_rate_bps') is not None:
+            # Fully known from the CLOB listing - sign locally, zero lookups
+            order_args.fee_rate_bps = meta['fee_rate_bps']
+            options = CreateOrderOptions(
+                tick_size=f"{meta['tick_size']:g}",
+                neg_risk=meta['neg_risk']
+            )
+            try:
+                return self.signer_service.sign_order(order_client, order_args, options)
+            except Exception as e:
+                print(f"[TRADING WARNING] Signer service failed, signing in-thread: {e}")
+                return order_client.builder.create_order(order_args, options)
+
+        if meta and meta.get('tick_size'):
+            # Partially known (Gamma) - let the client resolve the rest
+            return order_client.create_order(
+                order_args,
+                PartialCreateOrderOptions(
+                    tick_size=f"{meta['tick_size']:g}",
+                    neg_risk=meta['neg_risk']
+                )
+            )
+
+        return order_client.create_order(order_args)
+
     def get_market_prices(self, condition_id: str) -> Dict:
         """
         Get current market prices for a condition
@@ -101,13 +233,65 @@ class PolymarketTrading:
             print(f"[TRADING ERROR] Failed to get market prices: {e}")
             return {"yes_price": 0.5, "no_price": 0.5, "error": str(e)}
 
+    def quote_market_order(self, token_id: str, side: str, amount: float, condition_id: str) -> Dict:
+        """
+        Work out the limit price and size for a market order (shared by all order paths)
+
+        Args:
+            token_id: The token ID for the market outcome
+            side: 'YES' or 'NO' position
+            amount: Amount in USDC to spend
+            condition_id: Market's condition ID
+
+        Returns:
+            Dict with order_side, price and size (or success=False with an error)
+        """
+        # Convert side to BUY/SELL (YES = BUY, NO = SELL the YES token)
+        order_side = BUY if side.upper() == 'YES' else SELL
+
+        # Get current market price
+        prices = self.get_market_prices(condition_id)
+        price = prices['yes_price'] if side.upper() == 'YES' else prices['no_price']
+
+        # Add slippage tolerance (5%) for market orders
+        if order_side == BUY:
+            price = min(0.99, price * 1.05)  # Pay up to 5% more
+        else:
+            price = max(0.01, price * 0.95)  # Accept up to 5% less
+
+        # Round to the market's tick size so the exchange doesn't reject the price
+        meta = self.get_token_metadata(token_id)
+        if meta and meta.get('tick_size'):
+            price = round_to_tick(price, meta['tick_size'])
+
+        # Calculate size (number of shares)
+        size = amount / price
+
+        if meta and meta.get('min_order_size') and size < meta['min_order_size']:
+            return {
+                "success": False,
+                "error": f"Order size {size:.2f} shares is below the market minimum of {meta['min_order_size']} shares",
+                "min_order_size": meta['min_order_size']
+            }
+
+        print(f"[TRADING] Order details: price={price:.4f}, size={size:.2f} shares")
+
+        return {
+            "success": True,
+            "order_side": order_side,
+            "price": price,
+            "size": size
+        }
+
     def create_market_order(
         self,
         private_key: str,
         token_id: str,
         side: str,  # 'YES' or 'NO'
         amount: float,  # Amount in USDC
-        condition_id: str
+        condition_id: str,
+        quote: Dict = None,
+        funder: str = None
     ) -> Dict:
         """
         Create and execute a market order (buy at best available price)
@@ -118,6 +302,8 @@ class PolymarketTrading:
             side: 'YES' or 'NO' position
             amount: Amount in USDC to spend
             condition_id: Market's condition ID
+            quote: Result of quote_market_order to submit as is (quoted here if omitted)
+            funder: Safe address paying for the order (None = the EOA pays)
 
         Returns:
             Dict with order details and status
@@ -133,42 +319,23 @@ class PolymarketTrading:
             if private_key.startswith('0x'):
                 private_key = private_key[2:]
 
-            # Convert side to BUY/SELL (YES = BUY, NO = SELL the YES token)
-            order_side = BUY if side.upper() == 'YES' else SELL
-
             print(f"[TRADING] Creating {side} order for ${amount} USDC")
             print(f"[TRADING] Token ID: {token_id}")
             print(f"[TRADING] Condition ID: {condition_id}")
 
-            # Get current market price
-            prices = self.get_market_prices(condition_id)
-            price = prices['yes_price'] if side.upper() == 'YES' else prices['no_price']
-
-            # Add slippage tolerance (5%) for market orders
-            if order_side == BUY:
-                price = min(0.99, price * 1.05)  # Pay up to 5% more
-            else:
-                price = max(0.01, price * 0.95)  # Accept up to 5% less
-
-            # Calculate size (number of shares)
-            size = amount / price
+            if quote is None:
+                quote = self.quote_market_order(token_id, side, amount, condition_id)
+            if not quote.get('success'):
+                return quote
 
-            print(f"[TRADING] Order details: price={price:.4f}, size={size:.2f} shares")
+            order_side = quote['order_side']
+            price = quote['price']
+            size = quote['size']
 
-            # Generate CLOB API credentials from user's private key
+            # CLOB API credentials derived from user's private key (cached per wallet)
             # Builder creds are for attribution, NOT authentication
-            order_client = ClobClient(
-                host=self.host,
-                chain_id=self.chain_id,
-                key=private_key
-            )
-
-            # Derive API credentials for this user's wallet
             try:
-                print("[TRADING] Generating API credentials from private key...")
-                clob_creds = order_client.create_or_derive_api_creds()
-                print(f"[TRADING] OK API credentials derived for wallet")
-                order_client.set_api_creds(clob_creds)  # ← ADD THIS LINE!
+                order_client = self.get_order_client(private_key, funder)
             except Exception as cred_err:
                 print(f"[TRADING ERROR] Failed to derive API credentials: {cred_err}")
                 return {
@@ -186,7 +353,7 @@ class PolymarketTrading:
             )
 
             # Sign the order with user's private key
-            signed_order = order_client.create_order(order_args)
+            signed_order = self.sign_order(order_client, order_args)
 
             # Post the order to the exchange (use order_client for proper authentication)
             resp = order_client.post_order(signed_order, OrderType.FOK)  # Fill or Kill
@@ -198,6 +365,8 @@ class PolymarketTrading:
                 return {
                     "success": True,
                     "order_id": order_id,
+                    "status": resp.get('status'),
+                    "wallet_address": funder or order_client.get_address(),
                     "price": price,
                     "size": size,
                     "side": side,
@@ -226,6 +395,176 @@ class PolymarketTrading:
                 "error_type": type(e).__name__
             }
 
+    def post_limit_order(
+        self,
+        order_client: ClobClient,
+        token_id: str,
+        side: str,
+        price: float,
+        size: float,
+        order_type: str = "GTC",
+        expiration: int = 0
+    ) -> Dict:
+        """
+        Sign and post a resting limit order with an already authenticated client
+
+        Args:
+            order_client: Authenticated client for the signing wallet
+            token_id: The token ID for the market outcome
+            side: 'BUY' or 'SELL'
+            price: Limit price (0-1, rounded to the market tick)
+            size: Number of shares
+            order_type: 'GTC' (good till cancelled) or 'GTD' (good till date)
+            expiration: Unix timestamp for GTD orders (exchange requires at least now + 60s)
+
+        Returns:
+            Dict with order details and status
+        """
+        order_type = order_type.upper()
+        if order_type not in ("GTC", "GTD"):
+            return {"success": False, "error": f"Unsupported resting order type: {order_type}"}
+        if order_type == "GTD" and not expiration:
+            return {"success": False, "error": "GTD orders need an expiration timestamp"}
+
+        meta = self.get_token_metadata(token_id)
+        if meta and meta.get('tick_size'):
+            price = round_to_tick(price, meta['tick_size'])
+
+        if meta and meta.get('min_order_size') and size < meta['min_order_size']:
+            return {
+                "success": False,
+                "error": f"Order size {size:.2f} shares is below the market minimum of {meta['min_order_size']} shares",
+                "min_order_size": meta['min_order_size']
+            }
+
+        order_args = OrderArgs(
+            token_id=token_id,
+            price=price,
+            size=size,
+            side=BUY if side.upper() == 'BUY' else SELL,
+            fee_rate_bps=0,
+            expiration=int(expiration) if order_type == "GTD" else 0
+        )
+
+        try:
+            signed_order = self.sign_order(order_client, order_args)
+            resp = order_client.post_order(signed_order, getattr(OrderType, order_type))
+        except Exception as e:
+            print(f"[TRADING ERROR] Limit order failed: {e}")
+            return {"success": False, "error": str(e), "error_type": type(e).__name__}
+
+        if resp and resp.get('success'):
+            order_id = resp.get('orderID')
+            print(f"[TRADING] OK {order_type} {side.upper()} {size:.2f} @ {price:.4f} resting, ID: {order_id}")
+            return {
+                "success": True,
+                "order_id": order_id,
+                "status": resp.get('status'),
+                "wallet_address": order_client.builder.funder,  # Paying wallet (Safe or EOA)
+                "token_id": token_id,
+                "side": side.upper(),
+                "price": price,
+                "size": size,
+                "order_type": order_type,
+                "expiration": order_args.expiration,
+                "builder_attributed": self.builder_enabled
+            }
+
+        error_msg = resp.get('error', 'Unknown error') if resp else 'No response from exchange'
+        print(f"[TRADING ERROR] Limit order rejected: {error_msg}")
+        return {"success": False, "error": error_msg, "details": resp}
+
+    def create_limit_order(
+        self,
+        private_key: str,
+        token_id: str,
+        side: str,
+        price: float,
+        size: float,
+        order_type: str = "GTC",
+        expiration: int = 0,
+        funder: str = None
+    ) -> Dict:
+        """
+        Create a resting limit order (GTC/GTD) that waits in the book instead of crossing
+
+        Args:
+            private_key: User's wallet private key
+            token_id: The token ID for the market outcome
+            side: 'BUY' or 'SELL'
+            price: Limit price (0-1)
+            size: Number of shares
+            order_type: 'GTC' or 'GTD'
+            expiration: Unix timestamp for GTD orders
+            funder: Safe address paying for the order (None = the EOA pays)
+
+        Returns:
+            Dict with order details and status
+        """
+        try:
+            order_client = self.get_order_client(private_key, funder)
+        except Exception as cred_err:
+            print(f"[TRADING ERROR] Failed to derive API credentials: {cred_err}")
+            return {
+                "success": False,
+                "error": f"Failed to derive API credentials: {cred_err}"
+            }
+
+        return self.post_limit_order(order_client, token_id, side, price, size, order_type, expiration)
+
+    def get_top_of_book(self, token_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Best bid/ask for many tokens in one request
+
+        Args:
+            token_ids: Outcome token IDs
+
+        Returns:
+            Dict of token_id -> {"best_bid", "best_ask"} (None when a side is empty)
+        """
+        if not self.client or not token_ids:
+            return {}
+
+        books = self.client.get_order_books([BookParams(token_id=t) for t in token_ids])
+
+        tops = {}
+        for book in books or []:
+            bids = [float(level.price) for level in (book.bids or [])]
+            asks = [float(level.price) for level in (book.asks or [])]
+            tops[book.asset_id] = {
+                "best_bid": max(bids) if bids else None,
+                "best_ask": min(asks) if asks else None
+            }
+        return tops
+
+    def cancel_wallet_orders(self, wallet_address: str, order_ids: List[str] = None) -> Dict:
+        """
+        Cancel orders for a wallet in one request (all of its open orders if none are given)
+
+        Args:
+            wallet_address: Wallet whose authenticated client placed the orders
+            order_ids: Specific orders to cancel (optional)
+
+        Returns:
+            Dict with canceled / not_canceled order IDs
+        """
+        client = self.get_cached_order_client(wallet_address)
+        if not client:
+            return {"success": False, "error": "No authenticated client for this wallet"}
+
+        try:
+            result = client.cancel_orders(order_ids) if order_ids else client.cancel_all()
+        except Exception as e:
+            print(f"[TRADING ERROR] Bulk cancel failed for {wallet_address[:10]}...: {e}")
+            return {"success": False, "error": str(e)}
+
+        result = result or {}
+        return {
+            "success": True,
+            "canceled": result.get('canceled', []),
+            "not_canceled": result.get('not_canceled', {})
+        }
+
     def get_order_status(self, order_id: str) -> Dict:
         """
         Get the status of an order
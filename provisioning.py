@@ -0,0 +1,231 @@
+"""
+Wallet Provisioning for Polymarket Trading Bot
+Background job queue that creates users' Safe wallets off the registration path.
+Users carry a wallet_status ("provisioning" -> "ready" / "failed") in the DB, jobs
+are retried with backoff, and a periodic sweep re-enqueues anything stuck in
+"provisioning" (queue overflow, restarts)
+"""
+
+import os
+import queue
+import threading
+from typing import Dict, Optional
+
+# Worker threads creating wallets in parallel
+PROVISIONING_WORKERS = int(os.environ.get('PROVISIONING_WORKERS', '4'))
+
+# Safe deployment attempts before falling back to a plain EOA wallet
+PROVISIONING_MAX_ATTEMPTS = int(os.environ.get('PROVISIONING_MAX_ATTEMPTS', '3'))
+
+# Backoff before retry N is PROVISIONING_RETRY_BASE * 2^(N-1) seconds
+PROVISIONING_RETRY_BASE = 2
+
+# Jobs queued in memory before new ones are left to the sweep
+PROVISIONING_QUEUE_SIZE = 10000
+
+# Seconds between sweeps for users stuck in "provisioning"
+PROVISIONING_SWEEP_SECONDS = 60
+
+
+class WalletProvisioner:
+    """
+    Queue + worker pool for wallet creation
+    """
+
+    def __init__(self, wallet_manager, db, event_bus=None, workers: int = PROVISIONING_WORKERS):
+        """
+        Initialize the provisioner (workers start with start())
+
+        Args:
+            wallet_manager: WalletManager that creates the wallets
+            db: MongoDatabase (wallet_status lives on the user document)
+            event_bus: EventBus for "wallet_update" events (optional)
+            workers: Worker thread count
+        """
+        self.wallet_manager = wallet_manager
+        self.db = db
+        self.event_bus = event_bus
+        self.workers = workers
+
+        self._queue = queue.Queue(maxsize=PROVISIONING_QUEUE_SIZE)
+        self._in_flight: set = set()   # user IDs queued or being processed
+        self._lock = threading.Lock()
+
+        self._threads = []
+        self._stop_event = threading.Event()
+
+        self.completed = 0
+        self.failed = 0
+
+    # ==================== JOBS ====================
+
+    def enqueue(self, user_id: str) -> bool:
+        """
+        Queue wallet creation for a user (the user should already be "provisioning")
+
+        Args:
+            user_id: User's database ID
+
+        Returns:
+            True if queued now, False if already queued or left to the next sweep
+        """
+        with self._lock:
+            if user_id in self._in_flight:
+                return False
+            self._in_flight.add(user_id)
+
+        try:
+            self._queue.put_nowait((user_id, 1))
+            return True
+        except queue.Full:
+            with self._lock:
+                self._in_flight.discard(user_id)
+            print(f"[PROVISION] Queue full, {user_id} will be picked up by the next sweep")
+            return False
+
+    def get_status(self, user_id: str) -> Optional[Dict]:
+        """
+        Provisioning state of a user's wallet
+
+        Args:
+            user_id: User's database ID
+
+        Returns:
+            Status dictionary, or None if the user doesn't exist
+        """
+        user = self.db.get_user(user_id=user_id)
+        if not user:
+            return None
+
+        # Users created before provisioning existed have no status field
+        status = user.get('wallet_status') or ("ready" if user.get('wallet_address') else "none")
+        with self._lock:
+            queued = user_id in self._in_flight
+
+        return {
+            "user_id": user_id,
+            "wallet_status": status,
+            "wallet_address": user.get('wallet_address') if status == "ready" else None,
+            "owner_address": user.get('owner_address') if status == "ready" else None,
+            "wallet_type": user.get('wallet_type'),
+            "attempts": user.get('wallet_attempts', 0),
+            "error": user.get('wallet_error'),
+            "queued": queued
+        }
+
+    def queue_size(self) -> int:
+        return self._queue.qsize()
+
+    def _process(self, user_id: str, attempt: int) -> bool:
+        """
+        One provisioning attempt
+
+        Returns:
+            True when the job is finished (ready or failed), False to retry
+        """
+        last_attempt = attempt >= PROVISIONING_MAX_ATTEMPTS
+        print(f"[PROVISION] Creating wallet for {user_id} (attempt {attempt}/{PROVISIONING_MAX_ATTEMPTS})")
+
+        # Only the last attempt may settle for the owner EOA instead of a Safe
+        result = self.wallet_manager.create_safe_wallet(user_id, fallback_to_eoa=last_attempt)
+
+        if not result.get('success') and last_attempt:
+            print(f"[PROVISION] Safe wallet failed for {user_id}, falling back to EOA wallet...")
+            result = self.wallet_manager.create_in_app_wallet(user_id)
+
+        if result.get('success'):
+            self.db.set_wallet_status(user_id, "ready", wallet_attempts=attempt, wallet_error=None)
+            self.completed += 1
+            print(f"[PROVISION] OK Wallet ready for {user_id}: {result.get('wallet_address')}")
+            self._publish(user_id, "ready", result)
+            return True
+
+        if last_attempt:
+            self.db.set_wallet_status(user_id, "failed", wallet_attempts=attempt, wallet_error=result.get('error'))
+            self.failed += 1
+            print(f"[PROVISION ERROR] Wallet creation failed for {user_id}: {result.get('error')}")
+            self._publish(user_id, "failed", result)
+            return True
+
+        self.db.set_wallet_status(user_id, "provisioning", wallet_attempts=attempt, wallet_error=result.get('error'))
+        return False
+
+    def _publish(self, user_id: str, status: str, result: Dict):
+        if self.event_bus:
+            self.event_bus.publish("wallet_update", {
+                "user_id": user_id,
+                "wallet_status": status,
+                "wallet_address": result.get('wallet_address'),
+                "wallet_type": result.get('wallet_type'),
+                "error": result.get('error')
+            })
+
+    # ==================== WORKERS ====================
+
+    def _work(self):
+        """Worker loop: run jobs, requeue failed attempts after a backoff"""
+        while not self._stop_event.is_set():
+            try:
+                user_id, attempt = self._queue.get(timeout=1)
+            except queue.Empty:
+                continue
+
+            try:
+                finished = self._process(user_id, attempt)
+            except Exception as e:
+                print(f"[PROVISION ERROR] Job for {user_id} crashed: {e}")
+                finished = attempt >= PROVISIONING_MAX_ATTEMPTS
+                if finished:
+                    self.db.set_wallet_status(user_id, "failed", wallet_attempts=attempt, wallet_error=str(e))
+
+            if finished:
+                with self._lock:
+                    self._in_flight.discard(user_id)
+            else:
+                # Requeue after the backoff without holding a worker
+                backoff = PROVISIONING_RETRY_BASE * (2 ** (attempt - 1))
+                timer = threading.Timer(backoff, self._queue.put, args=((user_id, attempt + 1),))
+                timer.daemon = True
+                timer.start()
+
+    def sweep(self):
+        """Re-enqueue users stuck in "provisioning" that no job is handling"""
+        for user_id in self.db.get_users_by_wallet_status("provisioning"):
+            self.enqueue(user_id)
+
+    def _sweep_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"[PROVISION ERROR] Sweep failed: {e}")
+            self._stop_event.wait(PROVISIONING_SWEEP_SECONDS)
+
+    def start(self):
+        """Start the workers and the sweep (no-op if already running)"""
+        if any(t.is_alive() for t in self._threads):
+            return
+
+        self._stop_event.clear()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"provision-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        self._threads.append(threading.Thread(target=self._sweep_loop, name="provision-sweep", daemon=True))
+        for thread in self._threads:
+            thread.start()
+        print(f"[PROVISION] Wallet provisioning started ({self.workers} workers)")
+
+    def stop(self):
+        """Stop the workers (unfinished users stay "provisioning" and are swept on restart)"""
+        self._stop_event.set()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            in_flight = len(self._in_flight)
+        return {
+            "queued": self.queue_size(),
+            "in_flight": in_flight,
+            "completed": self.completed,
+            "failed": self.failed
+        }
@@ -0,0 +1,314 @@
+"""
+Receipt Watcher for Polymarket Trading Bot
+Shared background confirmation tracking for submitted transactions: on every new
+block it reads the block's transaction hashes once for all pending hashes (not one
+receipt poll per transaction), then publishes confirmations to the DB and clients
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+# Pending transactions older than this get a direct receipt lookup (seconds)
+RECEIPT_TIMEOUT = float(os.environ.get('RECEIPT_TIMEOUT', '300'))
+
+# Max blocks replayed after the watcher falls behind; beyond that pending hashes are looked up directly
+RECEIPT_MAX_CATCHUP_BLOCKS = 20
+
+# How long finished transactions stay queryable from memory (seconds)
+RECEIPT_RETENTION = 3600
+
+
+class ReceiptWatcher:
+    """
+    Tracks submitted transactions until they are mined
+    """
+
+    def __init__(self, w3, block_watcher, nonce_manager=None, balance_cache=None):
+        """
+        Initialize the watcher and subscribe to new blocks
+
+        Args:
+            w3: Web3 instance
+            block_watcher: BlockWatcher that drives the checks
+            nonce_manager: NonceManager told when a nonce is mined (optional)
+            balance_cache: BalanceCache invalidated for the parties of a mined tx (optional)
+        """
+        self.w3 = w3
+        self.block_watcher = block_watcher
+        self.nonce_manager = nonce_manager
+        self.balance_cache = balance_cache
+        self.db = None
+        self.event_bus = None
+
+        self._transactions: Dict[str, Dict] = {}   # tx_hash -> record
+        self._pending: set = set()                 # tx hashes not mined yet
+        self._events: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._last_block: Optional[int] = None
+
+        block_watcher.add_listener(self._on_new_block)
+
+    def connect(self, db=None, event_bus=None):
+        """
+        Attach the confirmation sinks
+
+        Args:
+            db: MongoDatabase (transactions collection)
+            event_bus: EventBus for "tx_update" events
+        """
+        self.db = db
+        self.event_bus = event_bus
+        if db:
+            self.reload_pending()
+
+    def reload_pending(self) -> int:
+        """
+        Resume watching transactions the DB still has as pending (e.g. after a restart)
+        Their receipts are looked up once right away, since they may have been mined while we were down
+
+        Returns:
+            Number of transactions reloaded
+        """
+        records = self.db.get_pending_transactions() if self.db else []
+        reloaded = []
+        with self._lock:
+            for record in records:
+                tx_hash = record.get("tx_hash")
+                if not tx_hash or tx_hash in self._transactions:
+                    continue
+                record = {k: v for k, v in record.items() if k not in ("created_at", "updated_at")}
+                record.setdefault("submitted_at", time.time())
+                self._transactions[tx_hash] = record
+                self._pending.add(tx_hash)
+                self._events[tx_hash] = threading.Event()
+                reloaded.append(tx_hash)
+
+        if reloaded:
+            print(f"[RECEIPTS] Reloaded {len(reloaded)} pending transactions")
+            threading.Thread(
+                target=self._check_directly, args=(reloaded,), name="receipts-reload", daemon=True
+            ).start()
+        return len(reloaded)
+
+    # ==================== TRACKING ====================
+
+    def watch(
+        self,
+        tx_hash: str,
+        from_address: str,
+        nonce: int = None,
+        kind: str = "transfer",
+        to_address: str = None,
+        user_id: str = None,
+        **details
+    ) -> Dict:
+        """
+        Start watching a transaction - call before broadcasting it (the hash is known
+        once signed), so the block that mines it can't be processed before it is watched
+
+        Args:
+            tx_hash: Transaction hash (0x...)
+            from_address: Sender
+            nonce: Nonce used (released in the nonce manager once mined)
+            kind: "transfer", "usdc_transfer", "approval"...
+            to_address: Recipient (its balances are invalidated once mined)
+            user_id: Owner's database ID (for per-user event filtering)
+            **details: Extra fields stored on the record
+
+        Returns:
+            The pending record
+        """
+        record = {
+            "tx_hash": tx_hash,
+            "from_address": from_address,
+            "to_address": to_address,
+            "nonce": nonce,
+            "kind": kind,
+            "user_id": user_id,
+            "status": "pending",
+            "submitted_at": time.time()
+        }
+        record.update(details)
+
+        with self._lock:
+            self._transactions[tx_hash] = record
+            self._pending.add(tx_hash)
+            self._events[tx_hash] = threading.Event()
+
+        self._persist(record)
+        self._publish(record)
+        return dict(record)
+
+    def discard(self, tx_hash: str, error: str):
+        """
+        Stop watching a transaction whose broadcast failed (it never reached the network)
+
+        Args:
+            tx_hash: Transaction hash passed to watch()
+            error: Why the broadcast failed
+        """
+        with self._lock:
+            record = self._transactions.pop(tx_hash, None)
+            self._pending.discard(tx_hash)
+            event = self._events.pop(tx_hash, None)
+        if not record:
+            return
+
+        record.update(status="failed", error=f"Broadcast failed: {error}")
+        self._persist(record)
+        self._publish(record)
+        if event:
+            event.set()
+
+    def get(self, tx_hash: str) -> Optional[Dict]:
+        """Transaction status from memory, falling back to the DB"""
+        with self._lock:
+            record = self._transactions.get(tx_hash)
+            if record:
+                return dict(record)
+        return self.db.get_transaction(tx_hash) if self.db else None
+
+    def wait(self, tx_hash: str, timeout: float = 120) -> Optional[Dict]:
+        """
+        Block until a watched transaction is mined (for scripts; API handlers shouldn't)
+
+        Args:
+            tx_hash: Transaction hash
+            timeout: Seconds to wait
+
+        Returns:
+            Final record, or None on timeout
+        """
+        with self._lock:
+            event = self._events.get(tx_hash)
+        if not event:
+            return self.get(tx_hash)
+        if not event.wait(timeout):
+            return None
+        return self.get(tx_hash)
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    # ==================== BLOCK PROCESSING ====================
+
+    def _on_new_block(self, block_number: int):
+        """Block watcher listener: match new blocks against every pending hash"""
+        with self._lock:
+            has_pending = bool(self._pending)
+            last_block = self._last_block
+            self._last_block = block_number
+
+        if not has_pending:
+            return
+
+        first = (last_block + 1) if last_block is not None else block_number
+        if block_number - first >= RECEIPT_MAX_CATCHUP_BLOCKS:
+            # Fell too far behind to replay blocks - ask for each receipt directly
+            self._check_directly(list(self._pending_snapshot()))
+            return
+
+        for number in range(first, block_number + 1):
+            try:
+                block = self.w3.eth.get_block(number, full_transactions=False)
+            except Exception as e:
+                print(f"[RECEIPTS] Could not read block {number}: {e}")
+                continue
+
+            block_hashes = {self._hex(h) for h in block.get("transactions", [])}
+            mined = block_hashes & self._pending_snapshot()
+            for tx_hash in mined:
+                self._confirm(tx_hash)
+
+        self._check_timeouts()
+        self._prune()
+
+    def _pending_snapshot(self) -> set:
+        with self._lock:
+            return set(self._pending)
+
+    def _check_timeouts(self):
+        """Direct receipt lookups for transactions pending longer than RECEIPT_TIMEOUT"""
+        cutoff = time.time() - RECEIPT_TIMEOUT
+        with self._lock:
+            stale = [
+                h for h in self._pending
+                if self._transactions[h]["submitted_at"] < cutoff
+                and self._transactions[h].get("last_checked_at", 0) < cutoff
+            ]
+            for h in stale:
+                self._transactions[h]["last_checked_at"] = time.time()
+        if stale:
+            self._check_directly(stale)
+
+    def _check_directly(self, tx_hashes):
+        """Look receipts up one by one (catch-up / timeout path)"""
+        for tx_hash in tx_hashes:
+            try:
+                receipt = self.w3.eth.get_transaction_receipt(tx_hash)
+            except Exception:
+                continue  # Not mined yet (TransactionNotFound) or RPC error
+            self._confirm(tx_hash, receipt)
+
+    def _confirm(self, tx_hash: str, receipt: Dict = None):
+        """Fetch the receipt of a mined transaction (if not given) and publish the outcome"""
+        if receipt is None:
+            try:
+                receipt = self.w3.eth.get_transaction_receipt(tx_hash)
+            except Exception as e:
+                print(f"[RECEIPTS] Receipt lookup failed for {tx_hash[:12]}...: {e}")
+                return
+
+        with self._lock:
+            record = self._transactions.get(tx_hash)
+            if not record or tx_hash not in self._pending:
+                return
+            self._pending.discard(tx_hash)
+            record["status"] = "confirmed" if receipt["status"] == 1 else "failed"
+            record["block_number"] = receipt["blockNumber"]
+            record["gas_used"] = receipt["gasUsed"]
+            record["confirmed_at"] = time.time()
+            snapshot = dict(record)
+            event = self._events.get(tx_hash)
+
+        print(f"[RECEIPTS] {snapshot['kind']} {tx_hash[:12]}... {snapshot['status']} in block {snapshot['block_number']}")
+
+        if self.nonce_manager and snapshot.get("nonce") is not None:
+            self.nonce_manager.mark_mined(snapshot["from_address"], snapshot["nonce"])
+        if self.balance_cache:
+            self.balance_cache.invalidate(snapshot["from_address"], snapshot.get("to_address"))
+
+        self._persist(snapshot)
+        self._publish(snapshot)
+        if event:
+            event.set()
+
+    def _prune(self):
+        """Drop finished transactions older than the retention window"""
+        cutoff = time.time() - RECEIPT_RETENTION
+        with self._lock:
+            stale = [
+                h for h, r in self._transactions.items()
+                if h not in self._pending and r.get("confirmed_at", 0) < cutoff
+            ]
+            for h in stale:
+                del self._transactions[h]
+                self._events.pop(h, None)
+
+    @staticmethod
+    def _hex(tx_hash) -> str:
+        value = tx_hash.hex() if hasattr(tx_hash, "hex") else str(tx_hash)
+        return value if value.startswith("0x") else "0x" + value
+
+    # ==================== SINKS ====================
+
+    def _persist(self, record: Dict):
+        if self.db:
+            self.db.save_transaction(record["tx_hash"], record)
+
+    def _publish(self, record: Dict):
+        if self.event_bus:
+            self.event_bus.publish("tx_update", record)
@@ -0,0 +1,419 @@
+"""
+Resting Order Book for Polymarket Trading Bot
+In-process index of our own open limit orders (GTC/GTD) per token and wallet,
+a top-of-book mirror refreshed in bulk, cancel/replace for pegged orders when
+the book moves away, and bulk cancel per wallet on shutdown
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from order_tracker import TERMINAL_STATUSES
+
+# Seconds between book refreshes / reprice passes
+RESTING_ORDER_INTERVAL = float(os.environ.get('RESTING_ORDER_INTERVAL', '2'))
+
+# Pegged orders are replaced once the touch is this many ticks away from our price
+RESTING_REPRICE_TICKS = int(os.environ.get('RESTING_REPRICE_TICKS', '2'))
+
+# Furthest a pegged order may be re-quoted from its original limit price (price units, 0 = never
+# past the original price); overridable per order
+RESTING_PEG_MAX_DRIFT = float(os.environ.get('RESTING_PEG_MAX_DRIFT', '0.05'))
+
+# Cancel everything we have resting when the server shuts down
+RESTING_CANCEL_ON_SHUTDOWN = os.environ.get('RESTING_CANCEL_ON_SHUTDOWN', 'true').lower() == 'true'
+
+# Tick size assumed when a token has no cached metadata
+DEFAULT_TICK_SIZE = 0.01
+
+
+class RestingOrderBook:
+    """
+    Index of resting limit orders placed through this server
+    """
+
+    def __init__(self, trading, order_tracker=None):
+        """
+        Initialize the resting order book
+
+        Args:
+            trading: PolymarketTrading instance (signing, posting, cancels, book reads)
+            order_tracker: OrderTracker that follows fills/status of each order (optional)
+        """
+        self.trading = trading
+        self.order_tracker = order_tracker
+
+        self._orders: Dict[str, Dict] = {}       # order_id -> record
+        self._by_token: Dict[str, set] = {}      # token_id -> order IDs
+        self._by_wallet: Dict[str, set] = {}     # wallet -> order IDs
+        self._books: Dict[str, Dict] = {}        # token_id -> {"best_bid", "best_ask", "updated_at"}
+        self._lock = threading.Lock()
+
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    # ==================== PLACEMENT ====================
+
+    def place(
+        self,
+        private_key: str,
+        user_id: str,
+        token_id: str,
+        side: str,
+        price: float,
+        size: float,
+        order_type: str = "GTC",
+        expiration: int = 0,
+        peg: bool = False,
+        peg_max_drift: float = None,
+        funder: str = None
+    ) -> Dict:
+        """
+        Place a resting limit order and index it
+
+        Args:
+            private_key: User's wallet private key
+            user_id: Owner's database ID
+            token_id: The token ID for the market outcome
+            side: 'BUY' or 'SELL'
+            price: Limit price (0-1)
+            size: Number of shares
+            order_type: 'GTC' or 'GTD'
+            expiration: Unix timestamp for GTD orders
+            peg: Follow the touch (cancel/replace) when the book moves away
+            peg_max_drift: How far past the limit price pegging may move it (default RESTING_PEG_MAX_DRIFT)
+            funder: Safe address paying for the order (None = the EOA pays)
+
+        Returns:
+            Order result from PolymarketTrading plus the indexed record
+        """
+        result = self.trading.create_limit_order(
+            private_key=private_key,
+            token_id=token_id,
+            side=side,
+            price=price,
+            size=size,
+            order_type=order_type,
+            expiration=expiration,
+            funder=funder
+        )
+
+        if result.get('success') and result.get('order_id'):
+            peg_limit = None
+            if peg:
+                drift = RESTING_PEG_MAX_DRIFT if peg_max_drift is None else max(0.0, peg_max_drift)
+                # A BUY may chase the bid up to this price, a SELL the ask down to it
+                peg_limit = result['price'] + drift if result['side'] == "BUY" else result['price'] - drift
+            self._add(result, user_id, peg, peg_limit)
+
+        return result
+
+    def _add(self, result: Dict, user_id: str, peg: bool, peg_limit: float = None) -> Dict:
+        """Index a posted order and hand it to the tracker"""
+        record = {
+            "order_id": result['order_id'],
+            "user_id": user_id,
+            "wallet_address": result['wallet_address'],
+            "token_id": result['token_id'],
+            "side": result['side'],
+            "price": result['price'],
+            "size": result['size'],
+            "order_type": result['order_type'],
+            "expiration": result.get('expiration', 0),
+            "peg": peg,
+            "peg_limit": peg_limit,  # Worst price repricing may reach (set from the original order)
+            "placed_at": time.time()
+        }
+
+        with self._lock:
+            self._orders[record["order_id"]] = record
+            self._by_token.setdefault(record["token_id"], set()).add(record["order_id"])
+            self._by_wallet.setdefault(record["wallet_address"], set()).add(record["order_id"])
+
+        if self.order_tracker:
+            self.order_tracker.track(
+                record["order_id"],
+                user_id=user_id,
+                wallet_address=record["wallet_address"],
+                status=result.get('status'),
+                token_id=record["token_id"],
+                side=record["side"],
+                price=record["price"],
+                size=record["size"],
+                order_type=record["order_type"]
+            )
+
+        return record
+
+    def _drop(self, order_id: str) -> Optional[Dict]:
+        """Remove an order from the index"""
+        with self._lock:
+            record = self._orders.pop(order_id, None)
+            if record:
+                self._by_token.get(record["token_id"], set()).discard(order_id)
+                self._by_wallet.get(record["wallet_address"], set()).discard(order_id)
+                if not self._by_token.get(record["token_id"]):
+                    self._by_token.pop(record["token_id"], None)
+                    self._books.pop(record["token_id"], None)
+            return record
+
+    # ==================== LOOKUPS ====================
+
+    def get_order(self, order_id: str) -> Optional[Dict]:
+        """A resting order from the index (no network)"""
+        with self._lock:
+            record = self._orders.get(order_id)
+            return dict(record) if record else None
+
+    def get_user_orders(self, user_id: str) -> List[Dict]:
+        """Resting orders for a user (no network)"""
+        with self._lock:
+            return [dict(r) for r in self._orders.values() if r["user_id"] == user_id]
+
+    def get_token_orders(self, token_id: str) -> List[Dict]:
+        """Our resting orders on one outcome token (no network)"""
+        with self._lock:
+            return [dict(self._orders[o]) for o in self._by_token.get(token_id, ())]
+
+    def get_book(self, token_id: str) -> Optional[Dict]:
+        """Last mirrored top of book for a token we rest on (no network)"""
+        with self._lock:
+            book = self._books.get(token_id)
+            return dict(book) if book else None
+
+    def order_count(self) -> int:
+        """Number of indexed resting orders"""
+        with self._lock:
+            return len(self._orders)
+
+    # ==================== CANCELS ====================
+
+    def cancel(self, order_id: str) -> Dict:
+        """
+        Cancel one of our resting orders
+
+        Args:
+            order_id: Order to cancel
+
+        Returns:
+            Dict with cancellation status
+        """
+        with self._lock:
+            record = self._orders.get(order_id)
+        if not record:
+            return {"success": False, "error": "Order is not resting on this server"}
+
+        result = self.trading.cancel_wallet_orders(record["wallet_address"], [order_id])
+        if result.get('success') and order_id in result.get('canceled', []):
+            self._drop(order_id)
+            return {"success": True, "order_id": order_id, "message": "Order cancelled successfully"}
+
+        return {
+            "success": False,
+            "order_id": order_id,
+            "error": result.get('error') or result.get('not_canceled', {}).get(order_id, 'Cancellation failed')
+        }
+
+    def cancel_wallet(self, wallet_address: str, everything: bool = False) -> Dict:
+        """
+        Cancel a wallet's resting orders in one request
+
+        Args:
+            wallet_address: Wallet to cancel for
+            everything: Cancel all of the wallet's open orders, not just the ones indexed here
+
+        Returns:
+            Dict with canceled / not_canceled order IDs
+        """
+        with self._lock:
+            order_ids = list(self._by_wallet.get(wallet_address, ()))
+
+        if not order_ids and not everything:
+            return {"success": True, "canceled": [], "not_canceled": {}}
+
+        result = self.trading.cancel_wallet_orders(wallet_address, None if everything else order_ids)
+        if result.get('success'):
+            for order_id in result.get('canceled', []):
+                self._drop(order_id)
+            if everything:
+                for order_id in order_ids:
+                    self._drop(order_id)
+        return result
+
+    def cancel_all(self) -> int:
+        """
+        Cancel every indexed order, one bulk request per wallet (used on shutdown)
+
+        Returns:
+            Number of orders cancelled
+        """
+        with self._lock:
+            wallets = [w for w, ids in self._by_wallet.items() if ids]
+
+        cancelled = 0
+        for wallet_address in wallets:
+            result = self.cancel_wallet(wallet_address)
+            cancelled += len(result.get('canceled', []))
+
+        if wallets:
+            print(f"[RESTING] Cancelled {cancelled} resting orders across {len(wallets)} wallets")
+        return cancelled
+
+    # ==================== BOOK MIRROR / REPRICE ====================
+
+    def refresh_books(self) -> int:
+        """
+        Refresh the top of book for every token we rest on (one bulk request)
+
+        Returns:
+            Number of books updated
+        """
+        with self._lock:
+            token_ids = list(self._by_token)
+        if not token_ids:
+            return 0
+
+        tops = self.trading.get_top_of_book(token_ids)
+        now = time.time()
+        with self._lock:
+            for token_id, top in tops.items():
+                if token_id in self._by_token:
+                    self._books[token_id] = dict(top, updated_at=now)
+        return len(tops)
+
+    def _sync_with_tracker(self):
+        """Drop orders the tracker has seen fill completely, cancel or expire"""
+        if not self.order_tracker:
+            return
+        with self._lock:
+            order_ids = list(self._orders)
+        for order_id in order_ids:
+            tracked = self.order_tracker.get_order(order_id)
+            if tracked and tracked["status"] in TERMINAL_STATUSES:
+                self._drop(order_id)
+
+    def reprice(self) -> int:
+        """
+        Cancel/replace pegged orders whose price the book has moved away from
+
+        Returns:
+            Number of orders replaced
+        """
+        with self._lock:
+            candidates = [dict(r) for r in self._orders.values() if r["peg"]]
+            books = dict(self._books)
+
+        replaced = 0
+        for record in candidates:
+            book = books.get(record["token_id"])
+            target = self._target_price(record, book)
+            if target is None:
+                continue
+            if self._replace(record, target):
+                replaced += 1
+        return replaced
+
+    def _target_price(self, record: Dict, book: Optional[Dict]) -> Optional[float]:
+        """New price for a pegged order (never past its peg limit), or None if it should stay"""
+        if not book:
+            return None
+
+        meta = self.trading.get_token_metadata(record["token_id"]) or {}
+        tick = meta.get('tick_size') or DEFAULT_TICK_SIZE
+        max_distance = RESTING_REPRICE_TICKS * tick - 1e-9
+        limit = record.get("peg_limit")
+
+        target = None
+        if record["side"] == "BUY" and book.get("best_bid") is not None:
+            if book["best_bid"] - record["price"] >= max_distance:
+                target = book["best_bid"] if limit is None else min(book["best_bid"], limit)
+                if target <= record["price"] + 1e-9:
+                    return None  # Already at the cap
+        elif record["side"] == "SELL" and book.get("best_ask") is not None:
+            if record["price"] - book["best_ask"] >= max_distance:
+                target = book["best_ask"] if limit is None else max(book["best_ask"], limit)
+                if target >= record["price"] - 1e-9:
+                    return None
+        return target
+
+    def _replace(self, record: Dict, price: float) -> bool:
+        """Cancel an order and re-post its unfilled remainder at a new price"""
+        order_id = record["order_id"]
+        client = self.trading.get_cached_order_client(record["wallet_address"])
+        if not client:
+            return False
+
+        result = self.trading.cancel_wallet_orders(record["wallet_address"], [order_id])
+        if not result.get('success') or order_id not in result.get('canceled', []):
+            # Probably filled or already gone - the tracker will tell us
+            return False
+        self._drop(order_id)
+
+        # The tracker polls less often than we reprice, so read what actually filled
+        # before the cancel landed (reposting a stale remainder would overfill)
+        try:
+            final = client.get_order(order_id) or {}
+            remaining = max(0.0, record["size"] - float(final.get('size_matched') or 0))
+        except Exception as e:
+            print(f"[RESTING ERROR] Could not read fills of cancelled {order_id[:10]}..., not reposting: {e}")
+            return False
+
+        if remaining <= 0:
+            return False
+
+        print(f"[RESTING] Repricing {order_id[:10]}... {record['side']} {record['price']:.4f} -> {price:.4f}")
+        new_order = self.trading.post_limit_order(
+            client,
+            record["token_id"],
+            record["side"],
+            price,
+            remaining,
+            record["order_type"],
+            record.get("expiration", 0)
+        )
+        if not new_order.get('success'):
+            print(f"[RESTING ERROR] Replacement for {order_id[:10]}... failed: {new_order.get('error')}")
+            return False
+
+        self._add(new_order, record["user_id"], peg=True, peg_limit=record.get("peg_limit"))
+        return True
+
+    # ==================== BACKGROUND LOOP ====================
+
+    def _run(self, interval: float):
+        """Background loop: refresh book mirror, then reprice pegged orders"""
+        while not self._stop_event.is_set():
+            try:
+                if self.order_count():
+                    self._sync_with_tracker()
+                    self.refresh_books()
+                    self.reprice()
+            except Exception as e:
+                print(f"[RESTING ERROR] Reprice pass failed: {e}")
+            self._stop_event.wait(interval)
+
+    def start(self, interval: float = RESTING_ORDER_INTERVAL):
+        """Start the background loop (no-op if already running)"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(interval,),
+            name="resting-orders",
+            daemon=True
+        )
+        self._thread.start()
+        print(f"[RESTING] Resting order book started (every {interval}s)")
+
+    def stop(self):
+        """Stop the background loop and, if configured, cancel everything resting"""
+        self._stop_event.set()
+        if RESTING_CANCEL_ON_SHUTDOWN:
+            try:
+                self.cancel_all()
+            except Exception as e:
+                print(f"[RESTING ERROR] Shutdown cancel failed: {e}")
@@ -0,0 +1,273 @@
+"""
+RPC Endpoint Pool for Polymarket Trading Bot
+Keeps every configured Polygon RPC endpoint, scores them by rolling latency,
+error rate and head lag, routes each JSON-RPC call to the best healthy one and
+fails over to the next endpoint mid-request. Health checks run in the background
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import requests
+from urllib3.exceptions import NewConnectionError
+from web3 import HTTPProvider
+from web3.providers.base import BaseProvider
+
+# Per-request timeout for a single endpoint (seconds)
+RPC_TIMEOUT = float(os.environ.get('RPC_TIMEOUT', '10'))
+
+# Seconds between background health checks
+RPC_HEALTH_INTERVAL = float(os.environ.get('RPC_HEALTH_INTERVAL', '15'))
+
+# Endpoints tried per call before giving up
+RPC_MAX_ATTEMPTS = int(os.environ.get('RPC_MAX_ATTEMPTS', '3'))
+
+# Rolling window of samples kept per endpoint
+RPC_WINDOW = 100
+
+# Consecutive failures after which an endpoint is benched...
+RPC_MAX_CONSECUTIVE_FAILURES = 3
+
+# ...until this many seconds have passed (or a health check succeeds)
+RPC_COOLDOWN_SECONDS = 30
+
+# An endpoint this many blocks behind the best head is treated as unhealthy
+RPC_MAX_BLOCK_LAG = 5
+
+# Latency assumed for an endpoint with no samples yet (seconds)
+RPC_DEFAULT_LATENCY = 0.5
+
+# Calls that must not be resent to another endpoint once they may have been delivered
+# (a broadcast that timed out may already be in the mempool)
+RPC_NO_FAILOVER_AFTER_SEND = {"eth_sendRawTransaction"}
+
+
+class BroadcastUncertainError(ConnectionError):
+    """A transaction broadcast failed after the request may have reached the node"""
+
+
+def _never_sent(error: Exception) -> bool:
+    """True if a transport error happened before the request reached the endpoint"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError) and error.args:
+        return isinstance(getattr(error.args[0], "reason", None), NewConnectionError)
+    return False
+
+
+class RpcEndpoint:
+    """One RPC URL with its provider and rolling health statistics"""
+
+    def __init__(self, url: str, timeout: float = RPC_TIMEOUT):
+        self.url = url
+        # Retries are the pool's job (on a different endpoint), not the provider's
+        self.provider = HTTPProvider(
+            url,
+            request_kwargs={'timeout': timeout},
+            exception_retry_configuration=None
+        )
+        self.latencies = deque(maxlen=RPC_WINDOW)
+        self.outcomes = deque(maxlen=RPC_WINDOW)
+        self.consecutive_failures = 0
+        self.last_error_at = 0.0
+        self.last_error = None
+        self.block_number: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, ok: bool, error: Exception = None):
+        """Record the outcome of one call"""
+        with self._lock:
+            self.latencies.append(latency)
+            self.outcomes.append(ok)
+            if ok:
+                self.consecutive_failures = 0
+            else:
+                self.consecutive_failures += 1
+                self.last_error_at = time.time()
+                self.last_error = str(error) if error else None
+
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self.outcomes:
+                return 0.0
+            return 1 - (sum(self.outcomes) / len(self.outcomes))
+
+    def percentile(self, pct: float) -> float:
+        """Latency percentile over the window (default latency if no samples)"""
+        with self._lock:
+            samples = sorted(self.latencies)
+        if not samples:
+            return RPC_DEFAULT_LATENCY
+        index = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def score(self) -> float:
+        """Lower is better: tail latency inflated by recent errors"""
+        return self.percentile(90) * (1 + 4 * self.error_rate())
+
+    def is_benched(self) -> bool:
+        return (
+            self.consecutive_failures >= RPC_MAX_CONSECUTIVE_FAILURES
+            and time.time() - self.last_error_at < RPC_COOLDOWN_SECONDS
+        )
+
+    def summary(self) -> Dict:
+        return {
+            "url": self.url,
+            "samples": len(self.latencies),
+            "p50_ms": round(self.percentile(50) * 1000, 1),
+            "p90_ms": round(self.percentile(90) * 1000, 1),
+            "error_rate": round(self.error_rate(), 3),
+            "consecutive_failures": self.consecutive_failures,
+            "block_number": self.block_number,
+            "last_error": self.last_error
+        }
+
+
+class RpcPool:
+    """
+    Health-scored pool of RPC endpoints with latency-based routing and failover
+    """
+
+    def __init__(self, urls: List[str], timeout: float = RPC_TIMEOUT):
+        """
+        Initialize the pool (no network access - health checks run in the background)
+
+        Args:
+            urls: RPC endpoint URLs (config order is the tie-breaker)
+            timeout: Per-request timeout for a single endpoint
+        """
+        self.endpoints = [RpcEndpoint(url, timeout) for url in urls]
+
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, len(urls)), thread_name_prefix="rpc-health")
+
+    # ==================== ROUTING ====================
+
+    def best_block(self) -> Optional[int]:
+        """Highest head reported by any endpoint's last health check"""
+        heads = [e.block_number for e in self.endpoints if e.block_number is not None]
+        return max(heads) if heads else None
+
+    def is_healthy(self, endpoint: RpcEndpoint) -> bool:
+        """Not benched for failures and not lagging behind the best head"""
+        if endpoint.is_benched():
+            return False
+        best = self.best_block()
+        if best is not None and endpoint.block_number is not None:
+            return best - endpoint.block_number <= RPC_MAX_BLOCK_LAG
+        return True
+
+    def ranked(self) -> List[RpcEndpoint]:
+        """
+        Endpoints best-first: healthy by score, then unhealthy ones as a last resort
+
+        Returns:
+            List of endpoints
+        """
+        healthy = [e for e in self.endpoints if self.is_healthy(e)]
+        unhealthy = [e for e in self.endpoints if not self.is_healthy(e)]
+        healthy.sort(key=lambda e: e.score())
+        unhealthy.sort(key=lambda e: e.last_error_at)
+        return healthy + unhealthy
+
+    def has_healthy(self) -> bool:
+        """True if at least one endpoint is currently usable"""
+        return any(self.is_healthy(e) for e in self.endpoints)
+
+    def request(self, method: str, params: Any) -> Dict:
+        """
+        Send one JSON-RPC call, failing over to the next endpoint on transport errors
+
+        JSON-RPC errors returned by a node (reverts, bad params) are passed
+        through untouched - only timeouts, connection and HTTP errors fail over.
+        Broadcasts only fail over when the connection was never made; after a read
+        timeout or HTTP error they raise BroadcastUncertainError instead.
+
+        Args:
+            method: JSON-RPC method
+            params: JSON-RPC params
+
+        Returns:
+            Raw JSON-RPC response dictionary
+        """
+        last_error = None
+        for endpoint in self.ranked()[:RPC_MAX_ATTEMPTS]:
+            started = time.time()
+            try:
+                response = endpoint.provider.make_request(method, params)
+            except Exception as e:
+                endpoint.record(time.time() - started, False, e)
+                last_error = e
+                if method in RPC_NO_FAILOVER_AFTER_SEND and not _never_sent(e):
+                    raise BroadcastUncertainError(f"{method} may have reached {endpoint.url}: {e}") from e
+                print(f"[RPC] {method} failed on {endpoint.url}, failing over: {e}")
+                continue
+
+            endpoint.record(time.time() - started, True)
+            return response
+
+        raise ConnectionError(f"All RPC endpoints failed for {method}: {last_error}")
+
+    # ==================== HEALTH CHECKS ====================
+
+    def _probe(self, endpoint: RpcEndpoint):
+        """Check one endpoint with eth_blockNumber"""
+        started = time.time()
+        try:
+            response = endpoint.provider.make_request("eth_blockNumber", [])
+            endpoint.block_number = int(response["result"], 16)
+            endpoint.record(time.time() - started, True)
+        except Exception as e:
+            endpoint.record(time.time() - started, False, e)
+
+    def check_health(self):
+        """Probe every endpoint in parallel"""
+        list(self._executor.map(self._probe, self.endpoints))
+
+    def _run(self, interval: float):
+        """Background health-check loop"""
+        while not self._stop_event.is_set():
+            try:
+                self.check_health()
+            except Exception as e:
+                print(f"[RPC ERROR] Health check failed: {e}")
+            self._stop_event.wait(interval)
+
+    def start(self, interval: float = RPC_HEALTH_INTERVAL):
+        """Start background health checks (no-op if already running)"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="rpc-health", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop background health checks"""
+        self._stop_event.set()
+
+    def get_stats(self) -> List[Dict]:
+        """Per-endpoint statistics, best-first"""
+        return [dict(e.summary(), healthy=self.is_healthy(e)) for e in self.ranked()]
+
+
+class PooledHTTPProvider(BaseProvider):
+    """
+    web3 provider that sends every request through an RpcPool
+    """
+
+    def __init__(self, pool: RpcPool):
+        super().__init__()
+        self.pool = pool
+
+    def make_request(self, method, params):
+        return self.pool.request(method, params)
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        return self.pool.has_healthy()
@@ -0,0 +1,49 @@
+"""
+Safe Address Calculation for Polymarket Trading Bot
+Polymarket Safe wallets are deployed by the Safe proxy factory with CREATE2, so an
+owner's Safe address is known before (and without) deployment:
+    keccak256(0xff ++ factory ++ keccak256(abi.encode(owner)) ++ init_code_hash)[12:]
+Computed locally instead of asking the Node service
+"""
+
+from functools import lru_cache
+
+from eth_abi import encode
+from eth_utils import keccak, to_bytes, to_checksum_address
+
+# Polymarket Safe proxy factory on Polygon
+SAFE_FACTORY = "0xaacFeEa03eb1561C4e67d661e40682Bd20E3541b"
+
+# keccak256 of the Safe proxy creation code the factory deploys
+SAFE_INIT_CODE_HASH = "0x2bce2127ff07fb632d16c8347c4ebf501f4841168bed00d9e6ef715ddb6fcecf"
+
+
+def create2_address(deployer: str, salt: bytes, init_code_hash: str) -> str:
+    """
+    Address a CREATE2 deployment lands at
+
+    Args:
+        deployer: Deploying contract (the factory)
+        salt: 32-byte salt
+        init_code_hash: keccak256 of the creation code (0x hex)
+
+    Returns:
+        Checksummed address
+    """
+    digest = keccak(b"\xff" + to_bytes(hexstr=deployer) + salt + to_bytes(hexstr=init_code_hash))
+    return to_checksum_address(digest[12:])
+
+
+@lru_cache(maxsize=4096)
+def derive_safe_address(owner_address: str) -> str:
+    """
+    Counterfactual Polymarket Safe address for an owner EOA
+
+    Args:
+        owner_address: Owner EOA (any case)
+
+    Returns:
+        Checksummed Safe address (whether or not it is deployed yet)
+    """
+    salt = keccak(encode(["address"], [to_checksum_address(owner_address)]))
+    return create2_address(SAFE_FACTORY, salt, SAFE_INIT_CODE_HASH)
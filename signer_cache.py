@@ -0,0 +1,144 @@
+"""
+Signer Cache for Polymarket Trading Bot
+Short-lived, size-bounded in-memory cache of decrypted signers (eth_account
+LocalAccount) keyed by user, so trades and approvals sign without database
+round trips or decryption. Evicted entries have their key material wiped
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from eth_account import Account
+from eth_account.signers.local import LocalAccount
+
+# Seconds a decrypted signer stays cached
+SIGNER_CACHE_TTL = float(os.environ.get('SIGNER_CACHE_TTL', '300'))
+
+# Max signers held at once (least recently used are evicted first)
+SIGNER_CACHE_SIZE = int(os.environ.get('SIGNER_CACHE_SIZE', '1000'))
+
+
+class _CachedSigner:
+    """A signer plus the mutable copy of its key we can wipe"""
+
+    def __init__(self, private_key: str, ttl: float):
+        self.key_material = bytearray.fromhex(private_key[2:] if private_key.startswith("0x") else private_key)
+        self.account: LocalAccount = Account.from_key(bytes(self.key_material))
+        self.expires_at = time.time() + ttl
+
+    def wipe(self):
+        """
+        Zero our copy of the key and drop the cache's reference to the account
+        (best effort: the account's own key bytes are immutable and are freed once
+        any in-flight signing call that still holds the account finishes)
+        """
+        for i in range(len(self.key_material)):
+            self.key_material[i] = 0
+        self.account = None
+
+
+class SignerCache:
+    """
+    TTL + LRU cache of LocalAccount signers
+    """
+
+    def __init__(self, ttl: float = SIGNER_CACHE_TTL, max_size: int = SIGNER_CACHE_SIZE):
+        """
+        Initialize the cache
+
+        Args:
+            ttl: Seconds an entry lives
+            max_size: Max entries (LRU eviction beyond this)
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+
+        self._entries: "OrderedDict[str, _CachedSigner]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: str) -> Optional[LocalAccount]:
+        """
+        Cached signer for a user
+
+        Args:
+            user_id: User's database ID
+
+        Returns:
+            LocalAccount, or None on a miss / expired entry
+        """
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry and entry.expires_at > time.time():
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry.account
+            if entry:
+                self._evict(user_id)
+            self.misses += 1
+        return None
+
+    def put(self, user_id: str, private_key: str) -> LocalAccount:
+        """
+        Cache a signer for a user
+
+        Args:
+            user_id: User's database ID
+            private_key: Decrypted private key
+
+        Returns:
+            The LocalAccount
+        """
+        entry = _CachedSigner(private_key, self.ttl)
+        with self._lock:
+            if user_id in self._entries:
+                self._evict(user_id)
+            self._entries[user_id] = entry
+            while len(self._entries) > self.max_size:
+                self._evict(next(iter(self._entries)))
+        return entry.account
+
+    def get_key(self, user_id: str) -> Optional[str]:
+        """Cached private key (0x hex) for APIs that take a raw key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry and entry.expires_at > time.time():
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return "0x" + entry.key_material.hex()
+            if entry:
+                self._evict(user_id)
+            self.misses += 1
+        return None
+
+    def invalidate(self, user_id: str):
+        """Drop a user's signer (wallet created, imported or switched)"""
+        with self._lock:
+            if user_id in self._entries:
+                self._evict(user_id)
+
+    def purge_expired(self):
+        """Wipe every expired entry"""
+        now = time.time()
+        with self._lock:
+            for user_id in [u for u, e in self._entries.items() if e.expires_at <= now]:
+                self._evict(user_id)
+
+    def clear(self):
+        with self._lock:
+            for user_id in list(self._entries):
+                self._evict(user_id)
+
+    def _evict(self, user_id: str):
+        """Remove and wipe an entry (lock held)"""
+        entry = self._entries.pop(user_id)
+        entry.wipe()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
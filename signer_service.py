@@ -0,0 +1,247 @@
+"""
+Signer Service for Polymarket Trading Bot
+Runs CPU-bound ECDSA work - EIP-712 order signing and transaction signing - on a
+process pool so it doesn't compete with request handling for the GIL. Requests
+arriving within a few milliseconds of each other are coalesced into one pool
+task (one IPC round trip per batch instead of per signature)
+"""
+
+import os
+import queue
+import sys
+import threading
+import multiprocessing
+import multiprocessing.context
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import signer_worker
+from signer_worker import run_batch, run_job
+
+# Worker processes (0 disables the pool: everything signs on the calling thread)
+SIGNER_PROCESSES = int(os.environ.get('SIGNER_PROCESSES', str(max(1, (os.cpu_count() or 2) - 1))))
+
+# Max signatures per pool task, and how long to wait for more before submitting (seconds)
+SIGNER_BATCH_SIZE = 32
+SIGNER_BATCH_WINDOW = 0.002
+
+# Seconds a caller waits for a signature before giving up
+SIGNER_TIMEOUT = 30
+
+
+# ==================== WORKER PROCESSES ====================
+
+_launch_lock = threading.Lock()
+
+
+class _WorkerProcess(multiprocessing.context.SpawnProcess):
+    """
+    Spawned pool worker that boots from signer_worker instead of the parent's __main__
+
+    Spawn re-runs the parent's main module in every child (as __mp_main__); when the
+    server is started with `python api_server.py` that is the whole API server -
+    database clients, managers, background threads. The preparation data for the
+    child is read from sys.modules['__main__'] while the process launches, so the
+    minimal worker module stands in for it just for that moment
+    """
+
+    @staticmethod
+    def _Popen(process_obj):
+        with _launch_lock:
+            parent_main = sys.modules["__main__"]
+            sys.modules["__main__"] = signer_worker
+            try:
+                return multiprocessing.context.SpawnProcess._Popen(process_obj)
+            finally:
+                sys.modules["__main__"] = parent_main
+
+
+class _WorkerContext(multiprocessing.context.SpawnContext):
+    """Spawn context whose processes are _WorkerProcess"""
+    Process = _WorkerProcess
+
+
+# ==================== CALLER SIDE ====================
+
+class SignerService:
+    """
+    Process-pool signer with request coalescing
+    """
+
+    def __init__(self, processes: int = SIGNER_PROCESSES):
+        """
+        Initialize the service (the pool spawns lazily on first use)
+
+        Args:
+            processes: Worker processes (0 = sign on the calling thread)
+        """
+        self.processes = processes
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._queue: "queue.Queue[Tuple[Tuple, Future]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._dispatcher = None
+
+        self.signed = 0
+        self.batches = 0
+        self.failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.processes > 0
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._executor is not None:
+                return
+            # spawn, not fork: the API process runs many threads and forking them is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=_WorkerContext()
+            )
+            self._dispatcher = threading.Thread(target=self._dispatch, name="signer-dispatch", daemon=True)
+            self._dispatcher.start()
+            print(f"[SIGNER] Signer service started ({self.processes} processes)")
+
+    # ==================== BATCHING ====================
+
+    def _dispatch(self):
+        """Collect queued jobs into batches and submit each batch as one pool task"""
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            while len(batch) < SIGNER_BATCH_SIZE:
+                try:
+                    item = self._queue.get(timeout=SIGNER_BATCH_WINDOW)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+            self._submit(batch)
+
+    def _submit(self, batch: List[Tuple[Tuple, Future]]):
+        jobs = [job for job, _ in batch]
+        futures = [future for _, future in batch]
+        self.batches += 1
+
+        try:
+            pool_future = self._executor.submit(run_batch, jobs)
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+
+        def resolve(done):
+            try:
+                results = done.result()
+            except Exception as e:
+                self.failures += len(futures)
+                for future in futures:
+                    future.set_exception(e)
+                return
+            for future, (ok, value) in zip(futures, results):
+                if ok:
+                    self.signed += 1
+                    future.set_result(value)
+                else:
+                    self.failures += 1
+                    future.set_exception(RuntimeError(value))
+
+        pool_future.add_done_callback(resolve)
+
+    def submit(self, job: Tuple) -> Future:
+        """
+        Queue a signing job
+
+        Args:
+            job: ("order", key, chain_id, sig_type, funder, OrderArgs, CreateOrderOptions)
+                 or ("tx", key, transaction dict)
+
+        Returns:
+            Future resolving to a SignedOrder / raw transaction bytes
+        """
+        if not self.enabled:
+            future = Future()
+            try:
+                future.set_result(run_job(job))
+                self.signed += 1
+            except Exception as e:
+                self.failures += 1
+                future.set_exception(e)
+            return future
+
+        self._ensure_started()
+        future = Future()
+        self._queue.put((job, future))
+        return future
+
+    # ==================== PUBLIC API ====================
+
+    def sign_order(self, order_client, order_args, options):
+        """
+        Sign a CLOB order off-thread with the client's key / signature type / funder
+
+        Args:
+            order_client: Authenticated ClobClient for the wallet
+            order_args: OrderArgs (price already rounded, fee_rate_bps set)
+            options: CreateOrderOptions (tick size + neg-risk)
+
+        Returns:
+            SignedOrder ready for post_order
+        """
+        builder = order_client.builder
+        job = ("order", order_client.signer.private_key, order_client.chain_id,
+               builder.sig_type, builder.funder, order_args, options)
+        return self.submit(job).result(timeout=SIGNER_TIMEOUT)
+
+    def sign_transaction(self, transaction: Dict, private_key: str) -> bytes:
+        """
+        Sign a transaction off-thread
+
+        Args:
+            transaction: Complete transaction fields (nonce, fees, chainId...)
+            private_key: Sender's private key
+
+        Returns:
+            Raw signed transaction bytes
+        """
+        return self.submit(("tx", private_key, dict(transaction))).result(timeout=SIGNER_TIMEOUT)
+
+    def sign_batch(self, jobs: List[Tuple]) -> List[Future]:
+        """Queue many jobs at once (they share pool tasks)"""
+        return [self.submit(job) for job in jobs]
+
+    def stop(self):
+        """Shut the pool down"""
+        with self._lock:
+            if self._executor is None:
+                return
+            self._queue.put(None)
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict:
+        return {
+            "processes": self.processes,
+            "signed": self.signed,
+            "batches": self.batches,
+            "failures": self.failures,
+            "queued": self._queue.qsize()
+        }
+
+
+_service: Optional[SignerService] = None
+_service_lock = threading.Lock()
+
+
+def get_signer_service() -> SignerService:
+    """Process-wide signer service (created on first use)"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = SignerService()
+        return _service
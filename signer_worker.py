@@ -0,0 +1,75 @@
+"""
+Signer Worker for Polymarket Trading Bot
+Worker side of the signer service: the code that runs inside the pool processes.
+Kept minimal on purpose - workers start from this module instead of re-running the
+API server's __main__, so importing it must not open connections or start threads
+"""
+
+import time
+from collections import OrderedDict
+from typing import List, Tuple
+
+from signer_cache import SIGNER_CACHE_TTL
+
+# Max order builders cached per worker
+WORKER_BUILDER_CACHE_SIZE = 256
+
+
+# Per-process cache: building a Signer/OrderBuilder derives the address (an EC multiplication).
+# Keys hold raw private keys, so entries live no longer than the API process's signer cache
+# (SIGNER_CACHE_TTL) - a key evicted there doesn't linger in the workers
+_builders: "OrderedDict[Tuple, Tuple[object, float]]" = OrderedDict()
+
+
+def _purge_expired(now: float):
+    """Drop expired builders (oldest first, so stop at the first live one)"""
+    while _builders:
+        key, (_, expires_at) = next(iter(_builders.items()))
+        if expires_at > now:
+            return
+        del _builders[key]
+
+
+def _order_builder(private_key: str, chain_id: int, sig_type, funder):
+    now = time.time()
+    _purge_expired(now)
+
+    key = (private_key, chain_id, sig_type, funder)
+    entry = _builders.get(key)
+    if entry is not None:
+        return entry[0]
+
+    from py_clob_client.signer import Signer
+    from py_clob_client.order_builder.builder import OrderBuilder
+    builder = OrderBuilder(Signer(private_key, chain_id), sig_type=sig_type, funder=funder)
+
+    # Insertion order == expiry order (fixed TTL from creation)
+    _builders[key] = (builder, now + SIGNER_CACHE_TTL)
+    while len(_builders) > WORKER_BUILDER_CACHE_SIZE:
+        _builders.popitem(last=False)
+    return builder
+
+
+def run_job(job: Tuple):
+    """Execute one signing job: ("order", ...) or ("tx", ...)"""
+    kind = job[0]
+    if kind == "order":
+        _, private_key, chain_id, sig_type, funder, order_args, options = job
+        return _order_builder(private_key, chain_id, sig_type, funder).create_order(order_args, options)
+    if kind == "tx":
+        from eth_account import Account
+        _, private_key, transaction = job
+        signed = Account.sign_transaction(transaction, private_key)
+        return bytes(signed.raw_transaction)
+    raise ValueError(f"Unknown signing job: {kind}")
+
+
+def run_batch(jobs: List[Tuple]) -> List[Tuple[bool, object]]:
+    """Execute a batch; each result is (ok, value-or-error message)"""
+    results = []
+    for job in jobs:
+        try:
+            results.append((True, run_job(job)))
+        except Exception as e:
+            results.append((False, f"{type(e).__name__}: {e}"))
+    return results
@@ -0,0 +1,78 @@
+"""FundingWatcher deposit detection against fake chain reads"""
+
+from funding_watcher import FundingWatcher
+
+ADDRESS = "0x" + "2" * 40
+
+
+class FakeBlockchain:
+    def __init__(self):
+        self.pol_wei = 10 ** 18
+        self.usdc_raw = 5 * 10 ** 6
+
+    def get_balances_batch(self, addresses):
+        return {a: {"pol_wei": self.pol_wei, "usdc_raw": self.usdc_raw, "allowance_raw": 0} for a in addresses}
+
+    def get_all_balances(self, address):
+        return {"pol": self.pol_wei / 10 ** 18, "usdc": self.usdc_raw / 10 ** 6}
+
+
+class FakeBlockWatcher:
+    def add_listener(self, listener):
+        self.listener = listener
+
+
+class FakeLogIndexer:
+    def __init__(self, live):
+        self.live = live
+
+    def add_listener(self, listener):
+        self.listener = listener
+
+    def track(self, addresses):
+        pass
+
+    def is_live(self):
+        return self.live
+
+
+def make_watcher(live):
+    blockchain, blocks, indexer = FakeBlockchain(), FakeBlockWatcher(), FakeLogIndexer(live)
+    return FundingWatcher(blockchain, blocks, indexer), blockchain, blocks, indexer
+
+
+def test_usdc_balance_increase_resolves_while_indexer_is_down():
+    watcher, blockchain, blocks, _ = make_watcher(live=False)
+    wait = watcher.watch(ADDRESS, min_usdc=10)
+
+    blockchain.usdc_raw += 4 * 10 ** 6
+    blocks.listener(100)
+    assert wait.status == "waiting"
+
+    blockchain.usdc_raw += 6 * 10 ** 6
+    blocks.listener(103)
+    assert wait.status == "funded"
+    assert wait.result["usdc_received"] == 10
+
+
+def test_usdc_is_left_to_the_indexer_while_it_is_live():
+    watcher, blockchain, blocks, indexer = make_watcher(live=True)
+    wait = watcher.watch(ADDRESS)
+
+    blockchain.usdc_raw += 10 ** 6
+    blocks.listener(100)
+    assert wait.status == "waiting"
+
+    indexer.listener({"type": "transfer", "direction": "in", "address": ADDRESS.lower(), "value": 10 ** 6})
+    assert wait.status == "funded"
+    assert len(wait.result["deposits"]) == 1
+
+
+def test_pol_increase_resolves():
+    watcher, blockchain, blocks, _ = make_watcher(live=True)
+    wait = watcher.watch(ADDRESS, min_pol=0.5)
+
+    blockchain.pol_wei += 10 ** 18
+    blocks.listener(100)
+    assert wait.status == "funded"
+    assert wait.result["matic_received"] == 1.0
@@ -0,0 +1,41 @@
+"""KeyVault encryption, legacy reads and the no-master-key refusal"""
+
+import base64
+
+import pytest
+from cryptography.fernet import Fernet
+
+from key_vault import KeyVault, VAULT_PREFIX
+
+PRIVATE_KEY = "0x" + "ab" * 32
+LEGACY = base64.b64encode(PRIVATE_KEY.encode()).decode()
+
+
+def test_round_trip_with_master_key():
+    vault = KeyVault(Fernet.generate_key().decode())
+    stored = vault.encrypt(PRIVATE_KEY)
+    assert stored.startswith(VAULT_PREFIX)
+    assert PRIVATE_KEY not in stored
+    assert vault.decrypt(stored) == PRIVATE_KEY
+
+
+def test_refuses_to_store_without_master_key():
+    with pytest.raises(ValueError):
+        KeyVault(None).encrypt(PRIVATE_KEY)
+
+
+def test_legacy_base64_stays_readable_and_is_upgraded():
+    assert KeyVault(None).decrypt(LEGACY) == PRIVATE_KEY
+    assert not KeyVault(None).needs_upgrade(LEGACY)
+
+    vault = KeyVault(Fernet.generate_key().decode())
+    assert vault.decrypt(LEGACY) == PRIVATE_KEY
+    assert vault.needs_upgrade(LEGACY)
+
+
+def test_wrong_master_key_is_rejected():
+    stored = KeyVault(Fernet.generate_key().decode()).encrypt(PRIVATE_KEY)
+    with pytest.raises(ValueError):
+        KeyVault(Fernet.generate_key().decode()).decrypt(stored)
+    with pytest.raises(ValueError):
+        KeyVault(None).decrypt(stored)
@@ -0,0 +1,77 @@
+"""NodeServiceClient retry policy against a local stub server"""
+
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+import requests
+
+import node_service_client
+from node_service_client import NodeServiceClient, never_sent
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(node_service_client, "NODE_SERVICE_BACKOFF", 0)
+
+
+@pytest.fixture
+def stub_server():
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            hits.append(self.path)
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", hits
+    server.shutdown()
+    server.server_close()
+
+
+def closed_port_url() -> str:
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return f"http://127.0.0.1:{port}"
+
+
+def test_refused_connection_is_retried_once_per_attempt_on_any_endpoint():
+    client = NodeServiceClient(closed_port_url(), socket_path=None, retries=2)
+    with pytest.raises(requests.exceptions.ConnectionError) as info:
+        client.post("/create-order", {})
+
+    assert never_sent(info.value)
+    assert client.stats()["requests"] == 3      # no extra urllib3-level retries underneath
+    assert client.stats()["failures"] == 1
+
+
+def test_missing_unix_socket_counts_as_never_sent(tmp_path):
+    client = NodeServiceClient("http://localhost", socket_path=str(tmp_path / "missing.sock"), retries=1)
+    with pytest.raises(requests.exceptions.ConnectionError) as info:
+        client.post("/deploy-safe", {})
+
+    assert never_sent(info.value)
+    assert client.stats()["requests"] == 2
+
+
+def test_5xx_is_only_retried_on_idempotent_endpoints(stub_server):
+    url, hits = stub_server
+    client = NodeServiceClient(url, socket_path=None, retries=2)
+
+    assert client.post("/create-order", {}).status_code == 503
+    assert hits == ["/create-order"]
+
+    assert client.post("/get-orders-batch", {}).status_code == 503
+    assert hits.count("/get-orders-batch") == 3
+    assert client.stats()["retried"] == 2
@@ -0,0 +1,100 @@
+"""NonceManager reservation, release and gap handling against a fake chain"""
+
+import pytest
+
+from nonce_manager import NonceManager
+
+ADDRESS = "0x" + "1" * 40
+
+
+class FakeEth:
+    def __init__(self, pending_nonce):
+        self.pending_nonce = pending_nonce
+        self.reads = 0
+
+    def get_transaction_count(self, address, block_identifier):
+        assert block_identifier == 'pending'
+        self.reads += 1
+        return self.pending_nonce
+
+
+class FakeWeb3:
+    def __init__(self, pending_nonce=5):
+        self.eth = FakeEth(pending_nonce)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return NonceManager(FakeWeb3(5), path=str(tmp_path / "nonces.json"))
+
+
+def test_reserves_sequentially_with_one_chain_read(manager):
+    assert [manager.reserve(ADDRESS) for _ in range(3)] == [5, 6, 7]
+    assert manager.w3.eth.reads == 1
+
+
+def test_releasing_the_last_nonce_rolls_back(manager):
+    nonce = manager.reserve(ADDRESS)
+    manager.release(ADDRESS, nonce, RuntimeError("insufficient funds"))
+    assert manager.reserve(ADDRESS) == nonce
+    assert manager.w3.eth.reads == 1
+
+
+def test_released_middle_nonce_is_reused_without_clobbering_later_ones(manager):
+    first, middle, last = (manager.reserve(ADDRESS) for _ in range(3))
+    manager.release(ADDRESS, middle, RuntimeError("insufficient funds"))
+
+    # The gap is filled first, then numbering continues after the in-flight nonce
+    assert manager.reserve(ADDRESS) == middle
+    assert manager.reserve(ADDRESS) == last + 1
+    assert manager.w3.eth.reads == 1
+
+
+def test_rollback_collapses_gaps_below_the_released_nonce(manager):
+    a, b, c = (manager.reserve(ADDRESS) for _ in range(3))
+    manager.release(ADDRESS, b)
+    manager.release(ADDRESS, c)
+    assert manager.reserve(ADDRESS) == b
+    assert manager.reserve(ADDRESS) == c
+
+
+def test_resync_keeps_unbroadcast_reservations_above_the_chain(manager):
+    a, b, c, d = (manager.reserve(ADDRESS) for _ in range(4))   # 5..8, none broadcast yet
+    manager.mark_sent(ADDRESS, a, "0xa")
+
+    # b is rejected as a nonce error; c and d are still in flight on other threads
+    manager.release(ADDRESS, b, ValueError("nonce too high"))
+    manager.w3.eth.pending_nonce = 6                            # chain has seen a
+
+    # Only the hole is refilled, then numbering continues after d
+    assert manager.reserve(ADDRESS) == b
+    assert manager.reserve(ADDRESS) == d + 1
+    assert manager.w3.eth.reads == 2
+
+
+def test_resync_drops_nonces_the_chain_already_covers(manager):
+    nonce = manager.reserve(ADDRESS)
+    manager.mark_sent(ADDRESS, nonce, "0xabc")
+    manager.w3.eth.pending_nonce = 9                            # other senders moved the chain on
+    manager.resync(ADDRESS)
+
+    assert manager.reserve(ADDRESS) == 9
+    assert nonce not in manager.get_pending(ADDRESS)
+
+
+def test_already_known_is_not_a_nonce_error():
+    error = ValueError("already known")
+    assert NonceManager.is_already_known(error)
+    assert not NonceManager.is_nonce_error(error)
+    assert NonceManager.is_nonce_error(ValueError("nonce too low: next nonce 7"))
+
+
+def test_restart_keeps_only_broadcast_reservations(tmp_path):
+    path = str(tmp_path / "nonces.json")
+    manager = NonceManager(FakeWeb3(5), path=path)
+    sent, unsent = manager.reserve(ADDRESS), manager.reserve(ADDRESS)
+    manager.mark_sent(ADDRESS, sent, "0xsent")
+
+    restarted = NonceManager(FakeWeb3(5), path=path)
+    assert list(restarted.get_pending(ADDRESS)) == [sent]
+    assert restarted.reserve(ADDRESS) == unsent
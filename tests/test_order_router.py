@@ -0,0 +1,145 @@
+"""OrderRouter route ranking, failover and idempotency with fake order paths"""
+
+import time
+
+from order_router import OrderRouter, ROUTE_BUILDER, ROUTE_CLOB
+
+SAFE = "0x" + "5" * 40
+
+
+class FakeTrading:
+    def __init__(self, results=None, delay=0.0):
+        self.results = list(results or [])
+        self.delay = delay
+        self.calls = []
+        self.cancelled = []
+
+    def quote_market_order(self, token_id, side, amount, condition_id):
+        return {"success": True, "order_side": "BUY", "price": 0.5, "size": amount / 0.5}
+
+    def create_market_order(self, **kwargs):
+        self.calls.append(kwargs)
+        time.sleep(self.delay)
+        result = self.results.pop(0) if self.results else {"success": True, "order_id": "clob-1"}
+        return dict(result, wallet_address=kwargs.get("funder") or "0xeoa")
+
+    def get_order_client(self, private_key, funder=None):
+        trading = self
+
+        class Client:
+            def cancel(self, order_id):
+                trading.cancelled.append((order_id, funder))
+        return Client()
+
+
+class FakeBuilder:
+    def __init__(self, results=None, delay=0.0):
+        self.results = list(results or [])
+        self.delay = delay
+        self.calls = []
+        self.cancelled = []
+
+    def create_order(self, **kwargs):
+        self.calls.append(kwargs)
+        time.sleep(self.delay)
+        return self.results.pop(0) if self.results else {"success": True, "orderID": "builder-1"}
+
+    def cancel_order(self, private_key, safe_address, order_id):
+        self.cancelled.append(order_id)
+
+
+def place(router, **kwargs):
+    return router.place_market_order("0xkey", "token", "YES", 10, "cond", **kwargs)
+
+
+def test_eoa_orders_only_use_the_clob_path():
+    router = OrderRouter(FakeTrading(), FakeBuilder())
+    assert router.rank_routes(None) == [ROUTE_CLOB]
+
+
+def test_safe_orders_rank_both_paths_by_latency():
+    router = OrderRouter(FakeTrading(), FakeBuilder())
+    for _ in range(5):
+        router.stats[ROUTE_BUILDER].record(0.9, True)
+        router.stats[ROUTE_CLOB].record(0.1, True)
+    assert router.rank_routes(SAFE) == [ROUTE_CLOB, ROUTE_BUILDER]
+
+
+def test_unhealthy_path_ranks_last():
+    router = OrderRouter(FakeTrading(), FakeBuilder())
+    for _ in range(5):
+        router.stats[ROUTE_CLOB].record(0.01, False)
+        router.stats[ROUTE_BUILDER].record(0.9, True)
+    assert router.rank_routes(SAFE) == [ROUTE_BUILDER, ROUTE_CLOB]
+
+
+def test_safe_without_builder_trades_through_clob_for_the_safe():
+    trading = FakeTrading()
+    router = OrderRouter(trading, None)
+    result = place(router, safe_address=SAFE)
+    assert result["success"] and result["route"] == ROUTE_CLOB
+    assert trading.calls[0]["funder"] == SAFE
+
+
+def test_fails_over_when_primary_never_sent():
+    trading = FakeTrading()
+    builder = FakeBuilder([{"success": False, "error": "refused", "error_type": "ConnectTimeout"}])
+    router = OrderRouter(trading, builder)
+    router.stats[ROUTE_CLOB].record(5.0, True)  # builder ranks first
+
+    result = place(router, safe_address=SAFE)
+    assert result["success"] and result["route"] == ROUTE_CLOB
+    assert trading.calls[0]["funder"] == SAFE
+
+
+def test_no_failover_when_order_may_have_been_sent():
+    trading = FakeTrading()
+    builder = FakeBuilder([{"success": False, "error": "reset", "error_type": "ConnectionError"}])
+    router = OrderRouter(trading, builder)
+    router.stats[ROUTE_CLOB].record(5.0, True)
+
+    result = place(router, safe_address=SAFE)
+    assert not result["success"] and result["route"] == ROUTE_BUILDER
+    assert trading.calls == []
+
+
+def test_no_failover_on_exchange_rejection():
+    trading = FakeTrading([{"success": False, "error": "not enough balance"}])
+    builder = FakeBuilder()
+    router = OrderRouter(trading, builder)
+    router.stats[ROUTE_BUILDER].record(5.0, True)  # clob ranks first
+
+    result = place(router, safe_address=SAFE)
+    assert not result["success"] and builder.calls == []
+    # Rejections don't count against the path's health
+    assert router.stats[ROUTE_CLOB].error_rate() == 0.0
+
+
+def test_hedge_cancels_the_slower_duplicate():
+    trading = FakeTrading(delay=0.3)
+    builder = FakeBuilder()
+    router = OrderRouter(trading, builder, hedge_after=0.05)
+    router.stats[ROUTE_BUILDER].record(5.0, True)  # clob ranks first but is slow
+
+    result = place(router, safe_address=SAFE)
+    assert result["success"] and result["route"] == ROUTE_BUILDER
+
+    deadline = time.time() + 2
+    while not trading.cancelled and time.time() < deadline:
+        time.sleep(0.01)
+    assert trading.cancelled == [("clob-1", SAFE)]
+
+
+def test_idempotency_returns_first_success_and_retries_failures():
+    trading = FakeTrading([{"success": False, "error": "rejected"}])
+    router = OrderRouter(trading, None)
+
+    assert not place(router, idempotency_key="k", user_id="u")["success"]
+    first = place(router, idempotency_key="k", user_id="u")
+    assert first["success"]
+    assert place(router, idempotency_key="k", user_id="u")["order_id"] == first["order_id"]
+    assert len(trading.calls) == 2
+
+    # Same key from another user is a different order
+    place(router, idempotency_key="k", user_id="other")
+    assert len(trading.calls) == 3
@@ -0,0 +1,105 @@
+"""RestingOrderBook cancel/replace with a fake trading client"""
+
+from resting_orders import RestingOrderBook
+
+WALLET = "0x" + "a" * 40
+
+
+class FakeClient:
+    def __init__(self, size_matched="0", fail=False):
+        self.size_matched = size_matched
+        self.fail = fail
+
+    def get_order(self, order_id):
+        if self.fail:
+            raise RuntimeError("timeout")
+        return {"id": order_id, "size_matched": self.size_matched}
+
+
+class FakeTrading:
+    def __init__(self, client, cancel_ok=True):
+        self.client = client
+        self.cancel_ok = cancel_ok
+        self.posted = []
+
+    def get_cached_order_client(self, wallet_address):
+        return self.client if wallet_address == WALLET else None
+
+    def cancel_wallet_orders(self, wallet_address, order_ids):
+        if not self.cancel_ok:
+            return {"success": True, "canceled": [], "not_canceled": {order_ids[0]: "matched"}}
+        return {"success": True, "canceled": list(order_ids), "not_canceled": {}}
+
+    def post_limit_order(self, client, token_id, side, price, size, order_type, expiration):
+        self.posted.append({"price": price, "size": size})
+        return {
+            "success": True, "order_id": f"new-{len(self.posted)}", "wallet_address": WALLET,
+            "token_id": token_id, "side": side, "price": price, "size": size, "order_type": order_type
+        }
+
+    def get_token_metadata(self, token_id):
+        return {"tick_size": 0.01}
+
+
+class FakeTracker:
+    """Tracker that hasn't polled since the order was placed"""
+
+    def __init__(self):
+        self.tracked = []
+
+    def get_order(self, order_id):
+        return {"status": "live", "size_matched": 0.0}
+
+    def track(self, order_id, **fields):
+        self.tracked.append(order_id)
+
+
+def make_book(client, **kwargs):
+    book = RestingOrderBook(FakeTrading(client, **kwargs), FakeTracker())
+    book._add({
+        "order_id": "old", "wallet_address": WALLET, "token_id": "tok", "side": "BUY",
+        "price": 0.40, "size": 100.0, "order_type": "GTC"
+    }, "user", peg=True, peg_limit=0.45)
+    return book
+
+
+def test_replace_reposts_remainder_from_final_fills_not_tracker():
+    book = make_book(FakeClient(size_matched="30"))
+    assert book._replace(book.get_order("old"), 0.42)
+
+    assert book.trading.posted == [{"price": 0.42, "size": 70.0}]
+    assert book.get_order("old") is None
+    replacement = book.get_order("new-1")
+    assert replacement["peg"] and replacement["peg_limit"] == 0.45
+
+
+def test_replace_does_not_repost_a_fully_filled_order():
+    book = make_book(FakeClient(size_matched="100"))
+    assert not book._replace(book.get_order("old"), 0.42)
+    assert book.trading.posted == []
+
+
+def test_replace_does_not_repost_when_fills_are_unknown():
+    book = make_book(FakeClient(fail=True))
+    assert not book._replace(book.get_order("old"), 0.42)
+    assert book.trading.posted == []
+
+
+def test_replace_keeps_order_when_cancel_fails():
+    book = make_book(FakeClient(), cancel_ok=False)
+    assert not book._replace(book.get_order("old"), 0.42)
+    assert book.get_order("old") is not None
+    assert book.trading.posted == []
+
+
+def test_reprice_caps_target_at_peg_limit():
+    book = make_book(FakeClient())
+    with book._lock:
+        book._books["tok"] = {"best_bid": 0.60, "best_ask": 0.61}
+    assert book.reprice() == 1
+    assert book.trading.posted[0]["price"] == 0.45
+
+    # At the cap: no further replacement
+    with book._lock:
+        book._books["tok"] = {"best_bid": 0.70, "best_ask": 0.71}
+    assert book.reprice() == 0
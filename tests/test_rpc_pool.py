@@ -0,0 +1,101 @@
+"""RpcPool routing, failover and broadcast safety with fake providers"""
+
+import socket
+
+import pytest
+import requests
+
+from rpc_pool import BroadcastUncertainError, PooledHTTPProvider, RpcPool
+
+RAW_TX = "0x02f8"
+
+
+class FakeProvider:
+    def __init__(self, error: Exception = None, result="0x1"):
+        self.error = error
+        self.result = result
+        self.calls = []
+
+    def make_request(self, method, params):
+        self.calls.append(method)
+        if self.error:
+            raise self.error
+        return {"jsonrpc": "2.0", "id": 1, "result": self.result}
+
+
+def make_pool(*providers):
+    pool = RpcPool([f"http://rpc{i}.test" for i in range(len(providers))])
+    for endpoint, provider in zip(pool.endpoints, providers):
+        endpoint.provider = provider
+    return pool
+
+
+def closed_port_url() -> str:
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return f"http://127.0.0.1:{port}"
+
+
+def test_reads_fail_over_on_any_transport_error():
+    down, up = FakeProvider(requests.exceptions.ReadTimeout("slow")), FakeProvider(result="0xabc")
+    pool = make_pool(down, up)
+
+    assert pool.request("eth_call", [{}, "latest"])["result"] == "0xabc"
+    assert down.calls == ["eth_call"] and up.calls == ["eth_call"]
+    assert pool.endpoints[0].consecutive_failures == 1
+
+
+def test_json_rpc_errors_are_not_failed_over():
+    reverted = FakeProvider()
+    reverted.make_request = lambda method, params: {"jsonrpc": "2.0", "id": 1, "error": {"message": "execution reverted"}}
+    other = FakeProvider()
+    pool = make_pool(reverted, other)
+
+    assert "error" in pool.request("eth_call", [{}, "latest"])
+    assert other.calls == []
+
+
+def test_broadcast_read_timeout_is_uncertain_and_not_resent():
+    timed_out, other = FakeProvider(requests.exceptions.ReadTimeout("slow")), FakeProvider()
+    pool = make_pool(timed_out, other)
+
+    with pytest.raises(BroadcastUncertainError):
+        pool.request("eth_sendRawTransaction", [RAW_TX])
+    assert other.calls == []
+
+
+def test_broadcast_fails_over_when_the_connection_was_never_made():
+    unreachable, other = FakeProvider(requests.exceptions.ConnectTimeout("no route")), FakeProvider(result="0xhash")
+    pool = make_pool(unreachable, other)
+
+    assert pool.request("eth_sendRawTransaction", [RAW_TX])["result"] == "0xhash"
+
+
+def test_refused_connection_on_a_real_provider_counts_as_never_sent():
+    pool = RpcPool([closed_port_url(), "http://rpc1.test"], timeout=2)
+    other = FakeProvider(result="0xhash")
+    pool.endpoints[1].provider = other
+
+    assert pool.request("eth_sendRawTransaction", [RAW_TX])["result"] == "0xhash"
+    assert other.calls == ["eth_sendRawTransaction"]
+
+
+def test_all_endpoints_down_raises_connection_error():
+    pool = make_pool(*(FakeProvider(requests.exceptions.ConnectTimeout("down")) for _ in range(2)))
+    with pytest.raises(ConnectionError):
+        pool.request("eth_blockNumber", [])
+
+
+def test_benched_and_lagging_endpoints_rank_last():
+    pool = make_pool(FakeProvider(), FakeProvider(), FakeProvider())
+    failing, lagging, good = pool.endpoints
+
+    for _ in range(3):
+        failing.record(0.01, False, RuntimeError("boom"))
+    lagging.block_number, good.block_number = 100, 110
+
+    assert pool.ranked()[0] is good
+    assert set(pool.ranked()[1:]) == {failing, lagging}
+    assert PooledHTTPProvider(pool).is_connected()
@@ -0,0 +1,42 @@
+"""CREATE2 Safe address derivation"""
+
+import pytest
+from eth_utils import keccak
+
+from safe_address import create2_address, derive_safe_address
+
+# EIP-1014 reference vectors: (deployer, salt, init code, address)
+EIP1014_VECTORS = [
+    ("0x0000000000000000000000000000000000000000", "00" * 32, "0x00",
+     "0x4D1A2e2bB4F88F0250f26Ffff098B0b30B26BF38"),
+    ("0xdeadbeef00000000000000000000000000000000", "00" * 32, "0x00",
+     "0xB928f69Bb1D91Cd65274e3c79d8986362984fDA3"),
+    ("0xdeadbeef00000000000000000000000000000000", "000000000000000000000000feed" + "00" * 18, "0x00",
+     "0xD04116cDd17beBE565EB2422F2497E06cC1C9833"),
+    ("0x0000000000000000000000000000000000000000", "00" * 32, "0xdeadbeef",
+     "0x70f2b2914A2a4b783FaEFb75f459A580616Fcb5e"),
+    ("0x00000000000000000000000000000000deadbeef", "00" * 28 + "cafebabe", "0xdeadbeef",
+     "0x60f3f640a8508fC6a86d45DF051962668E1e8AC7"),
+    ("0x00000000000000000000000000000000deadbeef", "00" * 28 + "cafebabe", "0x" + "deadbeef" * 11,
+     "0x1d8bfDC5D46DC4f61D6b6115972536eBE6A8854C"),
+    ("0x0000000000000000000000000000000000000000", "00" * 32, "0x",
+     "0xE33C0C7F7df4809055C3ebA6c09CFe4BaF1BD9e0"),
+]
+
+# Owner of private key 0x...01 and its Safe under the Polymarket factory / init code hash
+OWNER = "0x7E5F4552091A69125d5DfCb7b8C2659029395Bdf"
+OWNER_SAFE = "0x51b7C68A71dCcBc0b7FA4400934a293D8f4d3Ba8"
+
+
+@pytest.mark.parametrize("deployer,salt,init_code,expected", EIP1014_VECTORS)
+def test_create2_matches_eip1014_vectors(deployer, salt, init_code, expected):
+    init_code_hash = "0x" + keccak(hexstr=init_code).hex()
+    assert create2_address(deployer, bytes.fromhex(salt), init_code_hash) == expected
+
+
+def test_safe_address_for_known_owner():
+    assert derive_safe_address(OWNER) == OWNER_SAFE
+
+
+def test_owner_case_does_not_matter():
+    assert derive_safe_address(OWNER.lower()) == derive_safe_address(OWNER.upper().replace("0X", "0x"))
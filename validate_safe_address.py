@@ -0,0 +1,53 @@
+"""
+Safe Address Validation for Polymarket Trading Bot
+Checks the local CREATE2 Safe address calculation (safe_address.py) against the
+Node service's derivation for random owner keys, and times both
+
+Usage:
+    python validate_safe_address.py [--keys 20]
+    (needs the Node service at POLYMARKET_NODE_SERVICE_URL / POLYMARKET_NODE_SERVICE_SOCKET)
+"""
+
+import argparse
+import secrets
+import sys
+import time
+
+from eth_account import Account
+
+from polymarket_builder import PolymarketBuilder
+from safe_address import derive_safe_address
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate local Safe address derivation against the Node service")
+    parser.add_argument("--keys", type=int, default=20)
+    args = parser.parse_args()
+
+    keys = ["0x" + secrets.token_hex(32) for _ in range(args.keys)]
+    owners = [Account.from_key(k).address for k in keys]
+
+    started = time.perf_counter()
+    local = [derive_safe_address(o) for o in owners]
+    local_us = (time.perf_counter() - started) / len(owners) * 1e6
+
+    started = time.perf_counter()
+    remote = PolymarketBuilder().get_safe_addresses(keys)
+    remote_ms = (time.perf_counter() - started) / len(owners) * 1000
+
+    mismatches = 0
+    for owner, expected, result in zip(owners, local, remote['results']):
+        if not result.get('success'):
+            print(f"[VALIDATE] {owner}: service error: {result.get('error')}")
+            mismatches += 1
+        elif result['safeAddress'].lower() != expected.lower():
+            print(f"[VALIDATE] MISMATCH {owner}: local {expected} != service {result['safeAddress']}")
+            mismatches += 1
+
+    print(f"[VALIDATE] {len(owners) - mismatches}/{len(owners)} match "
+          f"(local {local_us:.1f} us/address, service {remote_ms:.1f} ms/address)")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,17 +5,35 @@ WITH REAL BLOCKCHAIN INTEGRATION & PRIVATE KEY EXPORT
 ✨ NOW WITH SAFE WALLET SUPPORT VIA POLYMARKET NODE.JS SERVICE
 """
 
+import os
 import secrets
 import json
-import base64
-import requests
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from mongodb_database import MongoDatabase
 from blockchain_manager import BlockchainManager
+from wallet_pool import WalletPool
+from key_vault import KeyVault
+from signer_cache import SignerCache
+from wallet_repository import WalletRepository
+from node_service_client import get_node_service_client
+from safe_address import derive_safe_address
+
+# Overall time budget for a multi-wallet balance read before stale results are returned (seconds)
+BALANCE_READ_DEADLINE = float(os.environ.get('BALANCE_READ_DEADLINE', '3'))
+
+# Threads for concurrent per-wallet balance reads (per call)
+BALANCE_FANOUT_WORKERS = 8
+
+# Last known balances served (flagged stale) when a read misses its deadline:
+# how long one stays usable (seconds) and how many addresses are remembered
+BALANCE_LAST_KNOWN_TTL = float(os.environ.get('BALANCE_LAST_KNOWN_TTL', '3600'))
+BALANCE_LAST_KNOWN_SIZE = int(os.environ.get('BALANCE_LAST_KNOWN_SIZE', '10000'))
 
-# Polymarket Node.js Service URL
-POLYMARKET_SERVICE_URL = "http://localhost:3001"
 
 class WalletManager:
     """
@@ -39,6 +57,23 @@ class WalletManager:
             print(f"[WALLET WARNING] Wallet creation will work but without balance checking")
             self.blockchain = None
 
+        # Authenticated encryption for stored keys + short-lived decrypted signers
+        self.vault = KeyVault()
+        self.signer_cache = SignerCache()
+
+        # Keep-alive pooled client for the Node.js service (Safe deployment / derivation)
+        self.node_service = get_node_service_client()
+
+        # Indexed queries against the wallets collection
+        self.wallet_repo = WalletRepository(db)
+
+        # Last good balance response per address (served flagged stale on timeout), LRU + TTL bounded
+        self._last_balances: "OrderedDict[str, tuple]" = OrderedDict()
+        self._last_balances_lock = threading.Lock()
+
+        # Pre-generated owner keys + Safe addresses for instant signup (filler started by the API server)
+        self.wallet_pool = WalletPool(db, self._encrypt_key, self._derive_safe_address, self._deploy_pool_safe)
+
         print("[WALLET] OK Wallet Manager initialized")
     
     # ==================== IN-APP WALLET CREATION ====================
@@ -63,8 +98,7 @@ class WalletManager:
             print(f"[WALLET] Creating in-app wallet for user: {user_id}")
 
             # CRITICAL FIX: Check if wallet already exists for this user
-            wallets_collection = self.db.db['wallets']
-            existing_wallet = wallets_collection.find_one({"user_id": user_id})
+            existing_wallet = self.wallet_repo.has_wallet(user_id)
 
             if existing_wallet:
                 print(f"[WALLET] Wallet already exists for user {user_id}")
@@ -130,13 +164,16 @@ class WalletManager:
             )
 
             # Store encrypted private key separately (more secure)
-            wallets_collection.insert_one({
+            self.db.wallets.insert_one({
                 "user_id": user_id,
                 "wallet_address": wallet_address,
                 "private_key_encrypted": encrypted_key
             })
 
             print(f"[WALLET] OK Wallet saved to database for user {user_id}")
+            if self.blockchain:
+                self.blockchain.log_indexer.track([wallet_address])
+            self.signer_cache.invalidate(user_id)
 
             return {
                 "success": True,
@@ -161,13 +198,15 @@ class WalletManager:
 
     # ==================== SAFE WALLET CREATION (GASLESS VIA POLYMARKET) ====================
 
-    def create_safe_wallet(self, user_id: str) -> Dict:
+    def create_safe_wallet(self, user_id: str, fallback_to_eoa: bool = True) -> Dict:
         """
         Create a Safe Wallet via Polymarket Node.js service (GASLESS!)
         This creates both an EOA (owner) and deploys a Safe Wallet
 
         Args:
             user_id: User's database ID
+            fallback_to_eoa: Use the owner EOA as the wallet if Safe deployment fails
+                             (False lets a caller retry the deployment instead)
 
         Returns:
             Dictionary with Safe wallet address and owner address
@@ -180,8 +219,7 @@ class WalletManager:
             print(f"[SAFE WALLET] Creating Safe Wallet for user: {user_id}")
 
             # Check if wallet already exists for this user
-            wallets_collection = self.db.db['wallets']
-            existing_wallet = wallets_collection.find_one({"user_id": user_id})
+            existing_wallet = self.wallet_repo.has_wallet(user_id)
 
             if existing_wallet:
                 print(f"[SAFE WALLET] Wallet already exists for user {user_id}")
@@ -194,6 +232,11 @@ class WalletManager:
                     "existing": True
                 }
 
+            # Fast path: claim a pre-generated owner key with its Safe address
+            pooled = self.assign_pooled_wallet(user_id)
+            if pooled.get('success'):
+                return pooled
+
             # Step 1: Create EOA (owner wallet)
             print(f"[SAFE WALLET] Creating EOA owner wallet...")
             private_key = "0x" + secrets.token_hex(32)
@@ -201,32 +244,26 @@ class WalletManager:
             owner_address = account.address
             print(f"[SAFE WALLET] Owner address created: {owner_address}")
 
+            # Encrypt the owner key before deploying anything (fails fast without a master key)
+            encrypted_key = self._encrypt_key(private_key)
+
             # Step 2: Deploy Safe Wallet via Polymarket Node.js service
             print(f"[SAFE WALLET] Deploying Safe Wallet via Polymarket service...")
             try:
-                response = requests.post(
-                    f"{POLYMARKET_SERVICE_URL}/deploy-safe",
-                    json={
-                        "privateKey": private_key,
-                        "ownerAddress": owner_address
-                    },
-                    timeout=30
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get('success'):
-                        safe_address = data['safeAddress']
-                        print(f"[SAFE WALLET] OK Safe deployed: {safe_address}")
-                        print(f"[SAFE WALLET] Owner: {owner_address}")
-                        print(f"[SAFE WALLET] Gasless: {data.get('gasless', True)}")
-                    else:
-                        raise Exception(f"Safe deployment failed: {data.get('error')}")
-                else:
-                    raise Exception(f"HTTP {response.status_code}: {response.text}")
+                safe_address = self._deploy_safe(private_key, owner_address)
+                if safe_address.lower() != derive_safe_address(owner_address).lower():
+                    print(f"[SAFE WALLET WARNING] Service address differs from local CREATE2 derivation "
+                          f"({derive_safe_address(owner_address)}) - check SAFE_FACTORY / SAFE_INIT_CODE_HASH")
+                print(f"[SAFE WALLET] Owner: {owner_address}")
 
             except Exception as e:
                 print(f"[SAFE WALLET ERROR] Failed to deploy Safe: {e}")
+                if not fallback_to_eoa:
+                    return {
+                        "success": False,
+                        "error": f"Safe deployment failed: {e}",
+                        "retryable": True
+                    }
                 # Fallback to regular EOA wallet if Safe deployment fails
                 print(f"[SAFE WALLET] Falling back to EOA wallet...")
                 safe_address = owner_address
@@ -248,9 +285,6 @@ class WalletManager:
                     "owner_address": owner_address
                 }
 
-            # Encrypt private key before storing
-            encrypted_key = self._encrypt_key(private_key)
-
             # Store wallet in database
             self.db.users.update_one(
                 {"_id": ObjectId(user_id)},
@@ -264,7 +298,7 @@ class WalletManager:
             )
 
             # Store encrypted private key separately (for the owner EOA)
-            wallets_collection.insert_one({
+            self.db.wallets.insert_one({
                 "user_id": user_id,
                 "wallet_address": safe_address,  # Safe address
                 "owner_address": owner_address,   # EOA owner
@@ -273,6 +307,9 @@ class WalletManager:
             })
 
             print(f"[SAFE WALLET] OK Safe Wallet saved to database for user {user_id}")
+            if self.blockchain:
+                self.blockchain.log_indexer.track([safe_address, owner_address])
+            self.signer_cache.invalidate(user_id)
 
             return {
                 "success": True,
@@ -297,27 +334,149 @@ class WalletManager:
                 "error_type": type(e).__name__
             }
 
+    def _deploy_safe(self, private_key: str, owner_address: str) -> str:
+        """
+        Deploy an owner's Safe through the Node.js service (gasless)
+
+        Args:
+            private_key: Owner's private key
+            owner_address: Owner EOA
+
+        Returns:
+            Deployed Safe address
+
+        Raises:
+            Exception: If the service doesn't deploy it
+        """
+        response = self.node_service.post(
+            "/deploy-safe",
+            {
+                "privateKey": private_key,
+                "ownerAddress": owner_address
+            }
+        )
+
+        if response.status_code != 200:
+            raise Exception(f"HTTP {response.status_code}: {response.text}")
+
+        data = response.json()
+        if not data.get('success'):
+            raise Exception(f"Safe deployment failed: {data.get('error')}")
+
+        print(f"[SAFE WALLET] OK Safe deployed: {data['safeAddress']} (gasless: {data.get('gasless', True)})")
+        return data['safeAddress']
+
+    # ==================== WALLET POOL ====================
+
+    def assign_pooled_wallet(self, user_id: str) -> Dict:
+        """
+        Give a user a pre-generated Safe wallet from the pool
+        (one atomic claim, then the usual user/wallet records)
+
+        Args:
+            user_id: User's database ID
+
+        Returns:
+            Same shape as create_safe_wallet; success False if the pool is empty
+        """
+        try:
+            from bson.objectid import ObjectId
+
+            pooled = self.wallet_pool.claim(user_id)
+            if not pooled:
+                return {
+                    "success": False,
+                    "error": "Wallet pool empty"
+                }
+
+            safe_address = pooled['safe_address']
+            owner_address = pooled['owner_address']
+
+            self.db.users.update_one(
+                {"_id": ObjectId(user_id)},
+                {
+                    "$set": {
+                        "wallet_address": safe_address,
+                        "wallet_type": "safe",
+                        "owner_address": owner_address,
+                        "wallet_status": "ready"
+                    }
+                }
+            )
+
+            self.db.wallets.insert_one({
+                "user_id": user_id,
+                "wallet_address": safe_address,
+                "owner_address": owner_address,
+                "wallet_type": "safe",
+                "private_key_encrypted": pooled['private_key_encrypted'],
+                "pooled": True
+            })
+
+            print(f"[WALLET POOL] OK Assigned Safe {safe_address} (owner {owner_address}) to user {user_id}")
+            if self.blockchain:
+                self.blockchain.log_indexer.track([safe_address, owner_address])
+            self.signer_cache.invalidate(user_id)
+
+            return {
+                "success": True,
+                "wallet_address": safe_address,
+                "owner_address": owner_address,
+                "wallet_type": "safe",
+                "gasless": True,
+                "pooled": True,
+                "message": "Safe Wallet deployed successfully with FREE GAS! ⛽"
+            }
+
+        except Exception as e:
+            print(f"[WALLET POOL ERROR] Could not assign pooled wallet to {user_id}: {e}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
+    def _deploy_pool_safe(self, private_key: str, owner_address: str) -> Optional[str]:
+        """Wallet pool filler callback: deploy a pooled owner's Safe (None on failure)"""
+        try:
+            return self._deploy_safe(private_key, owner_address)
+        except Exception as e:
+            print(f"[WALLET POOL WARNING] Safe deployment failed for {owner_address}: {e}")
+            return None
+
+    def _derive_safe_address(self, owner_address: str, private_key: str = None) -> Optional[str]:
+        """
+        Counterfactual Safe address for an owner (local CREATE2 computation, no service call)
+
+        Args:
+            owner_address: Owner EOA
+            private_key: Unused (kept for the wallet pool's derive callback signature)
+
+        Returns:
+            Safe address, or None if the owner address is invalid
+        """
+        try:
+            return derive_safe_address(owner_address)
+        except Exception as e:
+            print(f"[WALLET POOL WARNING] Safe derivation failed for {owner_address}: {e}")
+            return None
+
     # ==================== ENCRYPTION/DECRYPTION ====================
     
     def _encrypt_key(self, private_key: str) -> str:
         """
-        Encrypt private key before storing
-        Using base64 encoding for demo (in production, use AES-256 encryption!)
+        Encrypt private key before storing (Fernet via the key vault)
         
         Args:
             private_key: Raw private key
             
         Returns:
-            Encrypted/encoded private key
+            Encrypted private key
         """
-        # Simple base64 encoding (NOT secure for production!)
-        # In production, use proper encryption like Fernet or AES-256
-        encoded = base64.b64encode(private_key.encode()).decode()
-        return encoded
+        return self.vault.encrypt(private_key)
     
     def _decrypt_key(self, encrypted_key: str) -> str:
         """
-        Decrypt private key when needed
+        Decrypt private key when needed (vault or legacy base64 format)
         
         Args:
             encrypted_key: Encrypted private key
@@ -325,10 +484,78 @@ class WalletManager:
         Returns:
             Decrypted private key
         """
-        # Decode from base64
-        decoded = base64.b64decode(encrypted_key.encode()).decode()
-        return decoded
+        return self.vault.decrypt(encrypted_key)
     
+    # ==================== SIGNERS ====================
+
+    def _load_wallet_record(self, user_id: str):
+        """
+        Find the user and the stored key record for their active wallet (one query)
+
+        Args:
+            user_id: User's database ID
+
+        Returns:
+            (user, wallet) - either may be None
+        """
+        return self.wallet_repo.resolve_active(user_id)
+
+    def _decrypt_record(self, wallet: Dict) -> str:
+        """Decrypt a wallet record's key, upgrading legacy base64 records to the vault format"""
+        stored = wallet['private_key_encrypted']
+        private_key = self._decrypt_key(stored)
+
+        if self.vault.needs_upgrade(stored):
+            self.db.wallets.update_one(
+                {"_id": wallet['_id']},
+                {"$set": {"private_key_encrypted": self._encrypt_key(private_key)}}
+            )
+            print(f"[VAULT] Re-encrypted legacy key record for {wallet.get('wallet_address')}")
+
+        return private_key
+
+    def get_signer(self, user_id: str):
+        """
+        Signer (eth_account LocalAccount) for the user's wallet, cached for a few minutes
+        so repeated trades and approvals need no database round trips
+
+        Args:
+            user_id: User's database ID
+
+        Returns:
+            LocalAccount, or None for external wallets / missing keys
+        """
+        signer = self.signer_cache.get(user_id)
+        if signer:
+            return signer
+
+        try:
+            user, wallet = self._load_wallet_record(user_id)
+            if not wallet:
+                return None
+            return self.signer_cache.put(user_id, self._decrypt_record(wallet))
+
+        except Exception as e:
+            print(f"[SIGNER ERROR] Could not load signer for {user_id}: {e}")
+            return None
+
+    def get_signing_key(self, user_id: str) -> Optional[str]:
+        """
+        Private key for signing (from the signer cache; loads on a miss)
+
+        Args:
+            user_id: User's database ID
+
+        Returns:
+            0x-prefixed private key or None
+        """
+        private_key = self.signer_cache.get_key(user_id)
+        if private_key:
+            return private_key
+        if not self.get_signer(user_id):
+            return None
+        return self.signer_cache.get_key(user_id)
+
     # ==================== PRIVATE KEY EXPORT ====================
     
     def export_private_key(self, user_id: str) -> Optional[str]:
@@ -343,9 +570,8 @@ class WalletManager:
             Private key or None
         """
         try:
-            # Get user wallet type
-            from bson.objectid import ObjectId
-            user = self.db.users.find_one({"_id": ObjectId(user_id)})
+            # User's active wallet + its encrypted key record in one query
+            user, wallet = self._load_wallet_record(user_id)
 
             if not user:
                 print(f"[EXPORT] FAILED User not found: {user_id}")
@@ -363,37 +589,13 @@ class WalletManager:
                 print(f"[EXPORT] External wallet keys are stored in your browser/wallet app (Rabby, MetaMask, etc.)")
                 return None
 
-            # Get encrypted private key - prioritize Safe wallet
-            wallets_collection = self.db.db['wallets']
-
-            # First try to get Safe wallet (the current active wallet)
-            wallet = wallets_collection.find_one({
-                "user_id": user_id,
-                "wallet_address": wallet_address,
-                "wallet_type": "safe"
-            })
-
-            # If no Safe wallet found, try any wallet for this user with matching address
-            if not wallet:
-                wallet = wallets_collection.find_one({
-                    "user_id": user_id,
-                    "wallet_address": wallet_address
-                })
-
-            # If still no wallet, try ANY wallet for this user (address mismatch fallback)
-            if not wallet:
-                print(f"[EXPORT] No wallet found for address {wallet_address}, trying any wallet for user...")
-                wallet = wallets_collection.find_one({"user_id": user_id})
-                if wallet:
-                    print(f"[EXPORT] Found wallet with different address: {wallet.get('wallet_address')}")
-
             if not wallet:
                 print(f"[EXPORT] FAILED Wallet private key not found in database")
                 print(f"[EXPORT] This might be an external wallet or key was never stored")
                 return None
 
             # Decrypt and return (this is the owner's private key for Safe wallets)
-            private_key = self._decrypt_key(wallet['private_key_encrypted'])
+            private_key = self._decrypt_record(wallet)
 
             print(f"[EXPORT] WARNING: Private key exported for user {user_id}")
             print(f"[EXPORT] Wallet type: {wallet_type}")
@@ -463,6 +665,9 @@ class WalletManager:
             )
 
             print(f"[CONNECT] ✅ Connected external wallet: {wallet_address}")
+            if self.blockchain:
+                self.blockchain.log_indexer.track([wallet_address])
+            self.signer_cache.invalidate(user_id)
             print(f"[CONNECT] Wallet type: external (Rabby/MetaMask/etc.)")
 
             return {
@@ -526,7 +731,7 @@ class WalletManager:
             encrypted_key = self._encrypt_key(private_key)
 
             # Check if wallet already exists
-            wallets_collection = self.db.db['wallets']
+            wallets_collection = self.db.wallets
             existing_wallet = wallets_collection.find_one({"user_id": user_id})
 
             if existing_wallet:
@@ -564,6 +769,9 @@ class WalletManager:
             )
 
             print(f"[IMPORT] OK Private key imported successfully")
+            if self.blockchain:
+                self.blockchain.log_indexer.track([wallet_address])
+            self.signer_cache.invalidate(user_id)
             print(f"[IMPORT] Wallet address: {wallet_address}")
             print(f"[IMPORT] Wallet type: imported")
 
@@ -601,15 +809,7 @@ class WalletManager:
             # Get REAL balances from blockchain
             balances = self.blockchain.get_all_balances(wallet_address)
             
-            return {
-                "success": True,
-                "wallet_address": wallet_address,
-                "pol_balance": balances['pol'],
-                "matic_balance": balances['matic'],  # Legacy
-                "usdc_balance": balances['usdc'],
-                "pol_usd": balances['pol_usd'],
-                "total_usd": balances['total_usd']
-            }
+            return self._balance_response(wallet_address, balances)
             
         except Exception as e:
             print(f"[ERROR] Error getting balance: {e}")
@@ -619,6 +819,156 @@ class WalletManager:
                 "matic_balance": 0.0,
                 "usdc_balance": 0.0
             }
+
+    def get_wallet_balances(self, wallet_addresses: List[str], deadline: float = BALANCE_READ_DEADLINE) -> Dict[str, Dict]:
+        """
+        Get REAL balances for many wallets within a deadline
+        One batched (Multicall3) read; if that fails, concurrent per-wallet reads.
+        Wallets not read in time get their last known balances flagged stale
+
+        Args:
+            wallet_addresses: Wallet addresses to check
+            deadline: Overall time budget in seconds
+
+        Returns:
+            Dict of wallet address -> get_wallet_balance-style dictionary with "stale"
+        """
+        addresses = list(dict.fromkeys(a for a in wallet_addresses if a))
+        if not addresses:
+            return {}
+
+        results: Dict[str, Dict] = {}
+        if self.blockchain:
+            results = self._read_balances(addresses, deadline)
+
+        for address in addresses:
+            if address in results:
+                results[address]["stale"] = False
+                continue
+
+            last = self._last_known_balance(address)
+            if last:
+                results[address] = dict(last[0], stale=True, as_of=datetime.fromtimestamp(last[1]).isoformat())
+            else:
+                results[address] = {
+                    "success": False,
+                    "wallet_address": address,
+                    "error": "Balance read timed out",
+                    "stale": True,
+                    "pol_balance": 0.0,
+                    "usdc_balance": 0.0,
+                    "total_usd": 0.0
+                }
+        return results
+
+    def _read_balances(self, addresses: List[str], deadline: float) -> Dict[str, Dict]:
+        """
+        Read balances within the deadline on a pool owned by this call
+
+        Reads still running at the deadline finish on their own threads (their results
+        only refresh the last known balances) and queued ones are cancelled, so a slow
+        RPC never ties up threads that later requests need.
+
+        Args:
+            addresses: Wallet addresses to check
+            deadline: Overall time budget in seconds
+
+        Returns:
+            Dict of wallet address -> balance response, for the wallets read in time
+        """
+        expires_at = time.monotonic() + deadline
+        results: Dict[str, Dict] = {}
+        executor = ThreadPoolExecutor(
+            max_workers=min(len(addresses), BALANCE_FANOUT_WORKERS),
+            thread_name_prefix="balance"
+        )
+
+        try:
+            batch_future = executor.submit(self.blockchain.get_all_balances_batch, addresses)
+            batch_future.add_done_callback(lambda f: self._remember_batch(addresses, f))
+            done, _ = wait([batch_future], timeout=deadline)
+            if not done:
+                print(f"[WARNING] Balance read for {len(addresses)} wallets missed the {deadline:g}s deadline")
+                return results
+
+            try:
+                batch = batch_future.result()
+                responses = {a: self._balance_response(a, batch[a]) for a in addresses}
+                # Addresses whose sub-reads failed fall back to their last known balances
+                return {a: r for a, r in responses.items() if r['success']}
+            except Exception as e:
+                # Multicall unavailable - fall back to concurrent per-wallet reads
+                print(f"[WARNING] Batched balance read failed, falling back to per-wallet reads: {e}")
+
+            futures = {}
+            for address in addresses:
+                future = executor.submit(self.get_wallet_balance, address)
+                future.add_done_callback(lambda f, a=address: self._remember_single(a, f))
+                futures[future] = address
+            wait(futures, timeout=max(0.0, expires_at - time.monotonic()))
+            for future, address in futures.items():
+                if future.done() and not future.cancelled() and future.result().get('success'):
+                    results[address] = future.result()
+            return results
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _remember_batch(self, addresses: List[str], future):
+        """Done callback: keep a finished batch read as the last known balances"""
+        if future.cancelled() or future.exception():
+            return
+        batch = future.result()
+        for address in addresses:
+            response = self._balance_response(address, batch[address])
+            if response['success']:
+                self._remember_balance(address, response)
+
+    def _remember_single(self, address: str, future):
+        """Done callback: keep a finished per-wallet read as the last known balance"""
+        if not future.cancelled() and future.result().get('success'):
+            self._remember_balance(address, future.result())
+
+    def _remember_balance(self, address: str, response: Dict):
+        with self._last_balances_lock:
+            self._last_balances[address] = (dict(response), time.time())
+            self._last_balances.move_to_end(address)
+            while len(self._last_balances) > BALANCE_LAST_KNOWN_SIZE:
+                self._last_balances.popitem(last=False)
+
+    def _last_known_balance(self, address: str) -> Optional[tuple]:
+        """(response, read_at) for an address, unless older than BALANCE_LAST_KNOWN_TTL"""
+        with self._last_balances_lock:
+            last = self._last_balances.get(address)
+            if last and time.time() - last[1] > BALANCE_LAST_KNOWN_TTL:
+                del self._last_balances[address]
+                return None
+            return last
+
+    def _balance_response(self, wallet_address: str, balances: Dict) -> Dict:
+        """Shape BlockchainManager balances into the wallet balance response"""
+        if balances.get('error'):
+            # Some sub-read failed - report it rather than an empty wallet
+            return {
+                "success": False,
+                "wallet_address": wallet_address,
+                "error": balances['error'],
+                "unknown": balances.get('unknown', []),
+                "pol_balance": balances.get('pol'),
+                "usdc_balance": balances.get('usdc')
+            }
+
+        response = {
+            "success": True,
+            "wallet_address": wallet_address,
+            "pol_balance": balances['pol'],
+            "matic_balance": balances['matic'],  # Legacy
+            "usdc_balance": balances['usdc'],
+            "pol_usd": balances['pol_usd'],
+            "total_usd": balances['total_usd']
+        }
+        if 'usdc_allowance' in balances:
+            response["usdc_allowance"] = balances['usdc_allowance']
+        return response
     
     # ==================== WALLET INFO ====================
     
@@ -683,8 +1033,8 @@ class WalletManager:
             Transaction result
         """
         try:
-            # Get user's private key
-            private_key = self.export_private_key(user_id)
+            # Get user's private key (cached signer)
+            private_key = self.get_signing_key(user_id)
             
             if not private_key:
                 return {
@@ -717,8 +1067,8 @@ class WalletManager:
             Transaction result
         """
         try:
-            # Get user's private key
-            private_key = self.export_private_key(user_id)
+            # Get user's private key (cached signer)
+            private_key = self.get_signing_key(user_id)
             
             if not private_key:
                 return {
@@ -0,0 +1,207 @@
+"""
+Wallet Pool for Polymarket Trading Bot
+Keeps a stock of pre-generated, encrypted EOA owner keys with their Safes already
+deployed, so assigning a wallet at signup is one atomic find_one_and_update instead
+of key generation, Safe deployment and encryption. A background filler tops the pool
+up when it runs low, checking each deployed address against the local CREATE2 derivation
+"""
+
+import os
+import secrets
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from eth_account import Account
+from pymongo import ReturnDocument
+
+# Available wallets the filler aims to keep in stock
+WALLET_POOL_SIZE = int(os.environ.get('WALLET_POOL_SIZE', '50'))
+
+# Refill once stock drops below this
+WALLET_POOL_LOW_WATER = int(os.environ.get('WALLET_POOL_LOW_WATER', str(WALLET_POOL_SIZE // 2)))
+
+# Wallets generated per insert_many
+WALLET_POOL_BATCH = 10
+
+# Seconds between stock checks
+WALLET_POOL_CHECK_SECONDS = 30
+
+
+class WalletPool:
+    """
+    Pre-generated wallets claimed atomically at signup
+    """
+
+    def __init__(
+        self,
+        db,
+        encrypt_key: Callable[[str], str],
+        derive_safe_address: Callable[[str, str], Optional[str]],
+        deploy_safe: Callable[[str, str], Optional[str]],
+        size: int = WALLET_POOL_SIZE
+    ):
+        """
+        Initialize the pool (the filler starts with start())
+
+        Args:
+            db: MongoDatabase (uses the wallet_pool collection)
+            encrypt_key: Encrypts a private key for storage
+            derive_safe_address: (owner_address, private_key) -> counterfactual Safe address
+            deploy_safe: (private_key, owner_address) -> deployed Safe address (None on failure)
+            size: Available wallets to keep in stock
+        """
+        self.db = db
+        self.collection = db.wallet_pool
+        self.encrypt_key = encrypt_key
+        self.derive_safe_address = derive_safe_address
+        self.deploy_safe = deploy_safe
+        self.size = size
+        self.low_water = min(WALLET_POOL_LOW_WATER, size)
+
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._wake = threading.Event()
+
+        self.claimed = 0
+        self.generated = 0
+
+    # ==================== CLAIMING ====================
+
+    def claim(self, user_id: str) -> Optional[Dict]:
+        """
+        Atomically take the oldest available wallet for a user
+
+        Args:
+            user_id: User's database ID
+
+        Returns:
+            Pool document (owner_address, safe_address, private_key_encrypted), or None if empty
+        """
+        try:
+            # Entries from before the filler deployed Safes are never handed out
+            wallet = self.collection.find_one_and_update(
+                {"status": "available", "deployed": True},
+                {"$set": {"status": "claimed", "claimed_by": user_id, "claimed_at": datetime.now()}},
+                sort=[("created_at", 1)],
+                return_document=ReturnDocument.AFTER
+            )
+        except Exception as e:
+            print(f"[WALLET POOL ERROR] Claim failed: {e}")
+            return None
+
+        if not wallet:
+            print(f"[WALLET POOL] Pool empty - falling back to on-demand creation")
+            self._wake.set()
+            return None
+
+        self.claimed += 1
+        if self.claimed % WALLET_POOL_BATCH == 0:
+            self._wake.set()  # Let the filler re-check stock early during bursts
+        return wallet
+
+    def available(self) -> int:
+        """Wallets currently in stock"""
+        try:
+            return self.collection.count_documents({"status": "available", "deployed": True})
+        except Exception as e:
+            print(f"[WALLET POOL ERROR] Could not count stock: {e}")
+            return 0
+
+    # ==================== FILLING ====================
+
+    def _generate(self) -> Optional[Dict]:
+        """One pool entry: new owner key, its Safe deployed (at the derived address), the key encrypted"""
+        private_key = "0x" + secrets.token_hex(32)
+        owner_address = Account.from_key(private_key).address
+        private_key_encrypted = self.encrypt_key(private_key)  # Before deploying: raises without a master key
+
+        expected = self.derive_safe_address(owner_address, private_key)
+        if not expected:
+            return None
+
+        safe_address = self.deploy_safe(private_key, owner_address)
+        if not safe_address:
+            return None
+        if safe_address.lower() != expected.lower():
+            print(f"[WALLET POOL ERROR] Deployed Safe {safe_address} != derived {expected} "
+                  f"for owner {owner_address} - not pooling it (check SAFE_FACTORY / SAFE_INIT_CODE_HASH)")
+            return None
+
+        return {
+            "owner_address": owner_address,
+            "safe_address": safe_address,
+            "private_key_encrypted": private_key_encrypted,
+            "status": "available",
+            "deployed": True,
+            "created_at": datetime.now()
+        }
+
+    def fill(self) -> int:
+        """
+        Top the pool up to its target size when below the low-water mark
+
+        Returns:
+            Number of wallets added
+        """
+        stock = self.available()
+        if stock >= self.low_water:
+            return 0
+
+        added = 0
+        missing = self.size - stock
+        while added < missing and not self._stop_event.is_set():
+            batch = []
+            for _ in range(min(WALLET_POOL_BATCH, missing - added)):
+                try:
+                    entry = self._generate()
+                except Exception as e:
+                    print(f"[WALLET POOL ERROR] Wallet generation failed: {e}")
+                    entry = None
+                if entry:
+                    batch.append(entry)
+
+            if not batch:
+                print(f"[WALLET POOL WARNING] Could not deploy Safes, retrying later")
+                break
+
+            self.collection.insert_many(batch)
+            added += len(batch)
+
+        self.generated += added
+        if added:
+            print(f"[WALLET POOL] Added {added} wallets ({stock + added} available)")
+        return added
+
+    def _run(self):
+        """Background filler loop (also woken early by claims)"""
+        while not self._stop_event.is_set():
+            try:
+                self.fill()
+            except Exception as e:
+                print(f"[WALLET POOL ERROR] Fill failed: {e}")
+            self._wake.wait(WALLET_POOL_CHECK_SECONDS)
+            self._wake.clear()
+
+    def start(self):
+        """Start the background filler (no-op if already running)"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="wallet-pool", daemon=True)
+        self._thread.start()
+        print(f"[WALLET POOL] Filler started (target {self.size}, refill below {self.low_water})")
+
+    def stop(self):
+        """Stop the background filler"""
+        self._stop_event.set()
+        self._wake.set()
+
+    def stats(self) -> Dict:
+        return {
+            "available": self.available(),
+            "target": self.size,
+            "claimed": self.claimed,
+            "generated": self.generated
+        }
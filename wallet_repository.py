@@ -0,0 +1,122 @@
+"""
+Wallet Repository for Polymarket Trading Bot
+Queries against the wallets collection (stored key records), all served by the
+compound index (user_id, wallet_address, wallet_type). Resolving a user's active
+wallet and its key record is a single aggregation: the user document joined to
+its best-matching wallets record with $lookup
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from bson.objectid import ObjectId
+
+# Compound index every wallets query here is shaped for (created in MongoDatabase.create_indexes)
+WALLETS_INDEX = [("user_id", 1), ("wallet_address", 1), ("wallet_type", 1)]
+
+# Fields returned for wallet listings (never the encrypted key)
+LISTING_FIELDS = {"_id": 0, "wallet_address": 1, "wallet_type": 1, "owner_address": 1, "created_at": 1}
+
+
+class WalletRepository:
+    """
+    Indexed access to users' wallet records
+    """
+
+    def __init__(self, db):
+        """
+        Initialize the repository
+
+        Args:
+            db: MongoDatabase
+        """
+        self.db = db
+        self.users = db.users
+        self.wallets = db.wallets
+
+    def resolve_active(self, user_id: str) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """
+        The user's active wallet plus the key record that signs for it, in one query
+
+        Record preference: the active address as a Safe > the active address > any
+        record for the user (older accounts whose active address was never stored)
+
+        Args:
+            user_id: User's database ID
+
+        Returns:
+            (user, wallet) - user has wallet_address / wallet_type / owner_address,
+            wallet is the key record; either may be None
+        """
+        pipeline = [
+            {"$match": {"_id": ObjectId(user_id)}},
+            {"$project": {"wallet_address": 1, "wallet_type": 1, "owner_address": 1}},
+            {"$lookup": {
+                "from": self.wallets.name,
+                "let": {"uid": {"$toString": "$_id"}, "active": "$wallet_address"},
+                "pipeline": [
+                    # Equality on the index prefix - an index seek, not a scan
+                    {"$match": {"$expr": {"$eq": ["$user_id", "$$uid"]}}},
+                    {"$addFields": {"_rank": {"$switch": {
+                        "branches": [
+                            {"case": {"$and": [
+                                {"$eq": ["$wallet_address", "$$active"]},
+                                {"$eq": ["$wallet_type", "safe"]}
+                            ]}, "then": 0},
+                            {"case": {"$eq": ["$wallet_address", "$$active"]}, "then": 1}
+                        ],
+                        "default": 2
+                    }}}},
+                    {"$sort": {"_rank": 1}},
+                    {"$limit": 1},
+                    {"$project": {"_rank": 0}}
+                ],
+                "as": "key_record"
+            }}
+        ]
+
+        results = list(self.users.aggregate(pipeline))
+        if not results:
+            return None, None
+
+        user = results[0]
+        records = user.pop("key_record", [])
+        if user.get('wallet_type') == 'external':
+            return user, None
+        return user, (records[0] if records else None)
+
+    def list_for_user(self, user_id: str) -> List[Dict]:
+        """
+        All wallets a user has (listing fields only)
+
+        Args:
+            user_id: User's database ID
+
+        Returns:
+            Wallet records without key material
+        """
+        return list(self.wallets.find({"user_id": user_id}, LISTING_FIELDS))
+
+    def find_owned(self, user_id: str, wallet_address: str) -> Optional[Dict]:
+        """
+        A specific wallet, only if it belongs to the user
+
+        Args:
+            user_id: User's database ID
+            wallet_address: Wallet address
+
+        Returns:
+            Wallet record (listing fields) or None
+        """
+        return self.wallets.find_one({"user_id": user_id, "wallet_address": wallet_address}, LISTING_FIELDS)
+
+    def has_wallet(self, user_id: str) -> Optional[Dict]:
+        """
+        Any existing wallet record for a user (duplicate-creation guard)
+
+        Args:
+            user_id: User's database ID
+
+        Returns:
+            Wallet record (listing fields) or None
+        """
+        return self.wallets.find_one({"user_id": user_id}, LISTING_FIELDS)